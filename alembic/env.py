@@ -8,7 +8,7 @@ from database.models import (
     project_developers_table,  # noqa: F401
 )
 from database.models.mapper import mapper_registry
-from database.adapters.mysql import MySQL
+from database.adapters import get_adapter
 
 target_metadata = mapper_registry.metadata
 
@@ -21,7 +21,7 @@ for registry in registries:
 
 
 def run_migrations_online():
-    connectable = MySQL.engine
+    connectable = get_adapter().engine
 
     with connectable.connect() as connection:
         context.configure(
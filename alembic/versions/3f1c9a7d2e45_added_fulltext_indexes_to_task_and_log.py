@@ -0,0 +1,35 @@
+"""added fulltext indexes to task and log
+
+Revision ID: 3f1c9a7d2e45
+Revises: b10d53adee8f
+Create Date: 2026-10-19 10:12:41.308214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2e45'
+down_revision: Union[str, None] = 'b10d53adee8f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'mysql':
+        return
+    op.create_index('ft_task_title', 'task', ['title'], mysql_prefix='FULLTEXT')
+    op.create_index('ft_task_description', 'task', ['description'], mysql_prefix='FULLTEXT')
+    op.create_index('ft_task_log_task_name', 'task_log', ['task_name'], mysql_prefix='FULLTEXT')
+    op.create_index('ft_task_log_description', 'task_log', ['description'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_task_log_description', table_name='task_log')
+    op.drop_index('ft_task_log_task_name', table_name='task_log')
+    op.drop_index('ft_task_description', table_name='task')
+    op.drop_index('ft_task_title', table_name='task')
@@ -0,0 +1,25 @@
+"""added task_id timestamp index to task_log
+
+Revision ID: 5b9f0d2c7a16
+Revises: d4a7e1c93b58
+Create Date: 2026-10-19 12:31:52.903117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9f0d2c7a16'
+down_revision: Union[str, None] = 'd4a7e1c93b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_log_task_id_timestamp', 'task_log', ['task_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_log_task_id_timestamp', table_name='task_log')
@@ -0,0 +1,48 @@
+"""added gin indexes for postgresql search
+
+Revision ID: 7e3a9c1d4b62
+Revises: 5b9f0d2c7a16
+Create Date: 2026-10-19 16:04:27.518932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3a9c1d4b62'
+down_revision: Union[str, None] = '5b9f0d2c7a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The columns with a FULLTEXT index on MySQL. Each expression matches what
+# the PostgreSQL adapter compiles match_against to, so the planner can use
+# the index.
+INDEXES = [
+    ('gin_task_title', 'task', 'title'),
+    ('gin_task_description', 'task', 'description'),
+    ('gin_task_log_task_name', 'task_log', 'task_name'),
+    ('gin_task_log_description', 'task_log', 'description'),
+    ('gin_project_name', 'project', 'name'),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for name, table, column in INDEXES:
+        op.create_index(
+            name,
+            table,
+            [sa.text(f"to_tsvector('simple', coalesce({column}, ''))")],
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
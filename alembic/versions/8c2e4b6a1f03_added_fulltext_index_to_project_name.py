@@ -0,0 +1,29 @@
+"""added fulltext index to project name
+
+Revision ID: 8c2e4b6a1f03
+Revises: 3f1c9a7d2e45
+Create Date: 2026-10-19 11:02:17.664390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4b6a1f03'
+down_revision: Union[str, None] = '3f1c9a7d2e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'mysql':
+        return
+    op.create_index('ft_project_name', 'project', ['name'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_project_name', table_name='project')
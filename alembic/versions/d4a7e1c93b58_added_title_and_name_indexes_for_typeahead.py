@@ -0,0 +1,27 @@
+"""added title and name indexes for typeahead
+
+Revision ID: d4a7e1c93b58
+Revises: 8c2e4b6a1f03
+Create Date: 2026-10-19 11:48:05.127733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e1c93b58'
+down_revision: Union[str, None] = '8c2e4b6a1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_title', 'task', ['title'])
+    op.create_index('ix_project_name', 'project', ['name'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_name', table_name='project')
+    op.drop_index('ix_task_title', table_name='task')
@@ -0,0 +1,35 @@
+# gunicorn reads this file from the working directory (see run.sh).
+import gc
+
+wsgi_app = "src.backend.server:app"
+bind = "0.0.0.0:8000"
+workers = 4
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app (FastAPI, SQLAlchemy and the mappers, the templates) once
+# in the master; the forked workers share those pages copy-on-write. Polars
+# and fastexcel are not among them: they load in the import process on
+# first use. The database engine is created per worker in the app lifespan.
+preload_app = True
+
+
+def on_starting(server):
+    # The workers' metrics files of an earlier run would add to this one's
+    from backend.utils.metrics import registry
+
+    registry.clear()
+
+
+def when_ready(server):
+    # Called after the preload, before the first fork. Frozen objects are
+    # skipped by the collector, whose bookkeeping writes would otherwise
+    # copy the shared pages into every worker.
+    gc.freeze()
+
+
+def worker_exit(server, worker):
+    # Runs in the exiting worker: keep what it counted since its last
+    # periodic flush, even when the app lifespan did not get to shut down.
+    from backend.utils.metrics import registry
+
+    registry.flush()
@@ -0,0 +1,71 @@
+"""
+Login throughput under concurrency: argon2 verification inline on the event
+loop versus the bounded password hashing pool. Also reports the worst event
+loop stall seen by a 10ms heartbeat while the logins run.
+
+    uv run python scripts/bench_login.py [logins] [concurrency]
+"""
+
+import sys
+import time
+import asyncio
+
+from backend.utils.passwords import (
+    password_hasher,
+    verify_password,
+    shutdown_password_executor,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def inline_verify(hashed: str):
+    password_hasher.verify(hashed, PASSWORD)
+
+
+async def pooled_verify(hashed: str):
+    verified, _ = await verify_password(hashed, PASSWORD)
+    assert verified
+
+
+async def run(verify, hashed: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    lags: list = []
+
+    async def login():
+        async with semaphore:
+            await verify(hashed)
+
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return logins / elapsed, max(lags, default=0.0) * 1000
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    hashed = password_hasher.hash(PASSWORD)
+
+    for name, verify in (("inline", inline_verify), ("pool", pooled_verify)):
+        rate, lag = asyncio.run(run(verify, hashed, logins, concurrency))
+        print(
+            f"{name:<8} {rate:>8.1f} logins/s   max loop stall {lag:>8.1f} ms"
+        )
+
+    shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Requests/sec and p99 latency of a trivial route behind the middleware stack,
+comparing the old `BaseHTTPMiddleware` classes with the pure ASGI ones.
+
+    uv run python scripts/bench_middleware.py [requests] [concurrency]
+"""
+
+import sys
+import time
+import asyncio
+import secrets
+import statistics
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, RedirectResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+
+from backend.middleware import (
+    CSRFMiddleware,
+    LogRequestMiddleware,
+    AuthRedirectMiddleware,
+)
+
+
+class LegacyLogRequestMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        from loguru import logger
+
+        logger.debug(
+            f"Request: {request.method} {request.url} Headers: {request.headers}"
+        )
+        return await call_next(request)
+
+
+class LegacyCSRFMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if "csrftoken" not in request.session:
+            request.session["csrftoken"] = secrets.token_hex(32)
+        return await call_next(request)
+
+
+class LegacyAuthRedirectMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        public_paths = ["/user/login", "/healthcheck"]
+        if any(request.url.path.startswith(path) for path in public_paths):
+            return await call_next(request)
+        if not request.session.get("user_id"):
+            return RedirectResponse(url="/user/login")
+        return await call_next(request)
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/user/login")
+    def login(request: Request):
+        request.session["user_id"] = "bench"
+        return PlainTextResponse("ok")
+
+    @app.get("/ping")
+    def ping():
+        return PlainTextResponse("pong")
+
+    if legacy:
+        app.add_middleware(LegacyLogRequestMiddleware)
+        app.add_middleware(LegacyAuthRedirectMiddleware)
+        app.add_middleware(LegacyCSRFMiddleware)
+    else:
+        app.add_middleware(LogRequestMiddleware)
+        app.add_middleware(AuthRedirectMiddleware)
+        app.add_middleware(CSRFMiddleware)
+
+    app.add_middleware(SessionMiddleware, secret_key="bench")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.get("/user/login")
+        latencies = []
+        queue: asyncio.Queue = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get("/ping")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    return requests / elapsed, p99
+
+
+def main():
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+    for name, legacy in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+        rps, p99 = asyncio.run(run(build_app(legacy), requests, concurrency))
+        print(f"{name:<20} {rps:>10.0f} req/s   p99 {p99:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Startup time and per-worker memory of the gunicorn deployment, with the app
+imported in every worker (the old run.sh) versus preloaded in the master
+(gunicorn.conf.py). Memory comes from /proc, so Linux only; PSS splits the
+pages shared copy-on-write between the processes sharing them.
+
+    uv run python scripts/bench_workers.py [workers]
+
+Runs against the configured database; DB_ADAPTER=sqlite DB_NAME=:memory:
+needs no server.
+"""
+
+import os
+import sys
+import time
+import socket
+import threading
+import subprocess
+from typing import Dict, List
+
+import httpx
+
+READY = b"Application startup complete"
+TIMEOUT = 120
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def run(name: str, args: List[str], workers: int) -> None:
+    port = free_port()
+    command = [
+        sys.executable, "-m", "gunicorn", *args,
+        "--workers", str(workers), "--bind", f"127.0.0.1:{port}",
+    ]  # fmt: skip
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    ready = threading.Semaphore(0)
+
+    def read_log():
+        for line in process.stderr:
+            if READY in line:
+                ready.release()
+
+    threading.Thread(target=read_log, daemon=True).start()
+    try:
+        for _ in range(workers):
+            if not ready.acquire(timeout=TIMEOUT):
+                raise SystemExit(f"{name}: workers did not start")
+        startup = time.perf_counter() - started
+        # Warm every worker up a little before measuring
+        for _ in range(workers * 5):
+            httpx.get(f"http://127.0.0.1:{port}/healthcheck")
+
+        master = memory_kb(process.pid)
+        worker_memory = [memory_kb(pid) for pid in children(process.pid)]
+        total_pss = master["pss"] + sum(m["pss"] for m in worker_memory)
+        print(
+            f"{name}: ready in {startup:.2f}s, "
+            f"total PSS {total_pss / 1024:.0f} MiB"
+        )
+        print(
+            f"  master     RSS {master['rss'] / 1024:6.0f} MiB  "
+            f"PSS {master['pss'] / 1024:6.0f} MiB"
+        )
+        for i, m in enumerate(worker_memory):
+            print(
+                f"  worker {i}   RSS {m['rss'] / 1024:6.0f} MiB  "
+                f"PSS {m['pss'] / 1024:6.0f} MiB  "
+                f"private {m['private'] / 1024:6.0f} MiB"
+            )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    run(
+        "import per worker",
+        [
+            "--config", os.devnull,
+            "--worker-class", "uvicorn.workers.UvicornWorker",
+            "src.backend.server:app",
+        ],
+        workers,
+    )  # fmt: skip
+    run("preloaded", ["--config", "gunicorn.conf.py"], workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Attendance parser on a synthetic badge export: the previous pandas
+`iterrows` implementation versus the fastexcel/Polars one.
+
+    uv run python scripts/bench_xlsx_parser.py [rows]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+from openpyxl import Workbook
+
+from backend.utils.xlsx_parser import FileParser
+
+
+def legacy_parse_file(file_path: str):
+    results = {}
+    df = pd.read_excel(file_path)
+    for _, row in df.iterrows():
+        dt_value = row.get("Date And Time")
+        first_name = str(row.get("First Name", "")).strip()
+        last_name = str(row.get("Last Name", "")).strip()
+        dt_obj = None
+        if isinstance(dt_value, datetime):
+            dt_obj = dt_value
+        elif isinstance(dt_value, str):
+            for fmt in ("%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S"):
+                try:
+                    dt_obj = datetime.strptime(dt_value, fmt)
+                    break
+                except ValueError:
+                    pass
+        if not dt_obj:
+            continue
+        full_name = f"{first_name} {last_name}".strip()
+        if not full_name:
+            continue
+        results.setdefault(dt_obj.date(), set()).add(full_name)
+    return results
+
+
+def write_badge_export(path: str, rows: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Date And Time", "First Name", "Last Name", "Door"])
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    for _ in range(rows):
+        moment = start + timedelta(minutes=random.randint(0, 60 * 24 * 365))
+        sheet.append(
+            [
+                moment.strftime("%Y-%m-%d %H:%M:%S"),
+                f"First{random.randint(0, 150)}",
+                f"Last{random.randint(0, 3)}",
+                "Main entrance",
+            ]
+        )
+    workbook.save(path)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "badges.xlsx")
+        write_badge_export(path, rows)
+
+        legacy, legacy_time = timed(legacy_parse_file, path)
+        current, current_time = timed(FileParser().parse_file, path)
+
+    assert legacy == current, "parsers disagree"
+    print(f"rows: {rows}, days: {len(current)}")
+    print(f"pandas iterrows   {legacy_time:>8.2f} s")
+    print(f"fastexcel/polars  {current_time:>8.2f} s")
+    print(f"speedup           {legacy_time / current_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Cold import time of `backend.server`, the cost every worker, alembic run and
+script pays before doing anything. Exits non-zero when the app imports one
+of the spreadsheet/dataframe libraries (they load on the first XLSX parse),
+or when its import takes more than MAX_RATIO times the import of the
+frameworks it can't do without, measured on the same machine so the budget
+holds on slow and fast hardware alike.
+
+    uv run python scripts/check_import_time.py [runs]
+"""
+
+import sys
+import subprocess
+from typing import List, Tuple
+
+APP = "backend.server"
+# What any version of the app has to import
+FRAMEWORKS = [
+    "fastapi",
+    "sqlalchemy.orm",
+    "jinja2",
+    "loguru",
+    "apscheduler.schedulers.asyncio",
+    "email_validator",
+]
+LAZY_MODULES = ["polars", "pandas", "pyarrow", "openpyxl", "fastexcel", "xlrd"]
+MAX_RATIO = 1.5
+
+TIMED_IMPORT = """
+import sys, time
+started = time.perf_counter()
+{imports}
+print(time.perf_counter() - started)
+print(",".join(m for m in {lazy!r} if m in sys.modules))
+"""
+
+
+def timed_import(modules: List[str]) -> Tuple[float, List[str]]:
+    """
+    Seconds to import `modules` in a fresh interpreter, and the lazy
+    modules that came along.
+    """
+    code = TIMED_IMPORT.format(
+        imports="\n".join(f"import {module}" for module in modules),
+        lazy=LAZY_MODULES,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.splitlines()
+    return float(output[-2]), [m for m in output[-1].split(",") if m]
+
+
+def best_of(modules: List[str], runs: int) -> Tuple[float, List[str]]:
+    results = [timed_import(modules) for _ in range(runs)]
+    return min(seconds for seconds, _ in results), results[0][1]
+
+
+def profile(top: int = 10) -> List[Tuple[int, str]]:
+    """
+    The modules with the largest own import time, from -X importtime.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        rows.append((int(own), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+
+    app, lazy_loaded = best_of([APP], runs)
+    frameworks, _ = best_of(FRAMEWORKS, runs)
+    ratio = app / frameworks
+    print(
+        f"{APP}: {app * 1000:.0f}ms, frameworks: {frameworks * 1000:.0f}ms, "
+        f"ratio {ratio:.2f} (budget {MAX_RATIO})"
+    )
+    print("Largest own import times:")
+    for own, name in profile():
+        print(f"  {own / 1000:7.1f}ms  {name}")
+
+    failed = False
+    if lazy_loaded:
+        print(f"FAIL: importing {APP} loads {', '.join(lazy_loaded)}")
+        failed = True
+    if ratio > MAX_RATIO:
+        print(f"FAIL: import time ratio {ratio:.2f} over {MAX_RATIO}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
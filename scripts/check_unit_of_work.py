@@ -0,0 +1,175 @@
+"""
+Connection checkouts, commits and statements for one request, through the
+real session dependency, get_current_user and the log endpoints (single,
+update and batch), against
+an in-memory SQLite database. Exits non-zero when a request checks out
+more than one connection or commits more than once.
+
+    uv run python scripts/check_unit_of_work.py
+"""
+
+import os
+import sys
+from collections import Counter
+
+# Before the app reads its settings
+os.environ["DB_ADAPTER"] = "sqlite"
+os.environ["DB_NAME"] = ":memory:"
+
+from ulid import ULID
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from starlette.middleware.sessions import SessionMiddleware
+
+from core.models.log import Log
+from core.models.task import Task
+from core.models.user import User
+from core.models.project import Project
+from database.adapters import get_adapter
+from backend.views import log_view
+from backend.dependencies.auth import validate_csrf
+from backend.controllers.log_controller import log_router
+
+MAX_CHECKOUTS = 1
+MAX_COMMITS = 1
+
+counts: Counter = Counter()
+
+
+def count_queries():
+    engine = get_adapter().engine
+    event.listen(engine, "checkout", lambda *_: counts.update(["checkouts"]))
+    event.listen(engine, "commit", lambda *_: counts.update(["commits"]))
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *_: counts.update(["statements"]),
+    )
+
+
+def seed() -> tuple:
+    with get_adapter().session() as s:
+        user = User(
+            email="dev@example.com",
+            password="x",
+            full_name="Developer",
+            permissions=1,
+            projects=[],
+            tasks=[],
+        )
+        project = Project(
+            name="Project",
+            send_email=False,
+            archived=False,
+            developers=[],
+            tasks=[],
+        )
+        s.add_all([user, project])
+        s.flush()
+        task = Task(
+            project_id=project.id,
+            project_name=project.name,
+            user_id=user.id,
+            user_name=user.full_name,
+            title="Task",
+            hours_required=8,
+            description="",
+            timestamp=0,
+            logs=[],
+        )
+        s.add(task)
+        s.flush()
+        log = Log(
+            id=str(ULID()),
+            timestamp=0,
+            task_id=task.id,
+            task_name=task.title,
+            description="first",
+            user_id=user.id,
+            user_name=user.full_name,
+            project_id=project.id,
+            project_name=project.name,
+            hours_spent_today=1,
+            task_status="Implementation",
+        )
+        s.add(log)
+        s.commit()
+        return user.id, task.id, log.id
+
+
+def make_client(user_id: str) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="check")
+    app.include_router(log_router)
+    app.dependency_overrides[validate_csrf] = lambda: None
+
+    @app.get("/__login")
+    def login(request: Request):
+        request.session["user_id"] = user_id
+
+    client = TestClient(app, follow_redirects=False)
+    client.get("/__login")
+    return client
+
+
+def measure(name: str, send) -> bool:
+    counts.clear()
+    response = send()
+    print(
+        f"{name:<14} status={response.status_code} "
+        f"checkouts={counts['checkouts']} commits={counts['commits']} "
+        f"statements={counts['statements']}"
+    )
+    return (
+        response.status_code < 400
+        and counts["checkouts"] <= MAX_CHECKOUTS
+        and counts["commits"] <= MAX_COMMITS
+    )
+
+
+def main():
+    count_queries()
+    # No SMTP server here.
+    log_view.send_email_to_user = lambda **_: None
+
+    user_id, task_id, log_id = seed()
+    client = make_client(user_id)
+    form = {
+        "task_name": "Task",
+        "description": "work",
+        "hours_spent_today": "2",
+        "task_status": "Implementation",
+        "task_id": task_id,
+    }
+
+    # A week of timesheet entries, one request
+    batch = {
+        "entries": [
+            {
+                "task_id": task_id,
+                "description": f"day {day}",
+                "hours_spent_today": 4,
+                "task_status": "Implementation",
+            }
+            for day in range(10)
+        ]
+    }
+
+    ok = all(
+        [
+            measure("create log", lambda: client.post("/log/", data=form)),
+            measure(
+                "update log", lambda: client.put(f"/log/{log_id}", data=form)
+            ),
+            measure(
+                "batch of 10",
+                lambda: client.post("/log/batch", json=batch),
+            ),
+        ]
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
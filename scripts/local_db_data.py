@@ -2,7 +2,6 @@ from random import choice
 from datetime import datetime
 
 from ulid import ULID
-from argon2 import PasswordHasher
 
 from core.models.log import Log
 from database.models import (  # noqa F401
@@ -17,13 +16,13 @@ from core.models.user import User
 from core.models.project import Project
 from core.enums.premissions import Permissions
 from core.enums.task_status import TaskStatus
-from database.adapters.mysql import MySQL
+from database.adapters import get_adapter
+from backend.utils.passwords import password_hasher
 from core.models.project_user import ProjectUser
 from database.repositories.repository import Repository
 from database.sessions.sqlalchemy_session import SQLAlchemySession
 
-ph = PasswordHasher()
-hashed_password = ph.hash("password")
+hashed_password = password_hasher.hash("password")
 
 users = [
     User(
@@ -117,7 +116,7 @@ for i in range(100):
     )
     logs.append(log)
 
-with SQLAlchemySession(MySQL.session()) as s:
+with SQLAlchemySession(get_adapter().session()) as s:
     user_repo = Repository(s, User)
     project_repo = Repository(s, Project)
     task_repo = Repository(s, Task)
@@ -135,3 +134,5 @@ with SQLAlchemySession(MySQL.session()) as s:
         log_repo.create(log)
     for project_user in project_users:
         project_user_table.create(project_user)
+
+    s.commit()
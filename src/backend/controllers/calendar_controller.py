@@ -1,5 +1,5 @@
 import json
-from typing import Set, Dict, List, Union, Optional
+from typing import Union, Optional
 import calendar
 from datetime import date, datetime
 
@@ -14,6 +14,7 @@ from fastapi import (
     HTTPException,
 )
 from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
 
 from database.models import (
     user_mapper,  # noqa F401
@@ -27,13 +28,26 @@ from backend.dependencies.auth import (
     is_admin,
     get_current_user,
 )
-from backend.utils.xlsx_parser import FileParser, IFileParser
+from backend.utils.xlsx_parser import (
+    FileParser,
+    IFileParser,
+    SUPPORTED_EXTENSIONS,
+)
+from backend.utils.import_jobs import (
+    enqueue,
+    get_job,
+    create_job,
+    upload_path,
+)
+from backend.views.calendar_view import run_attendance_import
+from backend.utils.user_directory import user_directory
+from backend.utils.presence import presence_cache
 from core.models.office_calendar import OfficeCalendar
 from database.interfaces.session import ISession
 
 calendar_router = APIRouter(prefix="/calendar")
 
-attendance_data_store: Dict[str, Set[str]] = {}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 @calendar_router.post("/upload_xlsx", response_class=RedirectResponse)
@@ -41,42 +55,63 @@ async def upload_xlsx(
     file: UploadFile = File(...),
     parser: IFileParser = Depends(FileParser),
     current_user: User = Depends(get_current_user),
-    session: ISession = Depends(get_session),
 ):
     """
-    Accepts an XLSX file upload, extracts attendance data in-memory, and updates the database.
-    If the user dates match, sets OfficeCalendar.present to True.
+    Accepts an XLS/XLSX upload, stores it and queues an attendance import job.
+    Redirects to the job page, which polls for progress.
     """
     if not is_admin(current_user):
         return RedirectResponse(url=f"/calendar/{current_user.id}", status_code=302)
 
-    file_ext = file.filename.split(".")[-1] if file.filename else ""
-    file_content = await file.read()
-    data = parser.parse_bytes(file_content, file_ext)
+    file_ext = file.filename.split(".")[-1].lower() if file.filename else ""
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    for day_key, names in data.items():
-        try:
-            day_date = datetime.strptime(day_key, "%Y-%m-%d").date()
-        except ValueError:
-            continue
-        for full_name in names:
-            user_record = session.query(User, full_name=full_name)
-            if user_record:
-                office_calendar = (
-                    session.query(
-                        OfficeCalendar, day=day_date, user_id=user_record[0].id
-                    )  # noqa E501
-                )
-                if not office_calendar:
-                    office_calendar = OfficeCalendar(
-                        user_id=user_record[0].id, day=day_date, present=True
-                    )
-                    session.add(office_calendar)
-                else:
-                    office_calendar[0].present = True
-    session.commit()
+    # File I/O goes to the threadpool: this handler runs on the event loop
+    job = await run_in_threadpool(create_job, file.filename or "")
+    f = await run_in_threadpool(open, upload_path(job.id, file_ext), "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await run_in_threadpool(f.write, chunk)
+    finally:
+        await run_in_threadpool(f.close)
+
+    enqueue(
+        job,
+        run_attendance_import,
+        upload_path(job.id, file_ext),
+        parser,
+        on_done=lambda _: presence_cache.invalidate(),
+    )
+
+    return RedirectResponse(url=f"/calendar/import/{job.id}", status_code=302)
+
+
+@calendar_router.get("/import/{job_id}", response_class=HTMLResponse)
+def get_import_job(
+    request: Request,
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Returns the progress of an attendance import job. HTMX polls return only
+    the progress fragment.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Access forbidden")
+
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
 
-    return RedirectResponse(url="/calendar", status_code=302)
+    template = (
+        "calendar/import_progress.html"
+        if request.headers.get("HX-Request")
+        else "calendar/import.html"
+    )
+    return templates.TemplateResponse(
+        template, {"request": request, "job": job}
+    )
 
 
 @calendar_router.get("/", response_class=HTMLResponse, response_model=None)
@@ -100,48 +135,8 @@ def get_all_remote(
     if not 1 <= used_month <= 12:
         raise HTTPException(status_code=400, detail="Invalid month value")
 
-    first_day = date(used_year, used_month, 1)
-    last_day = date(
-        used_year, used_month, calendar.monthrange(used_year, used_month)[1]
-    )
-
-    all_users: List[User] = session.query(User)
-    remote_days: List[OfficeCalendar] = session.query(
-        OfficeCalendar,
-        day__gte=first_day,
-        day__lte=last_day,
-    )
-
-    user_dict: Dict[str, str] = {user.id: user.full_name for user in all_users}
-
-    presence_by_date: Dict[date, Dict[str, bool]] = {}
-    for rd in remote_days:
-        if rd.day not in presence_by_date:
-            presence_by_date[rd.day] = {}  # type: ignore
-        user_full_name = user_dict.get(rd.user_id, "Unknown User")
-        presence_by_date[rd.day][user_full_name] = rd.present  # type: ignore
-
-    days_list = []
-    cal = calendar.Calendar()
-    for day_date in cal.itermonthdates(used_year, used_month):
-        if day_date.month != used_month:
-            continue
-        date_key = day_date.isoformat()
-        user_presence_map = presence_by_date.get(day_date, {})
-        color_coded_users = []
-        for user_full_name, present_val in user_presence_map.items():
-            color_class = "text-green-500" if present_val else "text-red-500"
-            color_coded_users.append(
-                {"name": user_full_name, "color_class": color_class}
-            )
-        day_obj = {
-            "day_number": day_date.day,
-            "day_name": day_date.strftime("%A"),
-            "date_iso": date_key,
-            "users": color_coded_users,
-            "is_weekend": day_date.weekday() >= 5,
-        }
-        days_list.append(day_obj)
+    presence = presence_cache.get(session, used_year, used_month)
+    days_list = presence.all_days(user_directory.names(session))
 
     month_name = datetime(used_year, used_month, 1).strftime("%B")
 
@@ -156,6 +151,39 @@ def get_all_remote(
         },
     )
 
+
+@calendar_router.get("/summary", response_class=HTMLResponse)
+def get_attendance_summary(
+    request: Request,
+    year: Optional[int] = Query(None),
+    month: Optional[int] = Query(None),
+    session: ISession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> HTMLResponse:
+    """
+    Returns the per-user attendance rate for the given year and month.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    today = date.today()
+    used_year = year if year else today.year
+    used_month = month if month else today.month
+    if not 1 <= used_month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month value")
+    presence = presence_cache.get(session, used_year, used_month)
+    month_name = datetime(used_year, used_month, 1).strftime("%B")
+    return templates.TemplateResponse(
+        "calendar/summary.html",
+        {
+            "request": request,
+            "rows": presence.attendance(user_directory.names(session), today),
+            "current_month_name": month_name,
+            "current_month": used_month,
+            "current_year": used_year,
+        },
+    )
+
+
 @calendar_router.get("/{user_id}", response_class=HTMLResponse)
 def get_user_remote(
     request: Request,
@@ -173,42 +201,10 @@ def get_user_remote(
     today = date.today()
     used_year = year if year else today.year
     used_month = month if month else today.month
-    first_day = date(used_year, used_month, 1)
-    last_day = date(
-        used_year, used_month, calendar.monthrange(used_year, used_month)[1]
-    )
-    remote_days = session.query(
-        OfficeCalendar,
-        user_id=user_id,
-        day__gte=first_day,
-        day__lte=last_day,
-    )
-    selected_dates = set(rd.day for rd in remote_days)
-    days_list = []
-    cal = calendar.Calendar()
-    cal_data = {rd.day: rd for rd in remote_days}
-    for day_date in cal.itermonthdates(used_year, used_month):
-        if day_date.month != used_month:
-            continue
-        existing_record = cal_data.get(day_date)
-        color_class = ""
-        if existing_record:
-            if day_date >= today:
-                color_class = "blue"
-            else:
-                if existing_record.present:
-                    color_class = "green"
-                else:
-                    color_class = "red"
-        day_obj = {
-            "day_number": day_date.day,
-            "day_name": day_date.strftime("%A"),
-            "date_iso": day_date.isoformat(),
-            "is_selected": day_date in selected_dates,
-            "has_event": day_date in selected_dates,
-            "color_class": color_class,
-        }
-        days_list.append(day_obj)
+    if not 1 <= used_month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month value")
+    presence = presence_cache.get(session, used_year, used_month)
+    days_list = presence.user_days(user_id, today)
     month_name = datetime(used_year, used_month, 1).strftime("%B")
     return templates.TemplateResponse(
         "calendar/user.html",
@@ -278,6 +274,7 @@ def post_user_remote(
         for rd in to_remove:
             session.delete(rd)
     session.commit()
+    presence_cache.invalidate()
     return RedirectResponse(
         url=f"/calendar/{user_id}?year={used_year}&month={used_month}",
         status_code=302,
@@ -3,7 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from starlette.responses import JSONResponse
 
-from database.adapters.mysql import MySQL
+from database.adapters import get_adapter
 
 healthcheck_router = APIRouter(tags=["Health Check"])
 
@@ -11,7 +11,7 @@ healthcheck_router = APIRouter(tags=["Health Check"])
 @healthcheck_router.get("/healthcheck")
 async def healthcheck():
     try:
-        with MySQL.session() as session:
+        with get_adapter().session() as session:
             db = session.execute(text("SELECT 1"))
             result = db.fetchone()
             assert result
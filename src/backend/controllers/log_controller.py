@@ -1,6 +1,6 @@
 from io import StringIO
 import csv
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from ulid import ULID
@@ -13,10 +13,15 @@ from fastapi import (
     Response,
     APIRouter,
     HTTPException,
+    BackgroundTasks,
 )
 from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 
-from backend.models import LogCreateModel, LogResponseModel
+from backend.models import (
+    LogCreateModel,
+    LogResponseModel,
+    LogBatchCreateModel,
+)
 from core.models.log import Log
 from database.models import log_mapper  # noqa F401
 from core.models.user import User
@@ -24,9 +29,11 @@ from backend.dependencies import get_session
 from backend.views.log_view import (
     get_log,
     create_log,
+    create_logs,
     update_log,
     upsert_log,
     get_all_logs,
+    send_timesheet_email,
 )
 from backend.utils.templates import templates
 from backend.views.user_view import get_user_logs
@@ -36,11 +43,18 @@ from backend.dependencies.auth import (
     get_current_user,
 )
 from backend.models.pagination import Pagination
-from backend.utils.filters_and_sort import get_filters, get_sorting
+from backend.utils.filters_and_sort import (
+    RELEVANCE,
+    get_filters,
+    get_sorting,
+)
 from database.interfaces.session import ISession
 
 log_router = APIRouter(prefix="/log")
 
+# Columns with a FULLTEXT index, see the log_mapper table definition.
+LOG_SEARCH_FIELDS = ["task_name", "description"]
+
 
 @log_router.get("/create", response_class=HTMLResponse)
 def get_log_home(
@@ -87,6 +101,29 @@ async def create_log_endpoint(
     return RedirectResponse(f"/log/{log_id}", status_code=303)
 
 
+@log_router.post("/batch", response_model=List[LogResponseModel])
+def create_logs_endpoint(
+    batch: LogBatchCreateModel,
+    background_tasks: BackgroundTasks,
+    session: ISession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    csrf_protect=Depends(validate_csrf),
+):
+    """
+    Submit many log entries, across tasks, in one request and one
+    transaction. Nothing is saved unless every entry is valid. A single
+    summary email is sent after the response.
+    """
+    try:
+        logs = create_logs(
+            batch.entries, current_user, is_admin(current_user), session
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(send_timesheet_email, current_user.email, logs)
+    return logs
+
+
 @log_router.get("/export", response_class=StreamingResponse)
 def export_tasks_csv(
     request: Request,
@@ -114,6 +151,7 @@ def export_tasks_csv(
             filter_mapping,
             "Task Name",
             date_fields=["Date"],
+            search_fields=LOG_SEARCH_FIELDS,
         )
 
         logs, _ = get_all_logs(
@@ -255,11 +293,9 @@ def get_all_logs_endpoint(
         "Hours ": Log.hours_spent_today,
         "Task Status": Log.task_status,
         "Date": Log.timestamp,
+        RELEVANCE: Log.task_name,
     }
 
-    order_by = get_sorting(sort, order, sort_mapping)
-    pagination = Pagination(limit=limit, current_page=page, order_by=order_by)
-
     filter_mapping = {
         "Date": "timestamp",
         "Task Name": "task_name",
@@ -269,7 +305,10 @@ def get_all_logs_endpoint(
         "Task Status": "task_status",
     }
 
-    filters = get_filters(combined_filters, filter_mapping, "Task Name", date_fields=["Date"])
+    filters = get_filters(combined_filters, filter_mapping, "Task Name", date_fields=["Date"], search_fields=LOG_SEARCH_FIELDS)
+
+    order_by = get_sorting(sort, order, sort_mapping, filters)
+    pagination = Pagination(limit=limit, current_page=page, order_by=order_by)
 
     if is_admin(current_user):
         logs, pagination = get_all_logs(session, pagination, **filters)
@@ -305,5 +344,6 @@ def get_all_logs_endpoint(
                 "Description",
                 "Task Status",
             ],
+            "show_relevance": True,
         },
     )
@@ -0,0 +1,96 @@
+import os
+import secrets
+
+from fastapi import Depends, Request, APIRouter, HTTPException
+from starlette.responses import JSONResponse, HTMLResponse, PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+
+from config.env import ENV
+from core.models.user import User
+from backend.utils.metrics import registry
+from backend.utils.templates import templates
+from backend.utils.slow_queries import slow_query_log
+from database.interfaces.session import ISession
+from backend.dependencies.auth import is_admin, get_current_user
+from database.adapters.pool import pool_monitor
+from backend.utils.loop_monitor import loop_monitor
+from backend.dependencies.db_session import get_session
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics_router = APIRouter(prefix="/metrics")
+
+
+def _has_metrics_token(request: Request) -> bool:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return (
+        bool(ENV.METRICS_TOKEN)
+        and scheme.lower() == "bearer"
+        and secrets.compare_digest(token, ENV.METRICS_TOKEN)
+    )
+
+
+@metrics_router.get("", include_in_schema=False)
+async def prometheus_metrics(
+    request: Request, session: ISession = Depends(get_session)
+):
+    """
+    Metrics of every worker, summed, in the Prometheus text format. Open
+    to scrapers sending `Authorization: Bearer <METRICS_TOKEN>` and to
+    logged-in admins.
+    """
+    if not _has_metrics_token(request):
+        current_user = await run_in_threadpool(
+            get_current_user, request, session
+        )
+        if not isinstance(current_user, User) or not is_admin(current_user):
+            raise HTTPException(status_code=403, detail="Access forbidden")
+    # Reads a file per worker
+    body = await run_in_threadpool(registry.render)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@metrics_router.get("/loop")
+async def loop_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Event loop lag statistics and the most recent blocking calls of the
+    worker that answers the request.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    return JSONResponse(content=loop_monitor.snapshot(), status_code=200)
+
+
+@metrics_router.get("/pool")
+async def pool_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Database connection pool usage and checkout wait times of the worker
+    that answers the request.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    return JSONResponse(content=pool_monitor.snapshot(), status_code=200)
+
+
+@metrics_router.get("/queries", response_class=HTMLResponse)
+def query_stats_page(
+    request: Request,
+    sort: str = "total",
+    current_user: User = Depends(get_current_user),
+):
+    """
+    The statements of the worker that answers, by normalized SQL, most
+    expensive first, with the last slow execution and its plan.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Access forbidden")
+    return templates.TemplateResponse(
+        "metrics/queries.html",
+        {
+            "request": request,
+            "queries": slow_query_log.top(sort),
+            "sort": sort,
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "pid": os.getpid(),
+        },
+    )
@@ -1,4 +1,5 @@
 from typing import Optional
+from html import escape
 
 from fastapi import (
     Form,
@@ -22,7 +23,7 @@ from core.models.task import Task
 from core.models.user import User
 from backend.dependencies import get_session
 from backend.utils.templates import templates
-from backend.utils.pagination import calculate_pagination
+from backend.utils.options_cache import OPTIONS_LIMIT, options_cache
 from backend.dependencies.auth import (
     is_admin,
     validate_csrf,
@@ -37,7 +38,10 @@ from backend.views.project_view import (
     get_all_projects,
     get_project_tasks,
     get_users_projects,
+    get_project_options,
     get_user_by_project,
+    get_project_overview,
+    get_project_developer_ids,
     assign_project_to_user,
     remove_user_from_project,
 )
@@ -81,27 +85,33 @@ async def create_project_endpoint(
 
 
 @project_router.get("/options", response_class=HTMLResponse)
-def get_project_options(
+def get_project_options_endpoint(
     request: Request,
+    q: str = Query("", max_length=100),
     session: ISession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    pagination = calculate_pagination(total=0, page=1, per_page=300)
-    projects = (
-        get_all_projects(session, pagination)[0]
-        if is_admin(current_user)
-        else [
-            project
-            for project in get_users_projects(
-                current_user.id, session, pagination
-            )[0]
-        ]
+    """
+    Typeahead options for the project select, see `get_project_options`.
+    """
+    rows = options_cache.get_or_load(
+        "project",
+        current_user.id,
+        q,
+        None,
+        lambda: get_project_options(
+            session, current_user.id, is_admin(current_user), q, OPTIONS_LIMIT
+        ),
     )
+    if not rows:
+        return HTMLResponse(
+            content='<option value="">No matching projects</option>'
+        )
 
-    options_html = ""
-    for project in projects:
-        options_html += f'<option value="{project.id}">{project.name}</option>'
-
+    options_html = "".join(
+        f'<option value="{escape(project_id)}">{escape(name)}</option>'
+        for project_id, name in rows
+    )
     return HTMLResponse(content=options_html)
 
 
@@ -112,18 +122,18 @@ def get_project_endpoint(
     session: ISession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    project = get_project(session, id=project_id)
-    pagination = calculate_pagination(total=0, page=1, per_page=15)
-    user_projects = get_users_projects(current_user.id, session, pagination)
-    project_ids = [project.id for project in user_projects[0]]
-
-    if not is_admin(current_user) and project_id not in project_ids:
+    if not is_admin(current_user) and current_user.id not in (
+        get_project_developer_ids(session, project_id)
+    ):
         raise HTTPException(status_code=403, detail="Access forbidden")
-    if not project:
+    try:
+        project, stats = get_project_overview(session, project_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Project not found")
 
     return templates.TemplateResponse(
-        "project/detail.html", {"request": request, "project": project}
+        "project/detail.html",
+        {"request": request, "project": project, "stats": stats},
     )
 
 
@@ -277,10 +287,8 @@ def assign_project_to_user_endpoint(
     user_id: str = Form(...),
     session: ISession = Depends(get_session),
 ):
-    assignment = assign_project_to_user(project_id, user_id, session)
-    return templates.TemplateResponse(
-        "project/detail.html", {"project": assignment, "request": request}
-    )
+    assign_project_to_user(project_id, user_id, session)
+    return RedirectResponse(url=f"/project/{project_id}", status_code=303)
 
 
 @project_router.get("/{project_id}/remove_user", response_class=HTMLResponse)
@@ -373,6 +381,11 @@ def get_user_by_project_endpoint(
         "current_sort": sort,
         "current_order": order,
     }
+    if request.headers.get("HX-Request"):
+        # Developers panel of the project detail page
+        context["headers"] = ["Name", "Email", "Tasks"]
+        context["panel_url"] = f"/project/{project_id}/users"
+        return templates.TemplateResponse("project/users_panel.html", context)
     return templates.TemplateResponse("user/users.html", context)
 
 
@@ -392,6 +405,7 @@ def get_tasks_by_project_endpoint(
     """
     sort_mapping = {
         "Title": Task.title,
+        "User": Task.user_name,
         "Hours Required": Task.hours_required,
         "Hours Worked": Task.hours_worked,
         "Status": Task.status,
@@ -423,4 +437,17 @@ def get_tasks_by_project_endpoint(
         "current_sort": sort,
         "current_order": order,
     }
+    if request.headers.get("HX-Request"):
+        # Tasks panel of the project detail page
+        context["headers"] = [
+            "Title",
+            "User",
+            "Hours Required",
+            "Hours Worked",
+            "Status",
+            "Logs",
+            "Last Updated",
+        ]
+        context["panel_url"] = f"/project/{project_id}/tasks"
+        return templates.TemplateResponse("project/tasks_panel.html", context)
     return templates.TemplateResponse("task/tasks.html", context)
@@ -0,0 +1,35 @@
+from fastapi import Query, Depends, Request, APIRouter
+from fastapi.responses import HTMLResponse
+
+from core.models.user import User
+from backend.utils.templates import templates
+from backend.views.search_view import search
+from backend.dependencies.auth import is_admin, get_current_user
+
+search_router = APIRouter(prefix="/search")
+
+
+@search_router.get("", response_class=HTMLResponse)
+async def search_endpoint(
+    request: Request,
+    q: str = Query("", max_length=200),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Search projects, tasks and logs visible to the current user.
+
+    - Admins search everything.
+    - Developers search their own tasks and logs and the projects they are
+      assigned to.
+    """
+    user_id = None if is_admin(current_user) else current_user.id
+    results = await search(q, user_id)
+
+    template = (
+        "search/results.html"
+        if request.headers.get("HX-Request")
+        else "search/search.html"
+    )
+    return templates.TemplateResponse(
+        template, {"request": request, "q": q, "results": results}
+    )
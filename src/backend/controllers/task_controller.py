@@ -1,5 +1,6 @@
 from io import StringIO
 import csv
+from html import escape
 from typing import Optional
 from datetime import datetime
 
@@ -22,6 +23,7 @@ from backend.views.task_view import (
     get_all_tasks,
     get_task_logs,
     get_user_tasks,
+    get_task_options,
     get_project_tasks,
 )
 from backend.dependencies.auth import (
@@ -31,10 +33,18 @@ from backend.dependencies.auth import (
 )
 from backend.models.pagination import Pagination
 from database.interfaces.session import ISession
-from backend.utils.filters_and_sort import get_filters, get_sorting
+from backend.utils.options_cache import OPTIONS_LIMIT, options_cache
+from backend.utils.filters_and_sort import (
+    RELEVANCE,
+    get_filters,
+    get_sorting,
+)
 
 task_router = APIRouter(prefix="/task")
 
+# Columns with a FULLTEXT index, see the task_mapper table definition.
+TASK_SEARCH_FIELDS = ["title", "description"]
+
 
 @task_router.get("/create")
 def get_task_home(
@@ -80,31 +90,38 @@ async def create_task_endpoint(
 
 
 @task_router.get("/options", response_class=HTMLResponse)
-def get_project_options(
+def get_task_options_endpoint(
     request: Request,
+    q: str = Query("", max_length=100),
+    selected: Optional[str] = Query(None),
     session: ISession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    pagination = Pagination(
-        limit=300,
-        current_page=1,
-        order_by=[Task.timestamp],  # type: ignore
-    )
-    tasks = (
-        get_all_tasks(session, pagination)[0]
-        if is_admin(current_user)
-        else [
-            project
-            for project in get_user_tasks(
-                session, current_user.id, pagination
-            )[0]
-        ]
+    """
+    Typeahead options for the task select, see `get_task_options`.
+    """
+    rows = options_cache.get_or_load(
+        "task",
+        current_user.id,
+        q,
+        selected,
+        lambda: get_task_options(
+            session,
+            current_user.id,
+            is_admin(current_user),
+            q,
+            selected,
+            OPTIONS_LIMIT,
+        ),
     )
+    if not rows:
+        return HTMLResponse(content='<option value="">No matching tasks</option>')
 
-    options_html = ""
-    for task in tasks:
-        options_html += f'<option value="{task.id}" status="{task.status}">{task.title}</option>'
-
+    options_html = "".join(
+        f'<option value="{escape(task_id)}" status="{escape(status or "")}">'
+        f"{escape(title)}</option>"
+        for task_id, title, status in rows
+    )
     return HTMLResponse(content=options_html)
 
 
@@ -130,6 +147,7 @@ def export_tasks_csv(
             "Date": "timestamp",
             "Last Updated": "last_updated",
             "User": "user_name",
+            "Description": "description",
         }
         pagination = Pagination(limit=None, current_page=1, order_by=[])
         filters = get_filters(
@@ -137,6 +155,7 @@ def export_tasks_csv(
             filter_mapping,
             "Title",
             date_fields=["Date", "Last Updated"],
+            search_fields=TASK_SEARCH_FIELDS,
         )
 
         tasks, _ = get_all_tasks(session, pagination, **filters)
@@ -239,11 +258,9 @@ def get_all_tasks_endpoint(
         "Status": Task.status,
         "Date": Task.timestamp,
         "Last Updated": Task.last_updated,
+        RELEVANCE: Task.title,
     }
 
-    order_by = get_sorting(sort, order, sort_mapping)
-    pagination = Pagination(limit=limit, current_page=page, order_by=order_by)
-
     filter_mapping = {
         "Title": "title",
         "Project": "project_name",
@@ -253,6 +270,7 @@ def get_all_tasks_endpoint(
         "Date": "timestamp",
         "Last Updated": "last_updated",
         "User": "user_name",
+        "Description": "description",
     }
 
     filters = get_filters(
@@ -260,8 +278,12 @@ def get_all_tasks_endpoint(
         filter_mapping,
         "Title",
         date_fields=["Date", "Last Updated"],
+        search_fields=TASK_SEARCH_FIELDS,
     )
 
+    order_by = get_sorting(sort, order, sort_mapping, filters)
+    pagination = Pagination(limit=limit, current_page=page, order_by=order_by)
+
     if is_admin(current_user):
         tasks, pagination = get_all_tasks(session, pagination, **filters)
     else:
@@ -299,7 +321,9 @@ def get_all_tasks_endpoint(
                 "Hours Worked",
                 "Status",
                 "User",
+                "Description",
             ],
+            "show_relevance": True,
         },
     )
 
@@ -34,7 +34,9 @@ from backend.dependencies.auth import (
     get_current_user,
 )
 from backend.models.pagination import Pagination
-from backend.views.project_view import get_project
+from backend.utils.passwords import PasswordHashingBusy
+from backend.views.project_view import get_project_developer_ids
+from backend.utils.user_directory import user_directory
 from database.interfaces.session import ISession
 from backend.utils.filters_and_sort import get_filters, get_sorting
 
@@ -74,9 +76,13 @@ async def create_user_endpoint(
         password=password,
         permissions=permissions,
     )
+    try:
+        created_user = await create_user(user, session)
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry")
     return templates.TemplateResponse(
         "user/detail.html",
-        {"request": request, "user": create_user(user, session)},
+        {"request": request, "user": created_user},
     )
 
 
@@ -93,7 +99,10 @@ async def login_user(
     session: ISession = Depends(get_session),
     csrf_protect=Depends(validate_csrf),
 ):
-    authenticated_user = authenticate_user(email, password, session)
+    try:
+        authenticated_user = await authenticate_user(email, password, session)
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry")
     if not authenticated_user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
     request.session["user_id"] = authenticated_user.id
@@ -118,14 +127,12 @@ def get_user_options(
     session: ISession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    order_by = [User.full_name]  # type: ignore
-
-    pagination = Pagination(limit=limit, current_page=page, order_by=order_by)
-
-    project = get_project(session, id=project_id)
-    users, pagination = get_all_users(session, pagination)
-
-    users = [user for user in users if user not in project.developers]
+    developer_ids = get_project_developer_ids(session, project_id)
+    users = [
+        user
+        for user in user_directory.all(session)
+        if user.id not in developer_ids
+    ][(page - 1) * limit : page * limit]
 
     html_options = [
         f'<option value="{user.id}">{user.full_name}</option>'
@@ -148,19 +155,25 @@ def get_user_endpoint(
 
 
 @user_router.put("/{user_id}", response_model=UserResponseModel)
-def update_user_endpoint(
+async def update_user_endpoint(
     user_id: str,
     user_update: UserCreateModel,
     session: ISession = Depends(get_session),
 ):
-    return update_user(user_id, user_update, session)
+    try:
+        return await update_user(user_id, user_update, session)
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry")
 
 
 @user_router.post("/upsert", response_model=UserResponseModel)
-def upsert_user_endpoint(
+async def upsert_user_endpoint(
     user: UserCreateModel, session: ISession = Depends(get_session)
 ):
-    return upsert_user(user, session)
+    try:
+        return await upsert_user(user, session)
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry")
 
 
 @user_router.get("/", response_class=HTMLResponse)
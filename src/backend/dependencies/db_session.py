@@ -1,8 +1,23 @@
-from database.adapters.mysql import MySQL
+from typing import Iterator
+
+from database.adapters import get_adapter
 from database.interfaces.session import ISession
 from database.sessions.sqlalchemy_session import SQLAlchemySession
 
 
-async def get_session() -> ISession:
-    wrapped_session = SQLAlchemySession(MySQL.session())
-    return wrapped_session
+def get_session() -> Iterator[ISession]:
+    """
+    One session, and so at most one pooled connection, per request.
+
+    FastAPI caches the dependency within a request, so get_current_user
+    and the endpoint share it. Views commit their writes once; anything
+    left uncommitted when the request ends is rolled back on close.
+    """
+    session = SQLAlchemySession(get_adapter().session(), close_on_exit=False)
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -0,0 +1,17 @@
+from .csrf import CSRFMiddleware
+from .log_request import LogRequestMiddleware
+from .loop_monitor import LoopMonitorMiddleware
+from .auth_redirect import AuthRedirectMiddleware
+from .metrics import MetricsMiddleware
+from .profiler import ProfilerMiddleware
+from .request_context import RequestContextMiddleware
+
+__all__ = [
+    "CSRFMiddleware",
+    "LogRequestMiddleware",
+    "LoopMonitorMiddleware",
+    "AuthRedirectMiddleware",
+    "MetricsMiddleware",
+    "ProfilerMiddleware",
+    "RequestContextMiddleware",
+]
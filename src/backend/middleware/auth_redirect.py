@@ -0,0 +1,46 @@
+from typing import Tuple
+
+from starlette.types import Send, Scope, ASGIApp, Receive
+from starlette.responses import RedirectResponse
+
+PUBLIC_PATHS: Tuple[str, ...] = (
+    "/user/login",
+    "/healthcheck",
+)
+# Public as exact paths only; GET /metrics checks the scraper's token
+# itself, the other /metrics pages need a login.
+PUBLIC_EXACT_PATHS: Tuple[str, ...] = ("/metrics",)
+
+
+class AuthRedirectMiddleware:
+    """
+    Redirects anonymous requests to the login page.
+
+    Must run inside `SessionMiddleware`, which populates `scope["session"]`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        public_paths=PUBLIC_PATHS,
+        public_exact_paths=PUBLIC_EXACT_PATHS,
+    ):
+        self.app = app
+        self.public_paths = tuple(public_paths)
+        self.public_exact_paths = frozenset(public_exact_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(self.public_paths)
+            or scope["path"] in self.public_exact_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if not scope["session"].get("user_id"):
+            response = RedirectResponse(url="/user/login")
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
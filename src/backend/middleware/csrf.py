@@ -0,0 +1,21 @@
+import secrets
+
+from starlette.types import Send, Scope, ASGIApp, Receive
+
+
+class CSRFMiddleware:
+    """
+    Makes sure every session carries a CSRF token.
+
+    Must run inside `SessionMiddleware`, which populates `scope["session"]`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            session = scope["session"]
+            if "csrftoken" not in session:
+                session["csrftoken"] = secrets.token_hex(32)
+        await self.app(scope, receive, send)
@@ -0,0 +1,25 @@
+from loguru import logger
+from starlette.types import Send, Scope, ASGIApp, Receive
+from starlette.datastructures import URL, Headers
+
+
+class LogRequestMiddleware:
+    """
+    Logs every HTTP request at DEBUG level.
+
+    The message is built lazily, so the URL and header formatting only
+    happens when DEBUG records are actually emitted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            logger.opt(lazy=True).debug(
+                "Request: {} {} Headers: {}",
+                lambda: scope["method"],
+                lambda: URL(scope=scope),
+                lambda: Headers(scope=scope),
+            )
+        await self.app(scope, receive, send)
@@ -0,0 +1,21 @@
+from starlette.types import Send, Scope, ASGIApp, Receive
+
+from backend.utils.loop_monitor import LoopMonitor, loop_monitor
+
+
+class LoopMonitorMiddleware:
+    """
+    Starts the loop monitor on the first request of a worker and tags each
+    request task with its scope, so blocking events can name their route.
+    """
+
+    def __init__(self, app: ASGIApp, monitor: LoopMonitor = loop_monitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            if not self.monitor.running:
+                self.monitor.start()
+            self.monitor.track(scope)
+        await self.app(scope, receive, send)
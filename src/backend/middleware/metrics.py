@@ -0,0 +1,42 @@
+import time
+
+from starlette.types import Send, Scope, ASGIApp, Message, Receive
+
+from backend.utils.metrics import http_requests, http_request_duration
+from backend.utils.request_context import route_name
+
+UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Counts requests and times them by route template, not raw path, so
+    ids in URLs don't each become a series. Requests no route matched are
+    grouped together.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_name(scope) if "route" in scope else UNMATCHED
+            http_request_duration.observe(
+                time.perf_counter() - started, route
+            )
+            http_requests.inc(route, str(status))
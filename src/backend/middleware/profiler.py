@@ -0,0 +1,145 @@
+import os
+import json
+from typing import Optional
+from urllib.parse import urlencode, parse_qsl
+
+from starlette.types import Send, Scope, ASGIApp, Message, Receive
+from starlette.requests import Request
+from starlette.responses import Response, HTMLResponse
+from fastapi.concurrency import run_in_threadpool
+
+from config.env import ENV
+from core.models.user import User
+from database.adapters import get_adapter
+from backend.utils.profiler import (
+    CATEGORIES,
+    SamplingProfiler,
+    active_profiler,
+)
+from backend.utils.templates import templates
+from backend.dependencies.auth import is_admin
+from backend.utils.request_context import route_name
+from database.repositories.repository import Repository
+from database.sessions.sqlalchemy_session import SQLAlchemySession
+
+PROFILE_PARAM = "__profile"
+PROFILE_HEADER = b"x-profile"
+SPEEDSCOPE = "speedscope"
+
+
+def requested_format(scope: Scope) -> Optional[str]:
+    """
+    "html" or "speedscope" when the request asks to be profiled with
+    `?__profile=1|speedscope` or an `X-Profile: 1|speedscope` header.
+    """
+    value = None
+    if PROFILE_PARAM.encode() in scope["query_string"]:
+        query = parse_qsl(scope["query_string"].decode("latin-1"))
+        value = dict(query).get(PROFILE_PARAM)
+    else:
+        for name, header in scope["headers"]:
+            if name == PROFILE_HEADER:
+                value = header.decode("latin-1")
+    if value is None or value.lower() in ("", "0", "false"):
+        return None
+    return SPEEDSCOPE if value.lower() == SPEEDSCOPE else "html"
+
+
+def _is_admin_id(user_id: str) -> bool:
+    with SQLAlchemySession(get_adapter().session()) as session:
+        user = Repository(session, User).get(user_id)
+        return user is not None and is_admin(user)
+
+
+class ProfilerMiddleware:
+    """
+    Answers an admin's request asking to be profiled (see
+    `requested_format`) with a sampling profile of it, as a flame graph page
+    or a speedscope file, instead of its response. Other requests only pay
+    for a look at the query string and headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        output = requested_format(scope) if scope["type"] == "http" else None
+        if output is None:
+            await self.app(scope, receive, send)
+            return
+        user_id = scope.get("session", {}).get("user_id")
+        if not user_id or not await run_in_threadpool(_is_admin_id, user_id):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(
+            interval=ENV.PROFILER_INTERVAL_MS / 1000,
+            max_duration=ENV.PROFILER_MAX_SECONDS,
+        )
+        token = active_profiler.set(profiler)
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+            active_profiler.reset(token)
+
+        name = route_name(scope)
+        if output == SPEEDSCOPE:
+            response = _speedscope_response(profiler, name)
+        else:
+            response = await run_in_threadpool(
+                _flame_graph_response, profiler, scope, name, status
+            )
+        await response(scope, receive, send)
+
+
+def _speedscope_response(profiler: SamplingProfiler, name: str) -> Response:
+    filename = "".join(c if c.isalnum() else "-" for c in name).strip("-")
+    return Response(
+        json.dumps(profiler.speedscope(name)),
+        media_type="application/json",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.speedscope.json"'
+            )
+        },
+    )
+
+
+def _flame_graph_response(
+    profiler: SamplingProfiler, scope: Scope, name: str, status: int
+) -> HTMLResponse:
+    query = [
+        (key, value)
+        for key, value in parse_qsl(scope["query_string"].decode("latin-1"))
+        if key != PROFILE_PARAM
+    ]
+    query.append((PROFILE_PARAM, SPEEDSCOPE))
+    boxes = profiler.flame_graph()
+    html = templates.get_template("metrics/profile.html").render(
+        request=Request(scope),
+        name=name,
+        status=status,
+        duration_ms=round(profiler.total() * 1000, 1),
+        samples=len(profiler.samples),
+        interval_ms=profiler.interval * 1000,
+        breakdown=profiler.breakdown(),
+        categories=CATEGORIES,
+        boxes=boxes,
+        depth=max((box["depth"] for box in boxes), default=0) + 1,
+        speedscope_url=(
+            f"{scope['path']}?{urlencode(query)}"
+            if scope["method"] == "GET"
+            else None
+        ),
+        pid=os.getpid(),
+    )
+    return HTMLResponse(html)
@@ -0,0 +1,23 @@
+from starlette.types import Send, Scope, ASGIApp, Receive
+
+from backend.utils.request_context import request_scope
+
+
+class RequestContextMiddleware:
+    """
+    Makes the request scope available to code that isn't handed the
+    request, e.g. the connection pool monitor naming the route that waited.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
@@ -4,6 +4,8 @@ from .models import (
     UserCreateModel,
     LogResponseModel,
     TaskResponseModel,
+    LogBatchEntryModel,
+    LogBatchCreateModel,
     UserResponseModel,
     ProjectCreateModel,
     ProjectResponseModel,
@@ -18,4 +20,6 @@ __all__ = [
     "UserResponseModel",
     "LogCreateModel",
     "LogResponseModel",
+    "LogBatchEntryModel",
+    "LogBatchCreateModel",
 ]
@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from pydantic import Field, BaseModel
+
+
+class ImportJob(BaseModel):
+    id: str
+    filename: str
+    status: str = "queued"
+    created_at: int
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+    days_total: int = 0
+    days_processed: int = 0
+    matched: int = 0
+    created: int = 0
+    updated: int = 0
+    unmatched_names: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    @property
+    def progress(self) -> int:
+        if self.status == "done":
+            return 100
+        if not self.days_total:
+            return 0
+        return int(self.days_processed * 100 / self.days_total)
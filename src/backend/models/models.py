@@ -1,5 +1,5 @@
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 from ulid import ULID
 from pydantic import Field, EmailStr, BaseModel, validator
@@ -13,10 +13,24 @@ class LogCreateModel(BaseModel):
     id: str = Field(default=str(ULID()))
     user_id: str
     user_name: str
-    timestamp: int = Field(default=datetime.now().timestamp())
+    timestamp: int = Field(
+        default_factory=lambda: int(datetime.now().timestamp())
+    )
     task_id: str = Field(default=str(ULID()))
 
 
+class LogBatchEntryModel(BaseModel):
+    task_id: str
+    description: str
+    hours_spent_today: float = Field(gt=0, le=24)
+    task_status: str
+    day: date = Field(default_factory=date.today)
+
+
+class LogBatchCreateModel(BaseModel):
+    entries: List[LogBatchEntryModel] = Field(min_length=1, max_length=100)
+
+
 class LogResponseModel(BaseModel):
     id: str
     task_name: str
@@ -56,7 +70,9 @@ class TaskResponseModel(BaseModel):
     hours_worked: float
     returned: bool = False
     description: str
-    logs: List[LogCreateModel]
+    logs: List[LogCreateModel] = Field(default_factory=list)
+    log_count: Optional[int] = None
+    last_log_description: Optional[str] = None
     status: Optional[str] = None
     last_updated: Optional[int] = Field(default=None)
     timestamp: int = Field(default=int(datetime.now().timestamp()))
@@ -82,6 +98,9 @@ class ProjectResponseModel(BaseModel):
     email: Optional[EmailStr] = None
     developers: List["UserResponseModel"] = Field(default_factory=list)
     tasks: List[TaskResponseModel] = Field(default_factory=list)
+    developer_count: int = 0
+    developer_names: List[str] = Field(default_factory=list)
+    task_count: int = 0
 
     @validator('email', pre=True, always=True)
     def empty_str_to_none(cls, v):
@@ -103,6 +122,9 @@ class UserResponseModel(BaseModel):
     permissions: int
     tasks: List[TaskResponseModel] = Field(default_factory=list)
     projects: List["ProjectResponseModel"] = Field(default_factory=list)
+    project_count: int = 0
+    project_names: List[str] = Field(default_factory=list)
+    task_count: int = 0
 
 
 class UserLoginModel(BaseModel):
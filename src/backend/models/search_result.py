@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: str
+    id: str
+    title: str
+    subtitle: Optional[str] = None
+    snippet: Optional[str] = None
+    timestamp: Optional[int] = None
+    score: float = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"/{self.type}/{self.id}"
@@ -1,17 +1,42 @@
-import secrets
+import asyncio
 
 from loguru import logger
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import RedirectResponse
-from fastapi.concurrency import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool, asynccontextmanager
 from apscheduler.triggers.cron import CronTrigger
-from starlette.middleware.base import BaseHTTPMiddleware
+from apscheduler.triggers.interval import IntervalTrigger
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config.env import ENV
+from database.adapters import get_adapter
+from database.adapters.pool import pool_monitor
+from backend.middleware import (
+    CSRFMiddleware,
+    LogRequestMiddleware,
+    LoopMonitorMiddleware,
+    MetricsMiddleware,
+    ProfilerMiddleware,
+    AuthRedirectMiddleware,
+    RequestContextMiddleware,
+)
 from backend.views.log_view import get_projects_with_recent_logs
+from backend.views.task_view import reconcile_task_hours
+from backend.utils.metrics import (
+    registry,
+    instrument_engine,
+    scheduler_job_duration,
+)
+from backend.utils.passwords import shutdown_password_executor
+from backend.utils.import_jobs import shutdown_import_executor
+from backend.utils.slow_queries import slow_query_log
+from backend.utils.loop_monitor import loop_monitor
+from backend.utils.request_context import current_route
+from backend.utils.scheduler_lock import (
+    acquire_scheduler_lock,
+    release_scheduler_lock,
+)
 from backend.controllers.log_controller import log_router
 from backend.controllers.task_controller import task_router
 from backend.controllers.user_controller import user_router
@@ -19,77 +44,93 @@ from backend.controllers.project_controller import project_router
 from backend.controllers.dashboard_controller import dashboard_router
 from backend.controllers.healthcheck_controller import healthcheck_router
 from backend.controllers.calendar_controller import calendar_router
+from backend.controllers.metrics_controller import metrics_router
+from backend.controllers.search_controller import search_router
 
 scheduler = AsyncIOScheduler()
 
 async def scheduled_get_projects_with_recent_logs():
+    # Named so the loop monitor can attribute blocking time to the job
+    asyncio.current_task().set_name("daily_project_log_job")
     try:
-        await get_projects_with_recent_logs()
+        with scheduler_job_duration.time("daily_project_log_job"):
+            await get_projects_with_recent_logs()
         logger.info("Emails send to clients successfully.")
     except Exception as e:
         logger.error(f"Error running scheduled task: {e}")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Configure the trigger for daily at 11:59 PM
-    trigger = CronTrigger(hour=23, minute=57)
+async def scheduled_reconcile_task_hours():
+    asyncio.current_task().set_name("reconcile_task_hours_job")
+    try:
+        with scheduler_job_duration.time("reconcile_task_hours_job"):
+            corrected = await run_in_threadpool(reconcile_task_hours)
+        logger.info(f"Task hours reconciled, {corrected} tasks corrected.")
+    except Exception as e:
+        logger.error(f"Error reconciling task hours: {e}")
+
+def schedule_jobs():
+    # Emails every client with a project; only when asked for
+    if ENV.CLIENT_EMAILS_ENABLED:
+        # Configure the trigger for daily at 11:59 PM
+        trigger = CronTrigger(hour=23, minute=57)
+
+        # Add the asynchronous job to the scheduler
+        scheduler.add_job(
+            scheduled_get_projects_with_recent_logs,
+            trigger,
+            id="daily_project_log_job",
+            name="Daily Project Logs Retrieval and Email Sending",
+            replace_existing=True,
+        )
 
-    # Add the asynchronous job to the scheduler
     scheduler.add_job(
-        scheduled_get_projects_with_recent_logs,
-        trigger,
-        id="daily_project_log_job",
-        name="Daily Project Logs Retrieval and Email Sending",
+        scheduled_reconcile_task_hours,
+        IntervalTrigger(seconds=ENV.HOURS_RECONCILE_INTERVAL),
+        id="reconcile_task_hours_job",
+        name="Recompute task hours worked from logs",
         replace_existing=True,
     )
 
     scheduler.start()
     logger.info("APScheduler started and job added.")
 
-    yield
-
-app = FastAPI(title="Division5 Reports API", version="0.1.0")
-
-class LogRequestMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.debug(
-            f"Request: {request.method} {request.url} Headers: {request.headers}"
-        )
-        response: Response = await call_next(request)
-        return response
-
-
-app.add_middleware(LogRequestMiddleware)
-
-
-class CSRFMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if "csrftoken" not in request.session:
-            request.session["csrftoken"] = secrets.token_hex(32)
-        response = await call_next(request)
-        return response
-
-
-class AuthRedirectMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        public_paths = [
-            "/user/login",
-            "/healthcheck",
-        ]
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker, after gunicorn forks it from the preloaded
+    # master: the engine and its pool belong to the worker.
+    engine = await run_in_threadpool(lambda: get_adapter().engine)
+    instrument_engine(engine)
+    slow_query_log.instrument(engine)
+    registry.start()
 
-        if any(request.url.path.startswith(path) for path in public_paths):
-            return await call_next(request)
+    if acquire_scheduler_lock():
+        schedule_jobs()
 
-        user_id = request.session.get("user_id")
-        if not user_id:
-            return RedirectResponse(url="/user/login")
+    yield
 
-        response = await call_next(request)
-        return response
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    release_scheduler_lock()
+    registry.stop()
+    loop_monitor.stop()
+    shutdown_password_executor()
+    shutdown_import_executor()
+    get_adapter().dispose()
+
+app = FastAPI(
+    title="Division5 Reports API", version="0.1.0", lifespan=lifespan
+)
 
+# Slow connection checkouts are reported with the route that made them
+pool_monitor.caller = current_route
 
+app.add_middleware(LogRequestMiddleware)
+app.add_middleware(LoopMonitorMiddleware)
+app.add_middleware(RequestContextMiddleware)
 app.add_middleware(AuthRedirectMiddleware)
 app.add_middleware(CSRFMiddleware)
+# Inside the session middleware, which tells it who is asking
+app.add_middleware(ProfilerMiddleware)
 
 app.add_middleware(
     SessionMiddleware,
@@ -109,6 +150,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the latency covers the whole middleware stack
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(healthcheck_router, tags=["Health Check"])
 app.include_router(user_router, tags=["User"])
 app.include_router(project_router, tags=["Project"])
@@ -116,3 +160,5 @@ app.include_router(task_router, tags=["Task"])
 app.include_router(log_router, tags=["Log"])
 app.include_router(dashboard_router, tags=["Dashboard"])
 app.include_router(calendar_router, tags=["Calendar"])
+app.include_router(metrics_router, tags=["Metrics"])
+app.include_router(search_router, tags=["Search"])
@@ -0,0 +1,34 @@
+import os
+import time
+
+from config.env import ENV
+
+
+class CacheStamp:
+    """
+    Version stamp shared by every process on the host: the mtime of a file
+    under CACHE_STAMP_DIR.
+
+    Per-process caches (gunicorn workers, the import process) record the
+    stamp they were built under and rebuild once it has moved, so a write
+    in one process invalidates the copies held by all of them. Reading it
+    is a single stat().
+    """
+
+    def __init__(self, name: str):
+        self.path = os.path.join(ENV.CACHE_STAMP_DIR, name)
+
+    def read(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def bump(self) -> None:
+        os.makedirs(ENV.CACHE_STAMP_DIR, exist_ok=True)
+        # Strictly increasing, even for two bumps within the clock's
+        # resolution
+        stamp = max(time.time_ns(), self.read() + 1)
+        with open(self.path, "a"):
+            pass
+        os.utime(self.path, ns=(stamp, stamp))
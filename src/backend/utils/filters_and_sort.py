@@ -1,13 +1,28 @@
 import re
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from loguru import logger
 from sqlalchemy import asc, desc
 
+from database.sessions.full_text import relevance, indexed_terms
 
-def get_filters(combined_filters: Optional[str], filter_mapping: Dict[str, str], default_field: str, date_fields: Optional[List[str]] = None):
+RELEVANCE = "Relevance"
+
+
+def get_filters(
+    combined_filters: Optional[str],
+    filter_mapping: Dict[str, str],
+    default_field: str,
+    date_fields: Optional[List[str]] = None,
+    search_fields: Optional[List[str]] = None,
+):
+    """
+    Free text and `X has Y` on a field in `search_fields` (FULLTEXT-indexed
+    columns) become `__search`; on any other field, `__contains`.
+    """
     filters = {}
+    search_fields = search_fields or []
     operator_map = {
         ">": "gt",
         "<": "lt",
@@ -29,7 +44,12 @@ def get_filters(combined_filters: Optional[str], filter_mapping: Dict[str, str],
                     value_part = parts[1].strip()
                     db_field = filter_mapping.get(field_part)
                     if db_field:
-                        filters[f"{db_field}__contains"] = value_part
+                        op_key = (
+                            "search"
+                            if db_field in search_fields
+                            else "contains"
+                        )
+                        filters[f"{db_field}__{op_key}"] = value_part
                 continue
 
             pattern = r"^(?P<field>.*?)\s*(?P<op>>=|<=|>|<|=)\s*(?P<value>.*)$"
@@ -51,15 +71,37 @@ def get_filters(combined_filters: Optional[str], filter_mapping: Dict[str, str],
                     filters[f"{db_field}__{op_key}"] = value_part
             else:
                 if search_field := filter_mapping.get(default_field):
-                    filters[search_field + "__contains"] = mf
+                    op_key = (
+                        "search"
+                        if search_field in search_fields
+                        else "contains"
+                    )
+                    filters[f"{search_field}__{op_key}"] = mf
                 else:
                     logger.warning(
                         f"Could not find field for search term: {mf}"
                     )
     return filters
 
-def get_sorting(sort: Optional[str], order: Optional[str], sort_mapping: Dict[str, str]):
+
+def get_sorting(
+    sort: Optional[str],
+    order: Optional[str],
+    sort_mapping: Dict[str, str],
+    filters: Optional[Dict[str, Any]] = None,
+):
+    """
+    `sort_mapping[RELEVANCE]` names the searched column; relevance sorts by
+    its full-text score for the `__search` filter on it, best match first.
+    """
     order_by = []
+    if sort == RELEVANCE:
+        sort_field = sort_mapping.get(sort)
+        key = getattr(sort_field, "key", None)
+        term = (filters or {}).get(f"{key}__search")
+        if sort_field is not None and term:
+            order_by.append(desc(relevance(sort_field, indexed_terms(term))))
+        return order_by
     if sort:
         sort_field = sort_mapping.get(sort)
         if sort_field:
@@ -0,0 +1,141 @@
+import os
+import time
+import multiprocessing
+from typing import Any, Callable, Iterator, Optional
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ulid import ULID
+from loguru import logger
+
+from config.env import ENV
+from backend.models.import_job import ImportJob
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single dev server, one pool is the limit
+    fcntl = None  # type: ignore
+
+SLOT_POLL_SECONDS = 1.0
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(ENV.IMPORT_DIR, f"{job_id}.json")
+
+
+def upload_path(job_id: str, file_extension: str) -> str:
+    return os.path.join(ENV.IMPORT_DIR, f"{job_id}.{file_extension}")
+
+
+def create_job(filename: str) -> ImportJob:
+    os.makedirs(ENV.IMPORT_DIR, exist_ok=True)
+    job = ImportJob(
+        id=str(ULID()), filename=filename, created_at=int(time.time())
+    )
+    save_job(job)
+    return job
+
+
+def save_job(job: ImportJob) -> None:
+    """
+    Persist the job state next to the uploaded file. Written atomically so
+    pollers served by any worker never read a half-written file.
+    """
+    path = _job_path(job.id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(job.model_dump_json())
+    os.replace(tmp_path, path)
+
+
+def get_job(job_id: str) -> Optional[ImportJob]:
+    if not job_id.isalnum():
+        return None
+    try:
+        with open(_job_path(job_id)) as f:
+            return ImportJob.model_validate_json(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned, not forked: the worker builds its own DB engine instead of
+        # inheriting this process's pooled connections.
+        _executor = ProcessPoolExecutor(
+            max_workers=ENV.IMPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+@contextmanager
+def _import_slot() -> Iterator[None]:
+    """
+    Hold one of IMPORT_WORKERS slots shared by every web worker on the
+    host: an flock on a slot file in IMPORT_DIR, released by the OS if the
+    import process dies. Waits until a slot is free.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(ENV.IMPORT_DIR, exist_ok=True)
+    while True:
+        for slot in range(ENV.IMPORT_WORKERS):
+            path = os.path.join(ENV.IMPORT_DIR, f".slot-{slot}.lock")
+            lock_file = open(path, "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                continue
+            try:
+                yield
+            finally:
+                lock_file.close()
+            return
+        time.sleep(SLOT_POLL_SECONDS)
+
+
+def _run_in_slot(fn: Callable[..., Any], job_id: str, *args) -> Any:
+    with _import_slot():
+        return fn(job_id, *args)
+
+
+def enqueue(
+    job: ImportJob,
+    fn: Callable[..., Any],
+    *args,
+    on_done: Optional[Callable[[ImportJob], None]] = None,
+) -> Future:
+    """
+    Queue `fn(job_id, *args)` on the import pool. Every web worker has its
+    own pool, but a job only starts once it holds an import slot, so at
+    most IMPORT_WORKERS jobs run at once on the host; the rest stay queued.
+    """
+
+    def _finished(future: Future) -> None:
+        error = future.exception()
+        current = get_job(job.id) or job
+        if error is not None:
+            logger.opt(exception=error).error(f"Import job {job.id} failed")
+            current.status = "failed"
+            current.errors.append(str(error))
+            current.finished_at = int(time.time())
+            save_job(current)
+        if on_done is not None:
+            on_done(current)
+
+    future = _get_executor().submit(_run_in_slot, fn, job.id, *args)
+    future.add_done_callback(_finished)
+    return future
+
+
+def shutdown_import_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -0,0 +1,183 @@
+import sys
+import time
+import asyncio
+import weakref
+import threading
+import traceback
+import statistics
+from typing import Any, Dict, List, Optional
+from collections import deque
+
+from loguru import logger
+
+from config.env import ENV
+from backend.utils.metrics import loop_lag, loop_blocking
+from backend.utils.request_context import route_name
+
+
+class LoopMonitor:
+    """
+    Watches the event loop of the current worker.
+
+    A sampling task measures scheduling delay: how late `asyncio.sleep`
+    wakes up compared to what was asked. A watchdog thread posts a callback
+    onto the loop and, when it is not run within the threshold, captures the
+    loop thread's stack and the route of the task holding the loop.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        threshold: float,
+        history: int = 50,
+        samples: int = 1200,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.lag_samples: deque = deque(maxlen=samples)
+        self.blocking_events: deque = deque(maxlen=history)
+        self.max_lag = 0.0
+        self.blocking_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._scopes: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Start monitoring the running loop. Must be called from the loop.
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Loop monitor started (interval {}s, blocking threshold {}s)",
+            self.interval,
+            self.threshold,
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def track(self, scope: Dict[str, Any]) -> None:
+        """
+        Associate the current task with an ASGI request scope so blocking
+        events can name the route responsible.
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            self._scopes[task] = scope
+
+    async def _sample(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.lag_samples.append(lag)
+            loop_lag.observe(max(lag, 0.0))
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag > self.threshold:
+                logger.warning("Event loop lag {:.1f} ms", lag * 1000)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold):
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                return
+            ran = threading.Event()
+            posted = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return
+            if ran.wait(self.threshold):
+                continue
+
+            route = self._current_route(loop)
+            stack = self._loop_stack()
+            while not ran.wait(self.threshold):
+                if self._stop.is_set() or loop.is_closed():
+                    return
+            self._record_blocking(time.perf_counter() - posted, route, stack)
+
+    def _current_route(self, loop: asyncio.AbstractEventLoop) -> str:
+        task = asyncio.current_task(loop)
+        if task is None:
+            return "<loop callback>"
+        scope = self._scopes.get(task)
+        if scope is None:
+            return f"<task {task.get_name()}>"
+        return route_name(scope)
+
+    def _loop_stack(self) -> List[str]:
+        if self._loop_thread_id is None:
+            return []
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame, limit=20)
+
+    def _record_blocking(
+        self, duration: float, route: str, stack: List[str]
+    ) -> None:
+        self.blocking_count += 1
+        loop_blocking.inc()
+        self.blocking_events.append(
+            {
+                "timestamp": int(time.time()),
+                "duration_ms": round(duration * 1000, 1),
+                "route": route,
+                "stack": stack,
+            }
+        )
+        logger.opt(lazy=True).warning(
+            "Event loop blocked for {:.1f} ms by {}\n{}",
+            lambda: duration * 1000,
+            lambda: route,
+            lambda: "".join(stack),
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = list(self.lag_samples)
+        lag: Dict[str, Any] = {
+            "samples": len(samples),
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
+        if samples:
+            lag["last_ms"] = round(samples[-1] * 1000, 2)
+            lag["mean_ms"] = round(statistics.fmean(samples) * 1000, 2)
+        if len(samples) >= 2:
+            quantiles = statistics.quantiles(samples, n=100)
+            lag["p50_ms"] = round(quantiles[49] * 1000, 2)
+            lag["p99_ms"] = round(quantiles[98] * 1000, 2)
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag": lag,
+            "blocking_count": self.blocking_count,
+            "blocking_events": list(self.blocking_events),
+        }
+
+
+loop_monitor = LoopMonitor(
+    interval=ENV.LOOP_MONITOR_INTERVAL_MS / 1000,
+    threshold=ENV.LOOP_BLOCKING_THRESHOLD_MS / 1000,
+)
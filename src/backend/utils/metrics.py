@@ -0,0 +1,424 @@
+import os
+import json
+import time
+import bisect
+import secrets
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Callable,
+    ClassVar,
+    Iterator,
+    Optional,
+)
+from contextlib import contextmanager
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.env import ENV
+from database.adapters.pool import WAIT_BUCKETS, pool_monitor
+from backend.utils.request_context import current_route
+
+Labels = Tuple[str, ...]
+
+# Request, statement and job durations, in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)  # fmt: skip
+
+
+class Metric:
+    """
+    One metric family of the current process, values keyed by label values.
+    """
+
+    type: ClassVar[str] = ""
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, Any] = {}
+
+    def dump(self) -> List[List[Any]]:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        """
+        For collectors mirroring a count kept elsewhere.
+        """
+        with self._lock:
+            self._values[labels] = value
+
+
+class Gauge(Metric):
+    """
+    A current value, summed over the live workers.
+    """
+
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Values are the per-bucket (not cumulative) counts, then the sum.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def set_totals(self, counts: List[int], total: float, *labels: str):
+        """
+        For collectors mirroring a histogram kept elsewhere with the same
+        buckets.
+        """
+        with self._lock:
+            self._values[labels] = [*counts, total]
+
+
+class MetricsRegistry:
+    """
+    Metrics of all the gunicorn workers, in the Prometheus text format.
+
+    Recording only touches this process's memory. Every `flush_interval`
+    seconds, when it answers a scrape and when it exits, a worker writes
+    its values to `<directory>/<pid>-<random>.json`; the scrape adds up the
+    files. Counters and histograms of workers that have exited keep
+    counting, gauges only come from live ones. Other workers' values are at
+    most `flush_interval` old.
+    """
+
+    def __init__(self, directory: str, flush_interval: float):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file_pid = 0
+        self._file_name = ""
+
+    def register(self, metric: Metric) -> Any:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def collector(self, collect: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register `collect` to update gauges from other state before each
+        flush.
+        """
+        self.collectors.append(collect)
+        return collect
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._flush_periodically, name="metrics-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def clear(self) -> None:
+        """
+        Forget the values of earlier runs. Called by the gunicorn master
+        before it starts the workers.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error writing metrics: {e}")
+
+    def flush(self) -> None:
+        for collect in self.collectors:
+            collect()
+        data = {
+            "pid": os.getpid(),
+            "metrics": {
+                name: metric.dump() for name, metric in self.metrics.items()
+            },
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _path(self) -> str:
+        # One file per process rather than per pid: a new worker can get
+        # the pid of one that has exited and must not overwrite its counts.
+        # Checked on every flush, since workers are forked after import.
+        pid = os.getpid()
+        if self._file_pid != pid:
+            self._file_pid = pid
+            self._file_name = f"{pid}-{secrets.token_hex(4)}.json"
+        return os.path.join(self.directory, self._file_name)
+
+    def _read_all(self) -> Iterator[Tuple[bool, Dict[str, Any]]]:
+        # A live worker rewrites its file every flush_interval; an older
+        # file whose pid is running belongs to a worker that exited before
+        # its pid was reused.
+        stale_after = 3 * self.flush_interval
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    age = time.time() - os.fstat(f.fileno()).st_mtime
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = age < stale_after and _is_alive(data["pid"])
+            yield alive, data["metrics"]
+
+    def aggregate(self) -> Dict[str, Dict[Labels, Any]]:
+        self.flush()
+        totals: Dict[str, Dict[Labels, Any]] = {
+            name: {} for name in self.metrics
+        }
+        for alive, metrics in self._read_all():
+            for name, samples in metrics.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                values = totals[name]
+                for labels, value in samples:
+                    key = tuple(labels)
+                    values[key] = _combine(metric, values.get(key), value)
+        return totals
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, values in self.aggregate().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for labels, value in sorted(values.items()):
+                pairs = list(zip(metric.labels, labels))
+                if isinstance(metric, Histogram):
+                    lines.extend(_histogram_lines(metric, pairs, value))
+                else:
+                    lines.append(f"{name}{_labels(pairs)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _combine(metric: Metric, current: Any, value: Any) -> Any:
+    if current is None:
+        return value
+    if isinstance(metric, Histogram):
+        return [a + b for a, b in zip(current, value)]
+    return current + value
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(
+    metric: Histogram, pairs: List[Tuple[str, str]], value: List[Any]
+) -> Iterator[str]:
+    cumulative = 0
+    for bound, count in zip((*metric.buckets, float("inf")), value[:-1]):
+        cumulative += count
+        bucket = _labels([*pairs, ("le", _number(float(bound)))])
+        yield f"{metric.name}_bucket{bucket} {cumulative}"
+    yield f"{metric.name}_sum{_labels(pairs)} {_number(value[-1])}"
+    yield f"{metric.name}_count{_labels(pairs)} {cumulative}"
+
+
+registry = MetricsRegistry(
+    directory=ENV.METRICS_DIR, flush_interval=ENV.METRICS_FLUSH_INTERVAL
+)
+
+http_requests = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status.",
+        ("route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("route",),
+    )
+)
+db_statement_duration = registry.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "SQL statement execution time by the route that ran it.",
+        ("route",),
+    )
+)
+template_render_duration = registry.register(
+    Histogram(
+        "template_render_duration_seconds",
+        "Jinja template render time.",
+        ("template",),
+    )
+)
+email_send_duration = registry.register(
+    Histogram(
+        "email_send_duration_seconds",
+        "SMTP send latency.",
+        ("outcome",),
+    )
+)
+scheduler_job_duration = registry.register(
+    Histogram(
+        "scheduler_job_duration_seconds",
+        "Scheduled job run time.",
+        ("job",),
+        buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 600),
+    )
+)
+loop_lag = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "Event loop scheduling delay, sampled by the loop monitor.",
+    )
+)
+loop_blocking = registry.register(
+    Counter(
+        "event_loop_blocking_total",
+        "Times the event loop was blocked longer than the threshold.",
+    )
+)
+db_pool_wait = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time waited for a pooled database connection.",
+        buckets=WAIT_BUCKETS,
+    )
+)
+db_pool_timeouts = registry.register(
+    Counter(
+        "db_pool_timeouts_total",
+        "Checkouts that gave up waiting for a database connection.",
+    )
+)
+db_pool_connections = registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Pooled database connections by state, across workers.",
+        ("state",),
+    )
+)
+
+
+@registry.collector
+def _collect_pool() -> None:
+    counts, wait_sum, timeouts = pool_monitor.totals()
+    db_pool_wait.set_totals(counts, wait_sum)
+    db_pool_timeouts.set_total(timeouts)
+    pool = pool_monitor.pool
+    if pool is not None:
+        db_pool_connections.set(pool.checkedout(), "checked_out")
+        db_pool_connections.set(pool.checkedin(), "checked_in")
+        db_pool_connections.set(max(pool.overflow(), 0), "overflow")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement `engine` runs into db_statement_duration.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, params, context, many):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, params, context, many):
+    started = getattr(context, "_metrics_started", None)
+    if started is not None:
+        db_statement_duration.observe(
+            time.perf_counter() - started, current_route()
+        )
@@ -0,0 +1,75 @@
+import time
+import threading
+from typing import Any, List, Tuple, Callable, Optional
+from collections import OrderedDict
+
+from config.env import ENV
+from backend.utils.cache_stamp import CacheStamp
+
+OPTIONS_LIMIT = 20
+
+OptionsKey = Tuple[str, str, str, Optional[str]]
+
+
+class OptionsCache:
+    """
+    Per-worker cache of typeahead results keyed by (kind, user id, query,
+    selected id).
+
+    Writers invalidate the kind they touch, for one user or everyone, in
+    this worker, and bump a shared stamp that drops every entry in the
+    others; the TTL covers writes made outside the app.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._stamp = CacheStamp("options")
+        self._lock = threading.Lock()
+        self._entries: (
+            "OrderedDict[OptionsKey, Tuple[float, int, List[Any]]]"
+        ) = OrderedDict()
+
+    def get_or_load(
+        self,
+        kind: str,
+        user_id: str,
+        q: str,
+        selected: Optional[str],
+        load: Callable[[], List[Any]],
+    ) -> List[Any]:
+        key = (kind, user_id, q.casefold(), selected)
+        # Read before loading, so a write that lands during the load leaves
+        # this entry stale rather than current.
+        stamp = self._stamp.read()
+        with self._lock:
+            cached = self._entries.get(key)
+            if (
+                cached
+                and cached[1] == stamp
+                and time.monotonic() - cached[0] < self.ttl
+            ):
+                self._entries.move_to_end(key)
+                return cached[2]
+
+        rows = load()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stamp, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rows
+
+    def invalidate(self, kind: str, user_id: Optional[str] = None) -> None:
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[0] == kind and (user_id is None or key[1] == user_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+        self._stamp.bump()
+
+
+options_cache = OptionsCache(ttl=ENV.OPTIONS_CACHE_TTL)
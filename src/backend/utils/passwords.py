@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+from typing import Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from config.env import ENV
+
+HASHER_PARAMETERS = {
+    "time_cost": ENV.ARGON2_TIME_COST,
+    "memory_cost": ENV.ARGON2_MEMORY_COST,
+    "parallelism": ENV.ARGON2_PARALLELISM,
+}
+
+password_hasher = PasswordHasher(**HASHER_PARAMETERS)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+
+class PasswordHashingBusy(RuntimeError):
+    """
+    Raised when the password hashing queue is full.
+    """
+
+
+def _init_worker(parameters: dict) -> None:
+    global password_hasher
+    password_hasher = PasswordHasher(**parameters)
+
+
+def _hash(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def _verify(hashed: str, password: str) -> Tuple[bool, Optional[str]]:
+    try:
+        password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        # A wrong password (VerifyMismatchError is a VerificationError), or
+        # a stored hash argon2 can't read: either way, no login.
+        return False, None
+    if password_hasher.check_needs_rehash(hashed):
+        return True, password_hasher.hash(password)
+    return True, None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned, not forked: the web worker already runs threads (the loop
+        # monitor, the metrics flush, the threadpool), and a child forked
+        # while one of them holds a lock can deadlock.
+        _executor = ProcessPoolExecutor(
+            max_workers=ENV.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(HASHER_PARAMETERS,),
+        )
+    return _executor
+
+
+async def _submit(fn, *args):
+    global _pending
+    if _pending >= ENV.PASSWORD_HASH_QUEUE_SIZE:
+        raise PasswordHashingBusy("Password hashing queue is full")
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured argon2 parameters off the event loop.
+    """
+    return await _submit(_hash, password)
+
+
+async def verify_password(
+    hashed: str, password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password against its hash off the event loop.
+
+    Returns whether the password matched and, when the stored hash was made
+    with outdated parameters, a fresh hash to store in its place.
+    """
+    return await _submit(_verify, hashed, password)
+
+
+def shutdown_password_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,229 @@
+import time
+import calendar
+import threading
+from typing import Any, Dict, List, Tuple, Optional
+from datetime import date
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from config.env import ENV
+from database.models import calendar_mapper  # noqa F401
+from database.interfaces.session import ISession
+from core.models.office_calendar import OfficeCalendar
+from backend.utils.cache_stamp import CacheStamp
+
+NONE = 0
+PLANNED = 1
+PRESENT = 2
+
+
+class MonthPresence:
+    """
+    Office days of one month as a compact users x days matrix.
+
+    Each cell holds NONE (no remote day), PLANNED (remote day booked, not
+    confirmed by the badge import) or PRESENT. Whether a PLANNED day counts
+    as absent depends on today, so that is decided at render time.
+    """
+
+    def __init__(
+        self, year: int, month: int, rows: List[Tuple[str, date, bool]]
+    ):
+        self.year = year
+        self.month = month
+        self.days_in_month = calendar.monthrange(year, month)[1]
+        self.days = [
+            date(year, month, day) for day in range(1, self.days_in_month + 1)
+        ]
+        self.user_ids = sorted({user_id for user_id, _, _ in rows})
+        self.index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self.states = bytearray(len(self.user_ids) * self.days_in_month)
+        for user_id, day, present in rows:
+            cell = self.index[user_id] * self.days_in_month + day.day - 1
+            self.states[cell] = PRESENT if present else PLANNED
+        self.built_at = time.monotonic()
+        self.stamp = 0
+        self._all_days: Optional[List[Dict[str, Any]]] = None
+        self._all_days_names: Optional[Dict[str, str]] = None
+
+    def row(self, user_id: str) -> bytes:
+        i = self.index.get(user_id)
+        if i is None:
+            return bytes(self.days_in_month)
+        start = i * self.days_in_month
+        return bytes(self.states[start : start + self.days_in_month])
+
+    def column(self, day: int) -> List[Tuple[str, int]]:
+        """
+        (user id, state) pairs of everyone with a remote day on `day`.
+        """
+        return [
+            (user_id, state)
+            for user_id, state in zip(
+                self.user_ids, self.states[day - 1 :: self.days_in_month]
+            )
+            if state != NONE
+        ]
+
+    def all_days(self, names: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Day cells for the all-users calendar, computed once per build and
+        per `names`: the user directory hands out a new mapping when it
+        reloads.
+        """
+        if self._all_days is None or names is not self._all_days_names:
+            days_list = []
+            for day_date in self.days:
+                users = sorted(
+                    (
+                        {
+                            "name": names.get(user_id, "Unknown User"),
+                            "color_class": "text-green-500"
+                            if state == PRESENT
+                            else "text-red-500",
+                        }
+                        for user_id, state in self.column(day_date.day)
+                    ),
+                    key=lambda user: user["name"],
+                )
+                days_list.append(
+                    {
+                        "day_number": day_date.day,
+                        "day_name": day_date.strftime("%A"),
+                        "date_iso": day_date.isoformat(),
+                        "users": users,
+                        "is_weekend": day_date.weekday() >= 5,
+                    }
+                )
+            self._all_days = days_list
+            self._all_days_names = names
+        return self._all_days
+
+    def user_days(self, user_id: str, today: date) -> List[Dict[str, Any]]:
+        """
+        Day cells for a single user's calendar.
+        """
+        days_list = []
+        for day_date, state in zip(self.days, self.row(user_id)):
+            color_class = ""
+            if state != NONE:
+                if day_date >= today:
+                    color_class = "blue"
+                elif state == PRESENT:
+                    color_class = "green"
+                else:
+                    color_class = "red"
+            days_list.append(
+                {
+                    "day_number": day_date.day,
+                    "day_name": day_date.strftime("%A"),
+                    "date_iso": day_date.isoformat(),
+                    "is_selected": state != NONE,
+                    "has_event": state != NONE,
+                    "color_class": color_class,
+                }
+            )
+        return days_list
+
+    def attendance(
+        self, names: Dict[str, str], today: date
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-user attendance rate over the month's remote days up to today.
+        """
+        elapsed = sum(1 for day_date in self.days if day_date < today)
+        summary = []
+        for user_id in self.user_ids:
+            row = self.row(user_id)
+            booked = sum(1 for state in row if state != NONE)
+            past = row[:elapsed]
+            due = sum(1 for state in past if state != NONE)
+            present = past.count(PRESENT)
+            summary.append(
+                {
+                    "user_id": user_id,
+                    "name": names.get(user_id, "Unknown User"),
+                    "booked": booked,
+                    "due": due,
+                    "present": present,
+                    "absent": due - present,
+                    "rate": round(present * 100 / due) if due else None,
+                }
+            )
+        summary.sort(key=lambda item: item["name"])
+        return summary
+
+
+class PresenceCache:
+    """
+    Per-worker cache of MonthPresence keyed by (year, month).
+
+    Writers invalidate through a shared stamp, so every worker rebuilds
+    its months on the next request after a write; the TTL covers writes
+    made outside the app.
+    """
+
+    def __init__(self, ttl: float, max_months: int = 24):
+        self.ttl = ttl
+        self.max_months = max_months
+        self._stamp = CacheStamp("presence")
+        self._lock = threading.Lock()
+        self._months: "OrderedDict[Tuple[int, int], MonthPresence]" = (
+            OrderedDict()
+        )
+
+    def get(self, session: ISession, year: int, month: int) -> MonthPresence:
+        key = (year, month)
+        # Read before building, so a write that lands during the build
+        # leaves this copy stale rather than current.
+        stamp = self._stamp.read()
+        with self._lock:
+            cached = self._months.get(key)
+            if (
+                cached
+                and cached.stamp == stamp
+                and time.monotonic() - cached.built_at < self.ttl
+            ):
+                self._months.move_to_end(key)
+                return cached
+
+        presence = self._build(session, year, month)
+        presence.stamp = stamp
+        with self._lock:
+            self._months[key] = presence
+            self._months.move_to_end(key)
+            while len(self._months) > self.max_months:
+                self._months.popitem(last=False)
+        return presence
+
+    def invalidate(self) -> None:
+        """
+        Drop every cached month in every worker. Writes are rare next to
+        reads, so a single stamp for all months is enough.
+        """
+        with self._lock:
+            self._months.clear()
+        self._stamp.bump()
+
+    def _build(
+        self, session: ISession, year: int, month: int
+    ) -> MonthPresence:
+        first_day = date(year, month, 1)
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        rows = session.execute(
+            select(
+                OfficeCalendar.user_id,  # type: ignore
+                OfficeCalendar.day,  # type: ignore
+                OfficeCalendar.present,  # type: ignore
+            ).where(
+                OfficeCalendar.day >= first_day,  # type: ignore
+                OfficeCalendar.day <= last_day,  # type: ignore
+            )
+        ).all()
+        return MonthPresence(
+            year, month, [(row.user_id, row.day, row.present) for row in rows]
+        )
+
+
+presence_cache = PresenceCache(ttl=ENV.PRESENCE_CACHE_TTL)
@@ -0,0 +1,328 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Tuple, Union, Optional
+from functools import lru_cache
+from contextvars import ContextVar
+
+try:
+    from anyio._backends._asyncio import WorkerThread
+
+    # Frame of the anyio thread pool worker; its `context` local is the
+    # context the threadpool call runs in.
+    _WORKER_RUN: Optional[CodeType] = WorkerThread.run.__code__
+except (ImportError, AttributeError):
+    _WORKER_RUN = None
+
+Frame = Union[CodeType, str]
+Stack = Tuple[Frame, ...]
+
+THREAD_POOL = "<thread pool>"
+WAITING = "<waiting>"
+MAX_DEPTH = 256
+# Flame graph boxes narrower than this fraction of the request are dropped
+MIN_WIDTH = 0.002
+
+CATEGORIES = {
+    "sql": "SQL",
+    "orm": "ORM hydration",
+    "sqlalchemy": "SQLAlchemy, other",
+    "to_dict": "to_dict",
+    "pydantic": "Pydantic validation",
+    "jinja": "Jinja rendering",
+    "other": "Other Python",
+    "waiting": "Waiting (awaiting I/O)",
+}
+_DRIVERS = ("pymysql", "MySQLdb", "psycopg", "psycopg2", "asyncpg")
+_FETCHES = tuple(
+    f"FetchStrategy.{name}" for name in ("fetchall", "fetchone", "fetchmany")
+)
+
+# The profiler of the request the current task or thread works for
+active_profiler: ContextVar[Optional["SamplingProfiler"]] = ContextVar(
+    "active_profiler", default=None
+)
+
+
+@lru_cache(maxsize=4096)
+def code_category(code: Frame) -> Optional[str]:
+    """
+    The CATEGORIES key of time spent in `code` itself, None when it isn't
+    one of them.
+    """
+    if isinstance(code, str):
+        return "waiting" if code == WAITING else None
+    filename = code.co_filename.replace(os.sep, "/")
+    if any(f"/{driver}/" in filename for driver in _DRIVERS):
+        return "sql"
+    if "/sqlalchemy/" in filename:
+        if filename.endswith("/engine/default.py") and (
+            code.co_name.startswith("do_execute")
+        ):
+            return "sql"
+        if filename.endswith("/engine/cursor.py") and (
+            code.co_qualname.endswith(_FETCHES)
+        ):
+            return "sql"
+        if filename.endswith(("/orm/loading.py", "/orm/strategies.py")):
+            return "orm"
+        return "sqlalchemy"
+    if code.co_name == "to_dict":
+        return "to_dict"
+    if "/pydantic/" in filename or "/pydantic_core/" in filename:
+        return "pydantic"
+    # Compiled templates carry the template's file name
+    if "/jinja2/" in filename or filename.endswith(".html"):
+        return "jinja"
+    return None
+
+
+def stack_category(stack: Stack) -> str:
+    """
+    The category of the innermost frame that has one, so a lazy load in a
+    template is SQL and a template calling `to_dict` is `to_dict`. Other
+    SQLAlchemy frames only count when nothing more specific is on the
+    stack: attribute access in `to_dict` is `to_dict`.
+    """
+    generic = None
+    for code in reversed(stack):
+        category = code_category(code)
+        if category == "sqlalchemy":
+            generic = generic or category
+        elif category is not None:
+            return category
+    return generic or "other"
+
+
+def frame_name(code: Frame) -> str:
+    return code if isinstance(code, str) else code.co_qualname
+
+
+def frame_location(code: Frame) -> Tuple[str, int]:
+    if isinstance(code, str):
+        return "", 0
+    return code.co_filename, code.co_firstlineno
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler of one request.
+
+    A thread looks at every thread's stack each `interval` seconds and keeps
+    the ones working for the request: the event loop thread while it runs a
+    task of the request, and the thread pool workers running a call made
+    from it. Ticks where neither is running count as waiting. Sampling ends
+    with the request or after `max_duration` seconds.
+    """
+
+    def __init__(self, interval: float, max_duration: float):
+        self.interval = interval
+        self.max_duration = max_duration
+        self.samples: List[Tuple[Stack, float]] = []
+        self.duration = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._root: Optional[FrameType] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start sampling. Must be called from the request's task, with the
+        profiler set in `active_profiler`; the loop thread's stacks are cut
+        at the caller's frame.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._thread = threading.Thread(
+            target=self._sample, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._root = None
+
+    def _sample(self) -> None:
+        started = last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            if now - started > self.max_duration:
+                break
+            stacks = self._request_stacks()
+            # Split the tick between the request's threads running at once
+            weight = (now - last) / max(len(stacks), 1)
+            last = now
+            for stack in stacks or [(WAITING,)]:
+                self.samples.append((stack, weight))
+        self.duration = time.perf_counter() - started
+
+    def _request_stacks(self) -> List[Stack]:
+        stacks = []
+        frames = sys._current_frames()
+        loop_frame = frames.pop(self._loop_thread_id, None)
+        if loop_frame is not None and self._owns_loop():
+            stacks.append(self._stack(loop_frame))
+        frames.pop(threading.get_ident(), None)
+        for frame in frames.values():
+            stack = self._worker_stack(frame)
+            if stack is not None:
+                stacks.append(stack)
+        return stacks
+
+    def _owns_loop(self) -> bool:
+        loop = self._loop
+        if loop is None:
+            return False
+        task = asyncio.current_task(loop)
+        return task is not None and task.get_context().get(
+            active_profiler
+        ) is self
+
+    def _stack(self, frame: Optional[FrameType]) -> Stack:
+        codes: List[Frame] = []
+        while frame is not None and len(codes) < MAX_DEPTH:
+            codes.append(frame.f_code)
+            if frame is self._root:
+                break
+            frame = frame.f_back
+        return tuple(reversed(codes))
+
+    def _worker_stack(self, frame: Optional[FrameType]) -> Optional[Stack]:
+        if _WORKER_RUN is None:
+            return None
+        codes: List[Frame] = []
+        while frame is not None:
+            if frame.f_code is _WORKER_RUN:
+                context = frame.f_locals.get("context")
+                if context is None or context.get(active_profiler) is not self:
+                    return None
+                return (THREAD_POOL, *reversed(codes[-MAX_DEPTH:]))
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        return None
+
+    def total(self) -> float:
+        return sum(weight for _, weight in self.samples)
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """
+        Time per category, largest first.
+        """
+        seconds = dict.fromkeys(CATEGORIES, 0.0)
+        for stack, weight in self.samples:
+            seconds[stack_category(stack)] += weight
+        total = self.total() or 1.0
+        return sorted(
+            (
+                {
+                    "category": category,
+                    "label": CATEGORIES[category],
+                    "ms": round(value * 1000, 1),
+                    "percent": round(value / total * 100, 1),
+                }
+                for category, value in seconds.items()
+                if value
+            ),
+            key=lambda row: row["ms"],
+            reverse=True,
+        )
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """
+        The profile in speedscope's file format: every sample, then the
+        samples of each category as their own profile.
+        """
+        frames: List[Dict[str, Any]] = []
+        index: Dict[Frame, int] = {}
+
+        def frame_index(code: Frame) -> int:
+            if code not in index:
+                file, line = frame_location(code)
+                index[code] = len(frames)
+                frames.append(
+                    {"name": frame_name(code), "file": file, "line": line}
+                )
+            return index[code]
+
+        def profile(title: str, samples: List[Tuple[Stack, float]]):
+            weights = [round(weight * 1000, 3) for _, weight in samples]
+            return {
+                "type": "sampled",
+                "name": title,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": [
+                    [frame_index(code) for code in stack]
+                    for stack, _ in samples
+                ],
+                "weights": weights,
+            }
+
+        by_category: Dict[str, List[Tuple[Stack, float]]] = {}
+        for sample in self.samples:
+            by_category.setdefault(stack_category(sample[0]), []).append(
+                sample
+            )
+        profiles = [profile(name, self.samples)]
+        profiles.extend(
+            profile(f"{name}: {CATEGORIES[category]}", by_category[category])
+            for category in CATEGORIES
+            if category in by_category
+        )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "d5reports",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def flame_graph(self) -> List[Dict[str, Any]]:
+        """
+        The boxes of an icicle graph, the request at the top: their depth,
+        left offset and width as fractions of the request.
+        """
+        root: Dict[str, Any] = {"weight": 0.0, "children": {}}
+        for stack, weight in self.samples:
+            root["weight"] += weight
+            node = root
+            for code in stack:
+                node = node["children"].setdefault(
+                    code, {"weight": 0.0, "children": {}}
+                )
+                node["weight"] += weight
+
+        total = root["weight"] or 1.0
+        boxes: List[Dict[str, Any]] = []
+
+        def place(node: Dict[str, Any], depth: int, offset: float) -> None:
+            for code, child in node["children"].items():
+                width = child["weight"] / total
+                if width >= MIN_WIDTH:
+                    file, line = frame_location(code)
+                    boxes.append(
+                        {
+                            "name": frame_name(code),
+                            "file": file,
+                            "line": line,
+                            "category": code_category(code) or "other",
+                            "depth": depth,
+                            "left": offset,
+                            "width": width,
+                            "ms": round(child["weight"] * 1000, 1),
+                        }
+                    )
+                    place(child, depth + 1, offset)
+                offset += width
+
+        place(root, 0, 0.0)
+        return boxes
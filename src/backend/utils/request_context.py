@@ -0,0 +1,24 @@
+from typing import Any, Dict, Optional
+from contextvars import ContextVar
+
+# ASGI scope of the request being handled. Context variables follow the
+# request into run_in_threadpool, so sync endpoints and dependencies see it.
+request_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "request_scope", default=None
+)
+
+
+def route_name(scope: Dict[str, Any]) -> str:
+    """
+    "METHOD /path/{template}" once routing has matched, the raw path before.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def current_route() -> str:
+    scope = request_scope.get()
+    if scope is None:
+        return "<no request>"
+    return route_name(scope)
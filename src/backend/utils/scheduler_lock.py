@@ -0,0 +1,43 @@
+from typing import IO, Optional
+
+from loguru import logger
+
+from config.env import ENV
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single dev server, always the leader
+    fcntl = None  # type: ignore
+
+_lock_file: Optional[IO] = None
+
+
+def acquire_scheduler_lock() -> bool:
+    """
+    True in one process per host. The first worker to ask takes an
+    exclusive lock on SCHEDULER_LOCK_FILE and keeps it until it exits, so
+    the scheduled jobs run once rather than once per gunicorn worker; the
+    OS releases it when that worker dies and its replacement takes over.
+    """
+    global _lock_file
+    if _lock_file is not None:
+        return True
+    if fcntl is None:
+        return True
+
+    lock_file = open(ENV.SCHEDULER_LOCK_FILE, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        logger.info("Scheduled jobs run in another worker.")
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def release_scheduler_lock() -> None:
+    global _lock_file
+    if _lock_file is not None:
+        _lock_file.close()
+        _lock_file = None
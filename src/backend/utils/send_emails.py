@@ -1,7 +1,9 @@
+import time
 import smtplib
 from email.mime.text import MIMEText
 
 from config.env import ENV
+from backend.utils.metrics import email_send_duration
 
 
 def send_email_to_user(to: str, title: str, message: str):
@@ -10,6 +12,12 @@ def send_email_to_user(to: str, title: str, message: str):
     msg["From"] = ENV.EMAIL
     msg["To"] = to
 
-    with smtplib.SMTP_SSL(ENV.EMAIL_HOST, 465) as server:
-        server.login(ENV.EMAIL, ENV.EMAIL_PASSWORD)
-        server.send_message(msg)
+    outcome = "error"
+    started = time.perf_counter()
+    try:
+        with smtplib.SMTP_SSL(ENV.EMAIL_HOST, 465) as server:
+            server.login(ENV.EMAIL, ENV.EMAIL_PASSWORD)
+            server.send_message(msg)
+        outcome = "sent"
+    finally:
+        email_send_duration.observe(time.perf_counter() - started, outcome)
@@ -0,0 +1,256 @@
+import re
+import time
+import random
+import hashlib
+import threading
+from typing import Any, Dict, List, Tuple, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.env import ENV
+from database.adapters import DIALECTS
+from backend.utils.request_context import current_route
+
+_NORMALIZE = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # string literals
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # number literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+"), "?"),  # placeholders
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),  # IN lists, rows
+    (re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+"), "(?+), ..."),
+    (re.compile(r"\s+"), " "),
+]
+# Normalized statements kept; SQLAlchemy reuses the same few hundred
+_CACHE_SIZE = 2048
+_SHAPE_LENGTH = 300
+
+
+def normalize(statement: str) -> str:
+    """
+    The statement with literals and bound parameters replaced by `?` and
+    IN lists collapsed, so executions of one query share a fingerprint.
+    """
+    for pattern, replacement in _NORMALIZE:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Names and types of the bound parameters, without their values.
+    """
+    if executemany:
+        if not parameters:
+            return "[]"
+        first = parameter_shape(parameters[0])
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        shape = ", ".join(
+            f"{name}: {type(value).__name__}"
+            for name, value in parameters.items()
+        )
+        return f"{{{shape}}}"[:_SHAPE_LENGTH]
+    if isinstance(parameters, (list, tuple)):
+        shape = ", ".join(type(value).__name__ for value in parameters)
+        return f"({shape})"[:_SHAPE_LENGTH]
+    return type(parameters).__name__
+
+
+class QueryStats:
+    def __init__(self, fingerprint: str, sql: str):
+        self.fingerprint = fingerprint
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.logged_at: Optional[float] = None
+        self.last_slow: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total / self.calls * 1000, 2)
+            if self.calls
+            else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "rows": self.rows,
+            "slow": self.slow,
+            "last_slow": self.last_slow,
+        }
+
+
+class SlowQueryLog:
+    """
+    Per-worker statistics of every statement by normalized SQL fingerprint.
+
+    Statements slower than `threshold` are logged with the route, the shape
+    of their parameters, the row count and, for SELECTs, the EXPLAIN plan.
+    Each fingerprint is logged at most once per `log_interval` seconds, and
+    only for a `sample_rate` fraction of its slow executions, since the
+    EXPLAIN adds a round trip to a request that is already slow.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        sample_rate: float,
+        log_interval: float,
+        explain: bool,
+        max_fingerprints: int = 1000,
+    ):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.log_interval = log_interval
+        self.explain = explain
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._stats: Dict[str, QueryStats] = {}
+        self._normalized: Dict[str, Tuple[str, str]] = {}
+
+    def instrument(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def top(self, order_by: str = "total", limit: int = 50) -> List[Any]:
+        with self._lock:
+            stats = [s.to_dict() for s in self._stats.values()]
+        key = {
+            "total": "total_ms",
+            "mean": "mean_ms",
+            "max": "max_ms",
+            "calls": "calls",
+            "slow": "slow",
+        }.get(order_by, "total_ms")
+        return sorted(stats, key=lambda s: s[key], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _fingerprint(self, statement: str) -> Tuple[str, str]:
+        cached = self._normalized.get(statement)
+        if cached is None:
+            sql = normalize(statement)
+            digest = hashlib.sha1(sql.encode()).hexdigest()[:12]
+            if len(self._normalized) >= _CACHE_SIZE:
+                self._normalized.clear()
+            cached = self._normalized[statement] = (digest, sql)
+        return cached
+
+    def _before_execute(self, conn, cursor, statement, params, context, many):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, params, context, many):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        fingerprint, sql = self._fingerprint(statement)
+        rows = max(cursor.rowcount, 0)
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    cheapest = min(self._stats.values(), key=lambda s: s.total)
+                    del self._stats[cheapest.fingerprint]
+                stats = self._stats[fingerprint] = QueryStats(fingerprint, sql)
+            stats.calls += 1
+            stats.total += elapsed
+            stats.rows += rows
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if elapsed < self.threshold:
+                return
+            stats.slow += 1
+            now = time.monotonic()
+            if (
+                stats.logged_at is not None
+                and now - stats.logged_at < self.log_interval
+            ) or random.random() >= self.sample_rate:
+                return
+            stats.logged_at = now
+
+        self._log_slow(conn, statement, params, many, elapsed, rows, stats)
+
+    def _log_slow(
+        self,
+        conn,
+        statement: str,
+        params: Any,
+        many: bool,
+        elapsed: float,
+        rows: int,
+        stats: QueryStats,
+    ) -> None:
+        plan = None
+        if self.explain and not many and _is_select(statement):
+            plan = self._explain(conn, statement, params)
+        slow = {
+            "timestamp": int(time.time()),
+            "duration_ms": round(elapsed * 1000, 2),
+            "route": current_route(),
+            "parameters": parameter_shape(params, many),
+            "rows": rows,
+            "plan": plan,
+        }
+        with self._lock:
+            stats.last_slow = slow
+        logger.opt(lazy=True).warning(
+            "Slow query {} ({:.0f} ms, {} rows) in {}\n{}\n"
+            "Parameters: {}\nPlan: {}",
+            lambda: stats.fingerprint,
+            lambda: elapsed * 1000,
+            lambda: rows,
+            lambda: slow["route"],
+            lambda: stats.sql,
+            lambda: slow["parameters"],
+            lambda: plan,
+        )
+
+    def _explain(self, conn, statement: str, params: Any) -> List[Any]:
+        """
+        The plan of `statement`, through the raw DBAPI connection so the
+        EXPLAIN isn't itself timed.
+        """
+        adapter = DIALECTS.get(conn.dialect.name)
+        if adapter is None:
+            return []
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(adapter.explain_prefix + statement, params)
+            columns = [column[0] for column in cursor.description or ()]
+            return [
+                {c: _plain(v) for c, v in zip(columns, row)}
+                for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            return [{"error": str(e)}]
+        finally:
+            cursor.close()
+
+
+def _is_select(statement: str) -> bool:
+    keyword = statement.lstrip()[:6].upper()
+    return keyword == "SELECT" or keyword.startswith("WITH")
+
+
+def _plain(value: Any) -> Any:
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+slow_query_log = SlowQueryLog(
+    threshold=ENV.SLOW_QUERY_MS / 1000,
+    sample_rate=ENV.SLOW_QUERY_SAMPLE_RATE,
+    log_interval=ENV.SLOW_QUERY_LOG_INTERVAL,
+    explain=ENV.SLOW_QUERY_EXPLAIN,
+)
@@ -1,8 +1,19 @@
 from datetime import datetime
 
+from jinja2 import Template
 from fastapi.templating import Jinja2Templates
 
+from backend.utils.metrics import template_render_duration
+
+
+class TimedTemplate(Template):
+    def render(self, *args, **kwargs) -> str:
+        with template_render_duration.time(self.name or "<string>"):
+            return super().render(*args, **kwargs)
+
+
 templates = Jinja2Templates(directory="src/backend/templates")
+templates.env.template_class = TimedTemplate
 
 
 def date_to_string(timestamp):
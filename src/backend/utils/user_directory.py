@@ -0,0 +1,116 @@
+import time
+import threading
+from typing import Dict, List, Optional, NamedTuple
+
+from sqlalchemy import select
+
+from config.env import ENV
+from database.models import user_mapper  # noqa F401
+from core.models.user import User
+from database.interfaces.session import ISession
+from backend.utils.cache_stamp import CacheStamp
+
+
+class DirectoryEntry(NamedTuple):
+    id: str
+    full_name: str
+    normalized_name: str
+    email: str
+    permissions: int
+
+
+def normalize_name(full_name: str) -> str:
+    return " ".join(full_name.split()).casefold()
+
+
+class UserDirectory:
+    """
+    Per-process cache of the lightweight user fields most pages need.
+
+    Loaded with a single column-only query, so none of the user
+    relationships are touched. The user views bump the shared stamp on
+    writes, which reloads the directory in every worker and in the import
+    process; the TTL covers writes made outside the app.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._stamp = CacheStamp("user-directory")
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._loaded_stamp = 0
+        self._entries: List[DirectoryEntry] = []
+        self._by_id: Dict[str, DirectoryEntry] = {}
+        self._by_name: Dict[str, DirectoryEntry] = {}
+        self._names: Dict[str, str] = {}
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+        self._stamp.bump()
+
+    def _is_fresh(self, stamp: int) -> bool:
+        return (
+            stamp == self._loaded_stamp
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    def _ensure_loaded(self, session: ISession) -> None:
+        # Read before loading: a bump during the query leaves this load
+        # stale, and the next call reloads.
+        stamp = self._stamp.read()
+        if self._is_fresh(stamp):
+            return
+        with self._lock:
+            if self._is_fresh(stamp):
+                return
+            rows = session.execute(
+                select(
+                    User.id,  # type: ignore
+                    User.full_name,  # type: ignore
+                    User.email,  # type: ignore
+                    User.permissions,  # type: ignore
+                ).order_by(User.full_name)  # type: ignore
+            ).all()
+            entries = [
+                DirectoryEntry(
+                    id=row.id,
+                    full_name=row.full_name or "",
+                    normalized_name=normalize_name(row.full_name or ""),
+                    email=row.email or "",
+                    permissions=row.permissions or 0,
+                )
+                for row in rows
+            ]
+            self._entries = entries
+            self._by_id = {entry.id: entry for entry in entries}
+            self._by_name = {entry.normalized_name: entry for entry in entries}
+            self._names = {entry.id: entry.full_name for entry in entries}
+            self._loaded_at = time.monotonic()
+            self._loaded_stamp = stamp
+
+    def all(self, session: ISession) -> List[DirectoryEntry]:
+        """
+        All users, ordered by full name.
+        """
+        self._ensure_loaded(session)
+        return self._entries
+
+    def get(self, session: ISession, user_id: str) -> Optional[DirectoryEntry]:
+        self._ensure_loaded(session)
+        return self._by_id.get(user_id)
+
+    def get_by_name(
+        self, session: ISession, full_name: str
+    ) -> Optional[DirectoryEntry]:
+        self._ensure_loaded(session)
+        return self._by_name.get(normalize_name(full_name))
+
+    def names(self, session: ISession) -> Dict[str, str]:
+        """
+        Mapping of user id to full name.
+        """
+        self._ensure_loaded(session)
+        return self._names
+
+
+user_directory = UserDirectory(ttl=ENV.USER_DIRECTORY_TTL)
@@ -0,0 +1,102 @@
+import os
+import time
+from typing import Set, Dict, List, Tuple
+from datetime import date
+
+from loguru import logger
+
+from database.models import calendar_mapper  # noqa F401
+from database.adapters import get_adapter
+from backend.utils.user_directory import user_directory
+from backend.utils.xlsx_parser import IFileParser
+from backend.utils.import_jobs import get_job, save_job
+from core.models.office_calendar import OfficeCalendar
+from database.sessions.sqlalchemy_session import SQLAlchemySession
+
+MAX_REPORTED_NAMES = 50
+
+
+def run_attendance_import(
+    job_id: str,
+    file_path: str,
+    parser: IFileParser,
+    chunk_days: int = 31,
+) -> None:
+    """
+    Parse an uploaded attendance file and mark the matching office days as
+    present. Runs in the import worker process; progress is saved to the
+    job after every chunk of days so the upload page can poll it.
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise ValueError(f"Import job {job_id} not found")
+
+    job.status = "running"
+    job.started_at = int(time.time())
+    save_job(job)
+
+    try:
+        data = parser.parse_file(file_path)
+
+        days = sorted(data)
+        job.days_total = len(days)
+        save_job(job)
+
+        if not days:
+            job.errors.append("No attendance rows found in the file.")
+            job.status = "done"
+            return
+
+        names = set().union(*data.values())
+        with SQLAlchemySession(get_adapter().session()) as s:
+            user_ids: Dict[str, str] = {}
+            for full_name in names:
+                entry = user_directory.get_by_name(s, full_name)
+                if entry is not None:
+                    user_ids[full_name] = entry.id
+            existing: Dict[Tuple[str, date], OfficeCalendar] = {
+                (rd.user_id, rd.day): rd  # type: ignore
+                for rd in s.query(
+                    OfficeCalendar,
+                    in_={OfficeCalendar.user_id: list(user_ids.values())},
+                    day__gte=days[0],
+                    day__lte=days[-1],
+                )
+            }
+
+            unmatched: Set[str] = names - user_ids.keys()
+            job.unmatched_names = sorted(unmatched)[:MAX_REPORTED_NAMES]
+
+            for start in range(0, len(days), chunk_days):
+                chunk: List[date] = days[start : start + chunk_days]
+                for day in chunk:
+                    for full_name in data[day]:
+                        user_id = user_ids.get(full_name)
+                        if user_id is None:
+                            continue
+                        job.matched += 1
+                        record = existing.get((user_id, day))
+                        if record is None:
+                            record = OfficeCalendar(
+                                user_id=user_id, day=day, present=True
+                            )
+                            s.add(record)
+                            existing[(user_id, day)] = record
+                            job.created += 1
+                        elif not record.present:
+                            record.present = True
+                            job.updated += 1
+                s.commit()
+                job.days_processed += len(chunk)
+                save_job(job)
+    except Exception as e:
+        logger.exception(e)
+        job.errors.append(str(e))
+        job.status = "failed"
+    else:
+        job.status = "done"
+    finally:
+        job.finished_at = int(time.time())
+        save_job(job)
+        if os.path.exists(file_path):
+            os.remove(file_path)
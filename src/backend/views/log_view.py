@@ -1,23 +1,34 @@
 from typing import Dict, List, Tuple
-from datetime import UTC, datetime, timedelta
+from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
 
 from ulid import ULID
 from loguru import logger
-
-from backend.dependencies.db_session import get_session
-from backend.models import LogCreateModel, LogResponseModel
+from sqlalchemy import insert
+from sqlalchemy.orm.attributes import set_committed_value
+
+from config.env import ENV
+from backend.models import (
+    LogCreateModel,
+    LogResponseModel,
+    LogBatchEntryModel,
+)
 from core.models.log import Log
 from database.models import log_mapper  # noqa F401
 from core.models.task import Task
 from core.models.user import User
 from core.models.project import Project
-from core.enums.task_status import TaskStatus
 from backend.utils.templates import templates
 from backend.utils.pagination import calculate_pagination
 from backend.models.pagination import Pagination
 from backend.utils.send_emails import send_email_to_user
+from backend.utils.options_cache import options_cache
+from backend.views.task_view import add_task_hours, add_tasks_hours
 from database.interfaces.session import ISession
 from database.repositories.repository import Repository
+from core.enums.task_status import TaskStatus
+from database.adapters import get_adapter
+from database.sessions.sqlalchemy_session import SQLAlchemySession
 
 
 def create_log(log: LogCreateModel, session: ISession) -> LogResponseModel:
@@ -54,17 +65,15 @@ def create_log(log: LogCreateModel, session: ISession) -> LogResponseModel:
             hours_spent_today=log.hours_spent_today,
             task_status=log.task_status,
         )
-        if (
-            task._status == TaskStatus.DONE
-            and new_log._task_status != TaskStatus.DONE
-        ):
-            task.returned = True
-        task.hours_worked += log.hours_spent_today
-        task.status = log.task_status
-        task_repo.update(task)
-
         repo.create(new_log)
+        hours_worked = add_task_hours(
+            s, task.id, log.hours_spent_today, status=log.task_status
+        )
         s.commit()
+        # The UPDATE bypassed the ORM; show the new total in the email.
+        set_committed_value(task, "hours_worked", hours_worked)
+        options_cache.invalidate("task")
+        options_cache.invalidate("project", new_log.user_id)
         html_content = templates.get_template("email/log.html").render(
             {"timestamp": timestamp, "task": task, "log": log}
         )
@@ -80,6 +89,115 @@ def create_log(log: LogCreateModel, session: ISession) -> LogResponseModel:
     return LogResponseModel.model_validate(log_data)
 
 
+def create_logs(
+    entries: List[LogBatchEntryModel],
+    user: User,
+    admin: bool,
+    session: ISession,
+) -> List[LogResponseModel]:
+    """
+    Create a batch of logs, e.g. a week's timesheet, in one transaction.
+
+    Every entry is validated before anything is written. The logs go in
+    with one multi-row INSERT and the task totals with one grouped UPDATE;
+    when a task appears more than once its last entry sets the status.
+    Developers can only log on their own tasks, and no further back than
+    LOG_BACKDATE_DAYS. Entries for a past day are stamped with that day
+    at the current time of day.
+    """
+    statuses = {status.value for status in TaskStatus}
+    now = datetime.now()
+    today = now.date()
+    earliest = date.min if admin else today - timedelta(ENV.LOG_BACKDATE_DAYS)
+    with session as s:
+        tasks = {
+            task.id: task
+            for task in Repository(s, Task).query(
+                in_={Task.id: list({entry.task_id for entry in entries})}
+            )
+        }
+
+        errors = []
+        for number, entry in enumerate(entries, start=1):
+            task = tasks.get(entry.task_id)
+            if task is None:
+                errors.append(f"Entry {number}: task not found")
+            elif not admin and task.user_id != user.id:
+                errors.append(f"Entry {number}: {task.title} is not your task")
+            if entry.task_status not in statuses:
+                errors.append(
+                    f"Entry {number}: unknown status {entry.task_status}"
+                )
+            if entry.day > today:
+                errors.append(f"Entry {number}: {entry.day} is in the future")
+            elif entry.day < earliest:
+                errors.append(
+                    f"Entry {number}: {entry.day} is more than "
+                    f"{ENV.LOG_BACKDATE_DAYS} days ago"
+                )
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        rows = []
+        deltas: Dict[str, float] = defaultdict(float)
+        task_statuses: Dict[str, str] = {}
+        for entry in entries:
+            task = tasks[entry.task_id]
+            rows.append(
+                {
+                    "id": str(ULID()),
+                    "timestamp": int(
+                        datetime.combine(entry.day, now.time()).timestamp()
+                    ),
+                    "task_id": task.id,
+                    "task_name": task.title,
+                    "description": entry.description,
+                    "user_id": task.user_id,
+                    "user_name": user.full_name,
+                    "project_id": task.project_id,
+                    "project_name": task.project_name,
+                    "hours_spent_today": entry.hours_spent_today,
+                    "task_status": entry.task_status,
+                }
+            )
+            deltas[task.id] += entry.hours_spent_today
+            task_statuses[task.id] = entry.task_status
+
+        s.execute(insert(Log).values(rows))
+        add_tasks_hours(s, deltas, task_statuses)
+        s.commit()
+
+    options_cache.invalidate("task")
+    for user_id in {row["user_id"] for row in rows}:
+        options_cache.invalidate("project", user_id)
+    return [LogResponseModel.model_validate(row) for row in rows]
+
+
+def send_timesheet_email(to: str, logs: List[LogResponseModel]) -> None:
+    """
+    One summary email for a batch of logs.
+    """
+    timestamp = int(datetime.now().timestamp())
+    html_content = templates.get_template("email/timesheet.html").render(
+        {
+            "timestamp": timestamp,
+            "logs": logs,
+            "total_hours": sum(log.hours_spent_today for log in logs),
+        }
+    )
+    try:
+        send_email_to_user(
+            to=to,
+            title=(
+                f"[Division 5] Timesheet - "
+                f"{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')}"
+            ),
+            message=html_content,
+        )
+    except Exception as e:
+        logger.exception(f"Error sending timesheet email to {to}: {e}")
+
+
 def get_log(session: ISession, **kwargs) -> LogResponseModel:
     """
     Retrieve a single log from the database based on provided criteria.
@@ -106,17 +224,31 @@ def update_log(
         if not log:
             raise ValueError("Log not found")
 
+        old_task_id = log.task_id
+        old_hours = log.hours_spent_today or 0
+
         for attr, value in log_update.model_dump().items():
             setattr(log, attr, value)
 
-        task_repo = Repository(s, Task)
-        task = task_repo.get(id=log.task_id)
-        if task:
-            task.hours_worked += log_update.hours_spent_today
-            task.status = log_update.task_status
-            task_repo.update(task)
+        # Apply the difference, not the new hours, to the task's total.
+        if log.task_id != old_task_id:
+            add_task_hours(s, old_task_id, -old_hours)
+            add_task_hours(
+                s,
+                log.task_id,
+                log_update.hours_spent_today,
+                status=log_update.task_status,
+            )
+        else:
+            add_task_hours(
+                s,
+                log.task_id,
+                log_update.hours_spent_today - old_hours,
+                status=log_update.task_status,
+            )
 
         s.commit()
+        options_cache.invalidate("task")
         log_dict = log.to_dict()
     return LogResponseModel.model_validate(log_dict)
 
@@ -197,7 +329,7 @@ async def get_projects_with_recent_logs() -> Dict[Project, List[Log]]:
     Returns:
         Dict[Project, List[Log]]: A dictionary mapping each Project to its related Logs.
     """
-    session = await get_session()
+    session = SQLAlchemySession(get_adapter().session())
     now = datetime.now(UTC)
     past_24h = now - timedelta(hours=24)
     past_24h_timestamp = int(past_24h.timestamp())
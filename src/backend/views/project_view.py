@@ -1,13 +1,15 @@
-from typing import List, Tuple
+from typing import Any, Set, Dict, List, Tuple
 
 from ulid import ULID
 from loguru import logger
+from sqlalchemy import desc, func, select
 
 from backend.models import ProjectCreateModel, ProjectResponseModel
 from database.models import (
     project_mapper,  # noqa F401
     project_developers_table,  # noqa F401
 )
+from core.models.log import Log
 from core.models.task import Task
 from core.models.user import User
 from core.models.project import Project
@@ -17,6 +19,14 @@ from core.models.project_user import ProjectUser
 from backend.models.pagination import Pagination
 from database.interfaces.session import ISession
 from database.repositories.repository import Repository
+from database.models.task_mapper import log_summary
+from backend.utils.options_cache import options_cache
+from database.sessions.full_text import prefix_conditions
+from backend.views.summary_view import (
+    get_project_stats,
+    get_user_summaries,
+    get_project_summaries,
+)
 
 
 def create_project(
@@ -36,6 +46,8 @@ def create_project(
     with session as s:
         repository = Repository(s, Project)
         created_project = repository.create(new_project)
+        s.commit()
+        options_cache.invalidate("project")
         project_data = created_project.to_dict()
     return ProjectResponseModel.model_validate(project_data)
 
@@ -46,10 +58,7 @@ def get_project(session: ISession, **kwargs) -> ProjectResponseModel:
     """
     with session as s:
         repository = Repository(s, Project)
-        project = repository.query(
-            **kwargs,
-            options=[Project.developers, Project.tasks],  # type: ignore
-        )
+        project = repository.query(**kwargs)
 
         if not project:
             raise ValueError("Project not found")
@@ -59,6 +68,28 @@ def get_project(session: ISession, **kwargs) -> ProjectResponseModel:
     return ProjectResponseModel.model_validate(project_dict)
 
 
+def get_project_overview(
+    session: ISession, project_id: str
+) -> Tuple[ProjectResponseModel, Dict[str, Any]]:
+    """
+    A project and its aggregate stats for the detail page. Developers and
+    tasks are not loaded; the page pulls them in as paginated panels.
+    """
+    with session as s:
+        projects = Repository(s, Project).query(id=project_id)
+
+        if not projects:
+            raise ValueError("Project not found")
+
+        project_dict = projects[0].to_dict()
+        stats = get_project_stats(s, project_id)
+
+    project = ProjectResponseModel.model_validate(project_dict)
+    project.developer_count = stats["developer_count"]
+    project.task_count = stats["task_count"]
+    return project, stats
+
+
 def update_project(
     project_id: str, project_update: ProjectCreateModel, session: ISession
 ) -> ProjectResponseModel:
@@ -78,6 +109,8 @@ def update_project(
             setattr(existing_project, key, value)
 
         repository.update(existing_project)
+        s.commit()
+        options_cache.invalidate("project")
         project_dict = existing_project.to_dict()
     return ProjectResponseModel.model_validate(project_dict)
 
@@ -105,6 +138,8 @@ def upsert_project(
                 archived=project.archived,
             )
             repository.create(project_obj)
+        s.commit()
+        options_cache.invalidate("project")
 
         project_dict = project_obj.to_dict()
 
@@ -153,14 +188,17 @@ def get_all_projects(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
-            options=[Project.developers, Project.tasks],  # type: ignore
             **kwargs,
         )
 
         if not projects:
             return [], pagination
 
-        project_dicts = [project.to_dict() for project in projects]
+        summaries = get_project_summaries(s, [p.id for p in projects])
+        project_dicts = [
+            {**project.to_dict(), **summaries[project.id]}
+            for project in projects
+        ]
 
     output = [
         ProjectResponseModel.model_validate(proj_dict)
@@ -170,6 +208,15 @@ def get_all_projects(
     return output, pagination
 
 
+def assigned_project_ids(user_id: str) -> Any:
+    """
+    Subquery of the ids of the projects a user is assigned to.
+    """
+    return select(ProjectUser.project_id).where(  # type: ignore
+        ProjectUser.user_id == user_id  # type: ignore
+    )
+
+
 def get_users_projects(
     user_id: str, session: ISession, pagination: Pagination, **kwargs
 ) -> Tuple[List[ProjectResponseModel], Pagination]:
@@ -197,44 +244,40 @@ def get_users_projects(
     """
     try:
         with session as s:
-            assoc_repo = Repository(s, ProjectUser)
+            project_repo = Repository(s, Project)
+            assigned = {Project.id: assigned_project_ids(user_id)}
+
+            total = project_repo.count(in_=assigned, **kwargs)
+
+            order_by = pagination.order_by
 
             pagination = calculate_pagination(
-                total=1,
+                total=total,
                 page=pagination.current_page or 1,
                 per_page=pagination.limit or 15,
             )
 
-            associations = assoc_repo.query(
-                user_id=user_id,
-                order_by=pagination.order_by,
-                limit=pagination.limit,
-                offset=pagination.offset,
-            )
-
-            project_ids = [assoc.project_id for assoc in associations]
+            pagination.order_by = order_by
 
-            if not project_ids:
-                pagination = calculate_pagination(total=0, page=1, per_page=15)
+            if total == 0:
                 return [], pagination
 
-            project_repo = Repository(s, Project)
-
             projects = project_repo.query(
-                in_={Project.id: project_ids},  # type: ignore
-                options=[Project.developers, Project.tasks],  # type: ignore
-                order_by=pagination.order_by,
+                in_=assigned,  # type: ignore
+                order_by=[*(order_by or []), Project.id],
+                limit=pagination.limit,
+                offset=pagination.offset,
                 **kwargs,
             )
 
-            pagination = calculate_pagination(
-                total=len(projects), page=1, per_page=15
-            )
-
             if not projects:
                 return [], pagination
 
-            project_dicts = [project.to_dict() for project in projects]
+            summaries = get_project_summaries(s, [p.id for p in projects])
+            project_dicts = [
+                {**project.to_dict(), **summaries[project.id]}
+                for project in projects
+            ]
 
         output = [
             ProjectResponseModel.model_validate(proj_dict)
@@ -263,9 +306,13 @@ def assign_project_to_user(
         if not user:
             raise ValueError(f"User with id {user_id} does not exist.")
 
-        project_user.create(
-            ProjectUser(id=str(ULID()), project_id=project_id, user_id=user_id)
+        # Assigning twice (a double submit) keeps the existing row.
+        project_user.upsert(
+            [{"id": str(ULID()), "project_id": project_id, "user_id": user_id}],
+            index_elements=["user_id", "project_id"],
         )
+        s.commit()
+        options_cache.invalidate("project", user_id)
 
         project_dict = project.to_dict()
 
@@ -296,6 +343,8 @@ def remove_user_from_project(
 
         project_user = project_users[0]
         project_user_repo.delete(project_user)
+        s.commit()
+        options_cache.invalidate("project", user_id)
 
         project_dict = project.to_dict()
 
@@ -326,8 +375,13 @@ def get_user_by_project(
         IndexError: If no users are associated with the specified project.
     """
     with session as s:
-        assoc_repo = Repository(s, ProjectUser)
-        total = assoc_repo.count(project_id=project_id, **kwargs)
+        user_repo = Repository(s, User)
+        assigned = {
+            User.id: select(ProjectUser.user_id).where(  # type: ignore
+                ProjectUser.project_id == project_id  # type: ignore
+            )
+        }
+        total = user_repo.count(in_=assigned, **kwargs)
 
         if total == 0:
             return [], calculate_pagination(
@@ -344,30 +398,28 @@ def get_user_by_project(
 
         pagination.order_by = order_by
 
-        result = assoc_repo.query(
-            project_id=project_id,
-            order_by=pagination.order_by,
+        users = user_repo.query(
+            in_=assigned,  # type: ignore
+            order_by=[*(order_by or []), User.id],
             limit=pagination.limit,
             offset=pagination.offset,
             **kwargs,
         )
 
-        user_ids = [row.user_id for row in result]
-        user_repo = Repository(s, User)
-
-        users = user_repo.query(
-            in_={User.id: user_ids},  # type: ignore
-            options=[User.tasks, User.projects],  # type: ignore
-        )
-
         if not users:
             return [], pagination
 
-        user_dicts = [user.to_dict() for user in users]
-
-    output = [
-        UserResponseModel.model_validate(user_dict) for user_dict in user_dicts
-    ]
+        summaries = get_user_summaries(s, [user.id for user in users])
+        output = [
+            UserResponseModel(
+                id=user.id,
+                email=user.email,
+                full_name=user.full_name,
+                permissions=user.permissions,
+                **summaries[user.id],
+            )
+            for user in users
+        ]
 
     return output, pagination
 
@@ -419,6 +471,7 @@ def get_project_tasks(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
+            options=log_summary(),
             **kwargs,
         )
 
@@ -432,3 +485,56 @@ def get_project_tasks(
     ]
 
     return output, pagination
+
+
+def get_project_developer_ids(session: ISession, project_id: str) -> Set[str]:
+    """
+    Retrieve the ids of the developers assigned to a project.
+    """
+    with session as s:
+        assoc_repo = Repository(s, ProjectUser)
+        return {
+            association.user_id
+            for association in assoc_repo.query(project_id=project_id)
+        }
+
+
+def get_project_options(
+    session: ISession,
+    user_id: str,
+    admin: bool,
+    q: str,
+    limit: int,
+) -> List[Any]:
+    """
+    Typeahead rows (id, name) for the project select: name matches for `q`,
+    the projects `user_id` logged on most recently first, then by name.
+    Developers only get the projects they are assigned to.
+    """
+    recent = (
+        select(
+            Log.project_id,  # type: ignore
+            func.max(Log.timestamp).label("last_logged"),  # type: ignore
+        )
+        .where(Log.user_id == user_id)  # type: ignore
+        .group_by(Log.project_id)  # type: ignore
+        .subquery()
+    )
+    stmt = (
+        select(Project.id, Project.name)  # type: ignore
+        .outerjoin(recent, recent.c.project_id == Project.id)
+        .where(*prefix_conditions(Project.name, q))
+        .order_by(desc(recent.c.last_logged), Project.name)  # type: ignore
+        .limit(limit)
+    )
+    if not admin:
+        stmt = stmt.where(
+            Project.id.in_(  # type: ignore
+                select(ProjectUser.project_id).where(  # type: ignore
+                    ProjectUser.user_id == user_id  # type: ignore
+                )
+            )
+        )
+
+    with session as s:
+        return [tuple(row) for row in s.execute(stmt).all()]
@@ -0,0 +1,160 @@
+import asyncio
+from typing import Any, List, Optional
+from itertools import chain
+
+from sqlalchemy import and_, desc, or_, select
+from fastapi.concurrency import run_in_threadpool
+
+from database.models import (
+    log_mapper,  # noqa F401
+    task_mapper,  # noqa F401
+    project_mapper,  # noqa F401
+    project_developers_table,  # noqa F401
+)
+from core.models.log import Log
+from core.models.task import Task
+from core.models.project import Project
+from core.models.project_user import ProjectUser
+from database.adapters import get_adapter
+from backend.models.search_result import SearchResult
+from database.sessions.full_text import (
+    relevance,
+    search_terms,
+    indexed_terms,
+    search_conditions,
+)
+from database.sessions.sqlalchemy_session import SQLAlchemySession
+
+SEARCH_LIMITS = {"project": 5, "task": 10, "log": 10}
+SNIPPET_LENGTH = 160
+
+
+def _matches(columns: List[Any], q: str) -> Any:
+    return or_(*[and_(*search_conditions(column, q)) for column in columns])
+
+
+def _score(columns: List[Any], q: str) -> Any:
+    terms = indexed_terms(q)
+    score = relevance(columns[0], terms)
+    for column in columns[1:]:
+        score = score + relevance(column, terms)
+    return score.label("score")
+
+
+def _snippet(text: Optional[str]) -> Optional[str]:
+    if not text or len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rstrip() + "…"
+
+
+def _execute(stmt: Any) -> List[Any]:
+    # One session per query: the three searches run on separate threads.
+    with SQLAlchemySession(get_adapter().session()) as s:
+        return s.execute(stmt).all()
+
+
+def search_projects(
+    q: str, user_id: Optional[str], limit: int
+) -> List[SearchResult]:
+    score = _score([Project.name], q)
+    stmt = select(Project.id, Project.name, score).where(  # type: ignore
+        _matches([Project.name], q)
+    )
+    if user_id is not None:
+        stmt = stmt.where(
+            Project.id.in_(  # type: ignore
+                select(ProjectUser.project_id).where(  # type: ignore
+                    ProjectUser.user_id == user_id  # type: ignore
+                )
+            )
+        )
+    stmt = stmt.order_by(desc(score), Project.name).limit(limit)  # type: ignore
+    return [
+        SearchResult(
+            type="project", id=row.id, title=row.name, score=row.score or 0.0
+        )
+        for row in _execute(stmt)
+    ]
+
+
+def search_tasks(
+    q: str, user_id: Optional[str], limit: int
+) -> List[SearchResult]:
+    columns = [Task.title, Task.description]
+    score = _score(columns, q)
+    stmt = select(
+        Task.id,  # type: ignore
+        Task.title,  # type: ignore
+        Task.description,  # type: ignore
+        Task.project_name,  # type: ignore
+        Task.user_name,  # type: ignore
+        Task.timestamp,  # type: ignore
+        score,
+    ).where(_matches(columns, q))
+    if user_id is not None:
+        stmt = stmt.where(Task.user_id == user_id)  # type: ignore
+    stmt = stmt.order_by(desc(score), desc(Task.timestamp)).limit(limit)  # type: ignore
+    return [
+        SearchResult(
+            type="task",
+            id=row.id,
+            title=row.title,
+            subtitle=f"{row.project_name} · {row.user_name}",
+            snippet=_snippet(row.description),
+            timestamp=row.timestamp,
+            score=row.score or 0.0,
+        )
+        for row in _execute(stmt)
+    ]
+
+
+def search_logs(
+    q: str, user_id: Optional[str], limit: int
+) -> List[SearchResult]:
+    columns = [Log.description, Log.task_name]
+    score = _score(columns, q)
+    stmt = select(
+        Log.id,  # type: ignore
+        Log.task_name,  # type: ignore
+        Log.description,  # type: ignore
+        Log.project_name,  # type: ignore
+        Log.user_name,  # type: ignore
+        Log.timestamp,  # type: ignore
+        score,
+    ).where(_matches(columns, q))
+    if user_id is not None:
+        stmt = stmt.where(Log.user_id == user_id)  # type: ignore
+    stmt = stmt.order_by(desc(score), desc(Log.timestamp)).limit(limit)  # type: ignore
+    return [
+        SearchResult(
+            type="log",
+            id=row.id,
+            title=row.task_name,
+            subtitle=f"{row.project_name} · {row.user_name}",
+            snippet=_snippet(row.description),
+            timestamp=row.timestamp,
+            score=row.score or 0.0,
+        )
+        for row in _execute(stmt)
+    ]
+
+
+async def search(q: str, user_id: Optional[str]) -> List[SearchResult]:
+    """
+    Search projects, tasks and logs concurrently and merge the hits, best
+    match first, then most recent. `user_id` restricts the results to the
+    rows that user can see in the list views; None means everything.
+    """
+    if not search_terms(q):
+        return []
+
+    results = await asyncio.gather(
+        run_in_threadpool(search_projects, q, user_id, SEARCH_LIMITS["project"]),
+        run_in_threadpool(search_tasks, q, user_id, SEARCH_LIMITS["task"]),
+        run_in_threadpool(search_logs, q, user_id, SEARCH_LIMITS["log"]),
+    )
+    return sorted(
+        chain.from_iterable(results),
+        key=lambda result: (result.score, result.timestamp or 0),
+        reverse=True,
+    )
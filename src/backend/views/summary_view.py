@@ -0,0 +1,158 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+
+from database.models import (
+    task_mapper,  # noqa F401
+    user_mapper,  # noqa F401
+    project_mapper,  # noqa F401
+    project_developers_table,  # noqa F401
+)
+from core.models.task import Task
+from core.models.user import User
+from core.models.project import Project
+from core.models.project_user import ProjectUser
+from database.interfaces.session import ISession
+
+# Names shown next to the counts in the project and user lists
+PREVIEW_NAMES = 3
+
+
+def get_project_summaries(
+    session: ISession, project_ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Developer count, task count and the first few developer names of each
+    project, from two grouped queries over project_developers and task.
+    """
+    summaries: Dict[str, Dict[str, Any]] = {
+        project_id: {"developer_count": 0, "developer_names": [], "task_count": 0}
+        for project_id in project_ids
+    }
+    if not project_ids:
+        return summaries
+
+    ranked = (
+        select(
+            ProjectUser.project_id,  # type: ignore
+            User.full_name,  # type: ignore
+            func.row_number()
+            .over(
+                partition_by=ProjectUser.project_id,  # type: ignore
+                order_by=User.full_name,  # type: ignore
+            )
+            .label("position"),
+            func.count()
+            .over(partition_by=ProjectUser.project_id)  # type: ignore
+            .label("total"),
+        )
+        .join(User, User.id == ProjectUser.user_id)  # type: ignore
+        .where(ProjectUser.project_id.in_(project_ids))  # type: ignore
+        .subquery()
+    )
+    for row in session.execute(
+        select(ranked.c.project_id, ranked.c.full_name, ranked.c.total)
+        .where(ranked.c.position <= PREVIEW_NAMES)
+        .order_by(ranked.c.project_id, ranked.c.position)
+    ):
+        summary = summaries[row.project_id]
+        summary["developer_count"] = row.total
+        if row.full_name:
+            summary["developer_names"].append(row.full_name)
+
+    for row in session.execute(
+        select(Task.project_id, func.count(Task.id).label("total"))  # type: ignore
+        .where(Task.project_id.in_(project_ids))  # type: ignore
+        .group_by(Task.project_id)  # type: ignore
+    ):
+        summaries[row.project_id]["task_count"] = row.total
+
+    return summaries
+
+
+def get_user_summaries(
+    session: ISession, user_ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Project count, task count and the first few project names of each
+    user, from two grouped queries over project_developers and task.
+    """
+    summaries: Dict[str, Dict[str, Any]] = {
+        user_id: {"project_count": 0, "project_names": [], "task_count": 0}
+        for user_id in user_ids
+    }
+    if not user_ids:
+        return summaries
+
+    ranked = (
+        select(
+            ProjectUser.user_id,  # type: ignore
+            Project.name,  # type: ignore
+            func.row_number()
+            .over(
+                partition_by=ProjectUser.user_id,  # type: ignore
+                order_by=Project.name,  # type: ignore
+            )
+            .label("position"),
+            func.count()
+            .over(partition_by=ProjectUser.user_id)  # type: ignore
+            .label("total"),
+        )
+        .join(Project, Project.id == ProjectUser.project_id)  # type: ignore
+        .where(ProjectUser.user_id.in_(user_ids))  # type: ignore
+        .subquery()
+    )
+    for row in session.execute(
+        select(ranked.c.user_id, ranked.c.name, ranked.c.total)
+        .where(ranked.c.position <= PREVIEW_NAMES)
+        .order_by(ranked.c.user_id, ranked.c.position)
+    ):
+        summary = summaries[row.user_id]
+        summary["project_count"] = row.total
+        summary["project_names"].append(row.name)
+
+    for row in session.execute(
+        select(Task.user_id, func.count(Task.id).label("total"))  # type: ignore
+        .where(Task.user_id.in_(user_ids))  # type: ignore
+        .group_by(Task.user_id)  # type: ignore
+    ):
+        summaries[row.user_id]["task_count"] = row.total
+
+    return summaries
+
+
+def get_project_stats(session: ISession, project_id: str) -> Dict[str, Any]:
+    """
+    Header figures for the project detail page: developer count, hours
+    required and worked, and task counts by status, from two aggregate
+    queries instead of loading the project's developers and tasks.
+    """
+    stats: Dict[str, Any] = {
+        "developer_count": session.execute(
+            select(func.count(ProjectUser.id)).where(  # type: ignore
+                ProjectUser.project_id == project_id  # type: ignore
+            )
+        ).scalar_one(),
+        "task_count": 0,
+        "hours_required": 0,
+        "hours_worked": 0,
+        "status_counts": {},
+    }
+
+    for row in session.execute(
+        select(
+            Task.status,  # type: ignore
+            func.count(Task.id).label("total"),  # type: ignore
+            func.coalesce(func.sum(Task.hours_required), 0).label("required"),  # type: ignore
+            func.coalesce(func.sum(Task.hours_worked), 0).label("worked"),  # type: ignore
+        )
+        .where(Task.project_id == project_id)  # type: ignore
+        .group_by(Task.status)  # type: ignore
+        .order_by(Task.status)  # type: ignore
+    ):
+        stats["task_count"] += row.total
+        stats["hours_required"] += row.required
+        stats["hours_worked"] += row.worked
+        stats["status_counts"][row.status or "No status"] = row.total
+
+    return stats
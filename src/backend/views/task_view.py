@@ -1,9 +1,12 @@
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple, Optional
 import datetime
 
+from loguru import logger
+from sqlalchemy import and_, case, desc, func, true, select, update
+
 from backend.models import TaskCreateModel, TaskResponseModel
 from core.models.log import Log
-from database.models import task_mapper  # noqa F401
+from database.models.task_mapper import log_summary
 from core.models.task import Task
 from core.models.project import Project
 from backend.models.models import LogResponseModel
@@ -11,6 +14,14 @@ from backend.utils.pagination import calculate_pagination
 from backend.models.pagination import Pagination
 from database.interfaces.session import ISession
 from database.repositories.repository import Repository
+from backend.utils.options_cache import options_cache
+from database.sessions.full_text import prefix_conditions
+from core.enums.task_status import TaskStatus
+from database.adapters import get_adapter
+from database.sessions.sqlalchemy_session import SQLAlchemySession
+
+# Drift below this many hours is float rounding, not a lost update
+HOURS_TOLERANCE = 0.001
 
 
 def create_task(task: TaskCreateModel, session: ISession) -> TaskResponseModel:
@@ -42,6 +53,7 @@ def create_task(task: TaskCreateModel, session: ISession) -> TaskResponseModel:
 
         repo.create(new_task)
         s.commit()
+        options_cache.invalidate("task")
         task_data = new_task.to_dict()
         task_data["project_name"] = project.name
     return TaskResponseModel.model_validate(task_data)
@@ -51,17 +63,22 @@ def get_task(session: ISession, **kwargs) -> TaskResponseModel:
     """
     Retrieve a single task from the database based on provided criteria.
     """
+    # The project's current name, which renames don't copy to its tasks,
+    # comes with the task rather than from a second lookup.
+    stmt = (
+        select(Task, Project.name)  # type: ignore
+        .where(*(getattr(Task, k) == v for k, v in kwargs.items()))
+        .outerjoin(Project, Project.id == Task.project_id)  # type: ignore
+        .options(*log_summary())
+        .limit(1)
+    )
     with session as s:
-        repo = Repository[Task](s, Task)
-        project_repo = Repository(s, Project)
-
-        task = repo.query(**kwargs, options=[Task.logs])  # type: ignore
-        if not task:
+        row = s.execute(stmt).first()
+        if row is None:
             raise ValueError("Task not found")
-        task_obj = task[0]
-        project = project_repo.get(id=task_obj.project_id)
+        task_obj, project_name = row
         task_dict = task_obj.to_dict()
-        task_dict["project_name"] = project.name if project else ""
+        task_dict["project_name"] = project_name or ""
     return TaskResponseModel.model_validate(task_dict)
 
 
@@ -81,6 +98,7 @@ def update_task(
             setattr(task, attr, value)
 
         s.commit()
+        options_cache.invalidate("task")
         task_dict = task.to_dict()
     return TaskResponseModel.model_validate(task_dict)
 
@@ -100,6 +118,7 @@ def upsert_task(
             for attr, value in task.model_dump().items():
                 setattr(existing_task, attr, value)
             s.commit()
+            options_cache.invalidate("task")
             task_dict = existing_task.to_dict()
         else:
             new_task = Task(
@@ -116,6 +135,7 @@ def upsert_task(
             )
             repo.create(new_task)
             s.commit()
+            options_cache.invalidate("task")
             task_dict = new_task.to_dict()
     return TaskResponseModel.model_validate(task_dict)
 
@@ -143,7 +163,7 @@ def get_all_tasks(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
-            options=[Task.logs],  # type: ignore
+            options=log_summary(),
             **kwargs,
         )
 
@@ -179,7 +199,7 @@ def get_project_tasks(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
-            options=[Task.logs],  # type: ignore
+            options=log_summary(),
             **kwargs,
         )
 
@@ -215,7 +235,7 @@ def get_user_tasks(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
-            options=[Task.logs],  # type: ignore
+            options=log_summary(),
             **kwargs,
         )
 
@@ -259,3 +279,186 @@ def get_task_logs(
         ]
 
     return logs_list, pagination
+
+
+def get_task_options(
+    session: ISession,
+    user_id: str,
+    admin: bool,
+    q: str,
+    selected: Optional[str],
+    limit: int,
+) -> List[Any]:
+    """
+    Typeahead rows (id, title, status) for the task select: title matches
+    for `q`, the tasks `user_id` logged on most recently first, then the
+    newest. Developers only get their own tasks; `selected` is always
+    included so a preselected task stays in the list.
+    """
+    recent = (
+        select(
+            Log.task_id,  # type: ignore
+            func.max(Log.timestamp).label("last_logged"),  # type: ignore
+        )
+        .where(Log.user_id == user_id)  # type: ignore
+        .group_by(Log.task_id)  # type: ignore
+        .subquery()
+    )
+    stmt = (
+        select(Task.id, Task.title, Task.status)  # type: ignore
+        .outerjoin(recent, recent.c.task_id == Task.id)
+        .where(*prefix_conditions(Task.title, q))
+        .order_by(
+            desc(recent.c.last_logged),
+            desc(Task.timestamp),  # type: ignore
+        )
+        .limit(limit)
+    )
+    if not admin:
+        stmt = stmt.where(Task.user_id == user_id)  # type: ignore
+
+    with session as s:
+        rows = [tuple(row) for row in s.execute(stmt).all()]
+        if selected and all(row[0] != selected for row in rows):
+            selected_stmt = select(
+                Task.id, Task.title, Task.status  # type: ignore
+            ).where(
+                Task.id == selected  # type: ignore
+            )
+            if not admin:
+                selected_stmt = selected_stmt.where(
+                    Task.user_id == user_id  # type: ignore
+                )
+            selected_rows = s.execute(selected_stmt).all()
+            rows = [tuple(row) for row in selected_rows] + rows
+    return rows
+
+
+def add_tasks_hours(
+    session: ISession,
+    deltas: Dict[str, float],
+    statuses: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Add hours to many tasks in one
+    `UPDATE task SET hours_worked = hours_worked + CASE id ... END`, so
+    concurrent log writes can't lose each other's hours. `statuses` sets
+    the tasks' status in the same statement; a Done task moved back to
+    another status is flagged as returned.
+    """
+    task_ids = set(deltas) | set(statuses or {})
+    if not task_ids:
+        return
+
+    values: List[Tuple[Any, Any]] = []
+    if statuses:
+        reopened = [
+            task_id
+            for task_id, status in statuses.items()
+            if status != TaskStatus.DONE.value
+        ]
+        if reopened:
+            # MySQL assigns left to right: read the old status before
+            # overwriting it.
+            values.append(
+                (
+                    Task.returned,
+                    case(
+                        (
+                            and_(
+                                Task.id.in_(reopened),  # type: ignore
+                                Task.status  # type: ignore
+                                == TaskStatus.DONE.value,
+                            ),
+                            true(),
+                        ),
+                        else_=Task.returned,
+                    ),
+                )
+            )
+        values.append(
+            (Task.status, case(statuses, value=Task.id, else_=Task.status))
+        )
+    if deltas:
+        values.append(
+            (
+                Task.hours_worked,
+                Task.hours_worked + case(deltas, value=Task.id, else_=0),
+            )
+        )
+
+    session.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))  # type: ignore
+        .ordered_values(*values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_task_hours(
+    session: ISession,
+    task_id: str,
+    delta: float,
+    status: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Add `delta` hours to one task, see add_tasks_hours. Returns the new
+    total, or None when the task doesn't exist.
+    """
+    add_tasks_hours(
+        session,
+        {task_id: delta},
+        {task_id: status} if status is not None else None,
+    )
+    return session.execute(
+        select(Task.hours_worked).where(Task.id == task_id)  # type: ignore
+    ).scalar()
+
+
+def reconcile_task_hours(chunk_size: int = 500) -> int:
+    """
+    Recompute `hours_worked` from the task's logs wherever the two have
+    drifted apart. Walks the task table by id in chunks, committing after
+    each, and returns the number of tasks corrected.
+    """
+    logged = (
+        select(
+            func.coalesce(func.sum(Log.hours_spent_today), 0)  # type: ignore
+        )
+        .where(Log.task_id == Task.id)  # type: ignore
+        .scalar_subquery()
+    )
+    corrected = 0
+    last_id = ""
+    with SQLAlchemySession(get_adapter().session()) as s:
+        while True:
+            ids = s.execute(
+                select(Task.id)  # type: ignore
+                .where(Task.id > last_id)  # type: ignore
+                .order_by(Task.id)  # type: ignore
+                .limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            drifted = s.execute(
+                select(Task.id).where(  # type: ignore
+                    Task.id.in_(ids),  # type: ignore
+                    func.abs(Task.hours_worked - logged) > HOURS_TOLERANCE,
+                )
+            ).scalars().all()
+            if drifted:
+                s.execute(
+                    update(Task)
+                    .where(Task.id.in_(drifted))  # type: ignore
+                    .values(hours_worked=logged)
+                    .execution_options(synchronize_session=False)
+                )
+                s.commit()
+                corrected += len(drifted)
+                logger.warning(
+                    f"Reconciled hours_worked of {len(drifted)} tasks: "
+                    f"{drifted[:10]}"
+                )
+    return corrected
@@ -1,7 +1,5 @@
 from typing import List, Tuple, Optional
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
 
 from backend.models import (
     UserCreateModel,
@@ -14,14 +12,24 @@ from core.models.task import Task
 from core.models.user import User
 from core.models.project import Project
 from backend.models.models import LogResponseModel, TaskResponseModel
+from backend.utils.passwords import hash_password, verify_password
 from backend.utils.pagination import calculate_pagination
-from core.models.project_user import ProjectUser
+from backend.utils.user_directory import user_directory
 from backend.models.pagination import Pagination
 from database.interfaces.session import ISession
 from database.repositories.repository import Repository
+from database.models.task_mapper import log_summary
+from database.models.user_mapper import user_collections
+from backend.views.summary_view import (
+    get_user_summaries,
+    get_project_summaries,
+)
+from backend.views.project_view import assigned_project_ids
 
 
-def create_user(user: UserCreateModel, session: ISession) -> UserResponseModel:
+async def create_user(
+    user: UserCreateModel, session: ISession
+) -> UserResponseModel:
     """
     Create a new user in the database.
 
@@ -36,8 +44,7 @@ def create_user(user: UserCreateModel, session: ISession) -> UserResponseModel:
     Returns:
         UserResponseModel: A validated response model representing the newly created user.
     """
-    ph = PasswordHasher()
-    hashed_password = ph.hash(user.password)
+    hashed_password = await hash_password(user.password)
     new_user = User(
         email=user.email,
         full_name=user.full_name,
@@ -49,25 +56,37 @@ def create_user(user: UserCreateModel, session: ISession) -> UserResponseModel:
     with session as s:
         repository = Repository(s, User)
         created_user = repository.create(new_user)
+        s.commit()
         user_data = created_user.to_dict()
+    user_directory.invalidate()
     return UserResponseModel.model_validate(user_data)
 
 
-def authenticate_user(
+async def authenticate_user(
     email: str, password: str, session: ISession
 ) -> Optional[User]:
+    """
+    Verify a user's credentials, transparently upgrading the stored hash when
+    it was made with outdated argon2 parameters.
+    """
     with session as s:
-        repository = Repository(s, User)
-        users = repository.query(email=email)
-        if not users:
-            return None
-        user = users[0]
-        ph = PasswordHasher()
-        try:
-            ph.verify(user.password, password)
-            return user
-        except VerifyMismatchError:
-            return None
+        users = Repository(s, User).query(email=email)
+        # Hand the connection back before the argon2 verification, which
+        # can take a while under load; the user stays loaded, detached.
+        s.close()
+    if not users:
+        return None
+    user = users[0]
+
+    verified, new_hash = await verify_password(user.password, password)
+    if not verified:
+        return None
+    if new_hash:
+        user.password = new_hash
+        with session as s:
+            Repository(s, User).update(user)
+            s.commit()
+    return user
 
 
 def get_user(session: ISession, **kwargs) -> UserResponseModel:
@@ -90,13 +109,13 @@ def get_user(session: ISession, **kwargs) -> UserResponseModel:
     """
     with session as s:
         repository = Repository(s, User)
-        user = repository.query(**kwargs)[0]
+        user = repository.query(options=user_collections(), **kwargs)[0]
         user_dict = user.to_dict()
 
     return UserResponseModel.model_validate(user_dict)
 
 
-def update_user(
+async def update_user(
     user_id: str, user_update: UserCreateModel, session: ISession
 ) -> UserResponseModel:
     """
@@ -117,28 +136,32 @@ def update_user(
     Raises:
         ValueError: If a user with the specified `user_id` does not exist.
     """
+    user_data = user_update.model_dump(exclude_unset=True)
+
+    if "password" in user_data:
+        user_data["password"] = await hash_password(user_data["password"])
+
     with session as s:
         repository = Repository(s, User)
-        existing_user = repository.get(user_id)
+        users = repository.query(id=user_id, options=user_collections())
 
-        if not existing_user:
+        if not users:
             raise ValueError(f"User with id {user_id} does not exist.")
-
-        user_data = user_update.model_dump(exclude_unset=True)
-
-        if "password" in user_data:
-            ph = PasswordHasher()
-            user_data["password"] = ph.hash(user_data["password"])
+        existing_user = users[0]
 
         for key, value in user_data.items():
             setattr(existing_user, key, value)
 
         repository.update(existing_user)
+        s.commit()
 
+    user_directory.invalidate()
     return UserResponseModel.model_validate(existing_user.to_dict())
 
 
-def upsert_user(user: UserCreateModel, session: ISession) -> UserResponseModel:
+async def upsert_user(
+    user: UserCreateModel, session: ISession
+) -> UserResponseModel:
     """
     Insert a new user or update an existing user based on unique constraints.
 
@@ -154,24 +177,34 @@ def upsert_user(user: UserCreateModel, session: ISession) -> UserResponseModel:
     Returns:
         UserResponseModel: A validated response model with the upserted user data.
     """
+    user_data = user.model_dump(exclude_unset=True)
+    if "password" in user_data:
+        user_data["password"] = await hash_password(user_data["password"])
+
     with session as s:
         repository = Repository(s, User)
-        existing_user = repository.query(email=user.email)
+        existing_user = repository.query(
+            email=user.email, options=user_collections()
+        )
 
         if existing_user:
             user_obj = existing_user[0]
-            for key, value in user.model_dump(exclude_unset=True).items():
+            for key, value in user_data.items():
                 setattr(user_obj, key, value)
             repository.update(user_obj)
         else:
             user_obj = User(
                 email=user.email,
                 full_name=user.full_name,
-                password=user.password,
+                password=user_data["password"],
                 permissions=user.permissions,
+                projects=[],
+                tasks=[],
             )
             repository.create(user_obj)
+        s.commit()
 
+    user_directory.invalidate()
     return UserResponseModel.model_validate(user_obj.to_dict())
 
 
@@ -195,42 +228,49 @@ def get_all_users(
         if total == 0:
             return [], pagination
 
-        query = repository.query(
+        users = repository.query(
             order_by=pagination.order_by,
             limit=pagination.limit,
             offset=pagination.offset,
-            options=[User.tasks, User.projects],  # type: ignore
             **kwargs,
         )
 
+        summaries = get_user_summaries(s, [user.id for user in users])
         user_models = [
-            UserResponseModel.model_validate(user.to_dict()) for user in query
+            UserResponseModel(
+                id=user.id,
+                email=user.email,
+                full_name=user.full_name,
+                permissions=user.permissions,
+                **summaries[user.id],
+            )
+            for user in users
         ]
         return user_models, pagination
 
 
 def get_user_tasks(
-    session: ISession, user_id: str, pagination: Pagination
+    session: ISession, user_id: str, pagination: Pagination, **kwargs
 ) -> Tuple[List[TaskResponseModel], Pagination]:
     """
-    Retrieve all tasks associated with a user.
+    Retrieve one page of the tasks associated with a user.
 
-    This function rebuilds the necessary models, queries the database for all tasks associated with a
-    user, and populates user fields within the task's associated project. It then validates and
-    returns the task data as a list of `TaskResponseModel`.
+    The count and the page are two queries with the filter, ordering,
+    LIMIT and OFFSET applied by the database, so the cost of a page does
+    not grow with the number of tasks the user has.
 
     Args:
         session (ISession): The database session used for querying the tasks.
         user_id (str): The unique identifier of the user to filter tasks.
+        pagination (Pagination): Pagination parameters.
+        **kwargs: Additional filtering keyword arguments.
 
     Returns:
-        List[TaskResponseModel]: A list of validated response models representing the tasks.
+        Tuple[List[TaskResponseModel], Pagination]: Tuple of task list and pagination info.
     """
     with session as s:
         repository = Repository(s, Task)
-        tasks = repository.query(user_id=user_id)
-
-        total = len(tasks)
+        total = repository.count(user_id=user_id, **kwargs)
 
         order_by = pagination.order_by
 
@@ -242,9 +282,18 @@ def get_user_tasks(
 
         pagination.order_by = order_by
 
-        if not tasks or total == 0:
+        if total == 0:
             return [], pagination
 
+        tasks = repository.query(
+            user_id=user_id,
+            order_by=[*(order_by or []), Task.id],
+            limit=pagination.limit,
+            offset=pagination.offset,
+            options=log_summary(),
+            **kwargs,
+        )
+
         task_dicts = [task.to_dict() for task in tasks]
 
     output = [
@@ -260,28 +309,23 @@ def get_project_by_user(
     """
     Retrieve paginated projects associated with a user.
 
+    The user's assignments are a subquery of the project query, so the
+    filters, ordering and page are applied to projects in the database.
+
     Args:
         session (ISession): The database session used for querying the projects.
         user_id (str): The unique identifier of the user to filter projects.
         pagination (Pagination): Pagination parameters.
+        **kwargs: Additional filtering keyword arguments.
 
     Returns:
         Tuple[List[ProjectResponseModel], Pagination]: Tuple of project list and pagination info.
-
-    Raises:
-        IndexError: If no projects are associated with the specified user.
     """
     with session as s:
         repository = Repository(s, Project)
-        project_user_repository = Repository(s, ProjectUser)
+        assigned = {Project.id: assigned_project_ids(user_id)}
 
-        total = project_user_repository.count(user_id=user_id, **kwargs)
-        project_ids = [
-            association.project_id
-            for association in project_user_repository.query(
-                user_id=user_id, **kwargs
-            )
-        ]
+        total = repository.count(in_=assigned, **kwargs)
 
         order_by = pagination.order_by
 
@@ -297,17 +341,21 @@ def get_project_by_user(
             return [], pagination
 
         projects = repository.query(
-            order_by=pagination.order_by,
+            order_by=[*(order_by or []), Project.id],
             limit=pagination.limit,
             offset=pagination.offset,
-            in_={Project.id: project_ids},  # type: ignore
+            in_=assigned,  # type: ignore
             **kwargs,
         )
 
         if not projects:
             return [], pagination
 
-        project_dicts = [project.to_dict() for project in projects]
+        summaries = get_project_summaries(s, [p.id for p in projects])
+        project_dicts = [
+            {**project.to_dict(), **summaries[project.id]}
+            for project in projects
+        ]
 
     output = [
         ProjectResponseModel.model_validate(project)
@@ -316,6 +364,7 @@ def get_project_by_user(
 
     return output, pagination
 
+
 def get_user_logs(
     session: ISession, user_id: str, pagination: Pagination, **kwargs
 ) -> Tuple[List[LogResponseModel], Pagination]:
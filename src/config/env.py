@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from pydantic.v1 import Field, BaseSettings
 
 
@@ -9,11 +12,108 @@ class EnvironmentConfig(BaseSettings):
     EMAIL_HOST: str = Field(default=..., env="EMAIL_HOST")
     EMAIL_PASSWORD: str = Field(default=..., env="EMAIL_PASSWORD")
 
-    DB_USER: str = Field(default=..., env="DB_USER")
-    DB_PASSWORD: str = Field(default=..., env="DB_PASSWORD")
-    DB_HOST: str = Field(default=..., env="DB_HOST")
-    DB_PORT: int = Field(default=..., env="DB_PORT")
+    # mysql, sqlite or postgresql. For sqlite DB_NAME is the database file,
+    # or :memory:, and the connection settings are unused.
+    DB_ADAPTER: str = Field(default="mysql", env="DB_ADAPTER")
+    # DBAPI driver, e.g. pymysql or mysqldb (the mysqlclient C driver);
+    # empty means the adapter's default.
+    DB_DRIVER: str = Field(default="", env="DB_DRIVER")
+    DB_USER: str = Field(default="", env="DB_USER")
+    DB_PASSWORD: str = Field(default="", env="DB_PASSWORD")
+    DB_HOST: str = Field(default="", env="DB_HOST")
+    DB_PORT: int = Field(default=0, env="DB_PORT")
     DB_NAME: str = Field(default=..., env="DB_NAME")
+    # Per worker. Requests hold one connection each (see get_session).
+    DB_POOL_SIZE: int = Field(default=10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    # Seconds; keep below the server's wait_timeout (8h on MySQL)
+    DB_POOL_RECYCLE: int = Field(default=3600, env="DB_POOL_RECYCLE")
+    # Test connections with a round trip on every checkout. Without it a
+    # connection dropped by the server fails one request, then the pool is
+    # refreshed.
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    DB_POOL_WAIT_WARNING_MS: int = Field(
+        default=100, env="DB_POOL_WAIT_WARNING_MS"
+    )
+
+    ARGON2_TIME_COST: int = Field(default=3, env="ARGON2_TIME_COST")
+    ARGON2_MEMORY_COST: int = Field(default=65536, env="ARGON2_MEMORY_COST")
+    ARGON2_PARALLELISM: int = Field(default=4, env="ARGON2_PARALLELISM")
+    PASSWORD_HASH_WORKERS: int = Field(default=2, env="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(
+        default=32, env="PASSWORD_HASH_QUEUE_SIZE"
+    )
+
+    LOOP_MONITOR_INTERVAL_MS: int = Field(
+        default=500, env="LOOP_MONITOR_INTERVAL_MS"
+    )
+    LOOP_BLOCKING_THRESHOLD_MS: int = Field(
+        default=200, env="LOOP_BLOCKING_THRESHOLD_MS"
+    )
+
+    IMPORT_DIR: str = Field(default="uploads/imports", env="IMPORT_DIR")
+    # Attendance imports running at once on the host, across all workers
+    IMPORT_WORKERS: int = Field(default=1, env="IMPORT_WORKERS")
+
+    USER_DIRECTORY_TTL: int = Field(default=60, env="USER_DIRECTORY_TTL")
+    PRESENCE_CACHE_TTL: int = Field(default=60, env="PRESENCE_CACHE_TTL")
+    OPTIONS_CACHE_TTL: int = Field(default=30, env="OPTIONS_CACHE_TTL")
+    # Holds the version stamps that invalidate those caches in every
+    # process on the host; the TTLs only cover writes made outside the app
+    CACHE_STAMP_DIR: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "d5reports-cache"),
+        env="CACHE_STAMP_DIR",
+    )
+
+    HOURS_RECONCILE_INTERVAL: int = Field(
+        default=3600, env="HOURS_RECONCILE_INTERVAL"
+    )
+    # How many days back developers may date a batch log entry; admins
+    # may use any past day
+    LOG_BACKDATE_DAYS: int = Field(default=7, env="LOG_BACKDATE_DAYS")
+
+    # Send the daily project log emails to clients at 23:57
+    CLIENT_EMAILS_ENABLED: bool = Field(
+        default=False, env="CLIENT_EMAILS_ENABLED"
+    )
+
+    # Held by the one worker per host that runs the scheduled jobs
+    SCHEDULER_LOCK_FILE: str = Field(
+        default=os.path.join(
+            tempfile.gettempdir(), "d5reports-scheduler.lock"
+        ),
+        env="SCHEDULER_LOCK_FILE",
+    )
+
+    # Each worker's metrics file, summed by GET /metrics
+    METRICS_DIR: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "d5reports-metrics"),
+        env="METRICS_DIR",
+    )
+    METRICS_FLUSH_INTERVAL: int = Field(
+        default=5, env="METRICS_FLUSH_INTERVAL"
+    )
+    # Bearer token for scrapers; without it GET /metrics is admin only
+    METRICS_TOKEN: str = Field(default="", env="METRICS_TOKEN")
+
+    # Statements slower than this are logged with their EXPLAIN plan, at
+    # most once per SLOW_QUERY_LOG_INTERVAL seconds per normalized statement
+    # and for a SLOW_QUERY_SAMPLE_RATE fraction of the slow ones.
+    SLOW_QUERY_MS: int = Field(default=200, env="SLOW_QUERY_MS")
+    SLOW_QUERY_SAMPLE_RATE: float = Field(
+        default=1.0, env="SLOW_QUERY_SAMPLE_RATE"
+    )
+    SLOW_QUERY_LOG_INTERVAL: int = Field(
+        default=300, env="SLOW_QUERY_LOG_INTERVAL"
+    )
+    SLOW_QUERY_EXPLAIN: bool = Field(default=True, env="SLOW_QUERY_EXPLAIN")
+
+    # Sampling of admin requests asking for a profile with ?__profile=1
+    PROFILER_INTERVAL_MS: float = Field(
+        default=1.0, env="PROFILER_INTERVAL_MS"
+    )
+    PROFILER_MAX_SECONDS: int = Field(default=60, env="PROFILER_MAX_SECONDS")
 
     LOGURU_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
     
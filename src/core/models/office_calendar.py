@@ -14,7 +14,7 @@ class OfficeCalendar:
         self.id = str(ULID())
         self.user_id = user_id
         self.day = day
-        self.present = False
+        self.present = present
 
     @property
     def _id(self):
@@ -24,6 +24,8 @@ class Task:
         timestamp: int
         hours_worked: float
         last_updated: Optional[int]
+        log_count: int
+        last_log_description: Optional[str]
         logs: Optional[List["Log"]]
 
     def __init__(
@@ -39,6 +41,8 @@ class Task:
         hours_worked: float = 0.0,
         returned: bool = False,
         last_updated: Optional[int] = None,
+        log_count: int = 0,
+        last_log_description: Optional[str] = None,
         status: Optional[str] = None,
         id: Optional[str] = None,
         logs: Optional[List["Log"]] = None,
@@ -57,6 +61,8 @@ class Task:
         self.timestamp = timestamp
         self.hours_worked = hours_worked
         self.last_updated = last_updated
+        self.log_count = log_count
+        self.last_log_description = last_log_description
 
     @property
     def _id(self) -> ULID:
@@ -100,6 +106,8 @@ class Task:
                 "status": self.status,
                 "timestamp": self.timestamp,
                 "hours_worked": self.hours_worked,
+                "log_count": self.log_count,
+                "last_log_description": self.last_log_description,
                 "logs": [],
             }
 
@@ -119,6 +127,8 @@ class Task:
             "timestamp": self.timestamp,
             "last_updated": self.last_updated,
             "hours_worked": self.hours_worked,
+            "log_count": self.log_count,
+            "last_log_description": self.last_log_description,
             "logs": [log.to_dict(visited) for log in self.logs]
             if self.logs
             else [],
@@ -0,0 +1,41 @@
+from typing import Dict, Type
+from functools import lru_cache
+
+from config.env import ENV
+from database.adapters.base import DIALECTS, SQLAlchemyAdapter
+from database.adapters.mysql import MySQL
+from database.adapters.sqlite import SQLite
+from database.adapters.postgresql import PostgreSQL
+
+# DB_ADAPTER values
+ADAPTERS: Dict[str, Type[SQLAlchemyAdapter]] = {
+    "mysql": MySQL,
+    "sqlite": SQLite,
+    "postgresql": PostgreSQL,
+}
+
+
+@lru_cache(maxsize=None)
+def get_adapter() -> SQLAlchemyAdapter:
+    """
+    The process-wide adapter of the configured database.
+    """
+    try:
+        adapter = ADAPTERS[ENV.DB_ADAPTER.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown DB_ADAPTER {ENV.DB_ADAPTER!r}, expected one of "
+            f"{', '.join(ADAPTERS)}"
+        ) from None
+    return adapter.from_env()
+
+
+__all__ = [
+    "ADAPTERS",
+    "DIALECTS",
+    "MySQL",
+    "SQLite",
+    "PostgreSQL",
+    "SQLAlchemyAdapter",
+    "get_adapter",
+]
@@ -0,0 +1,125 @@
+import os
+import weakref
+import threading
+from typing import Any, Dict, List, Type, ClassVar, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy import Table, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.sql.dml import Insert
+
+from database.interfaces.adapters import IDatabaseAdapter
+
+# Adapter class per SQLAlchemy dialect name, filled in by the subclasses
+DIALECTS: Dict[str, Type["SQLAlchemyAdapter"]] = {}
+
+# Every adapter instance, for resetting them in forked children
+_instances: "weakref.WeakSet[SQLAlchemyAdapter]" = weakref.WeakSet()
+
+
+class SQLAlchemyAdapter(IDatabaseAdapter):
+    """
+    Base of the database adapters.
+
+    The engine is created on first use, not at import, so importing the
+    app neither connects nor needs the driver of an unused database.
+    Subclasses provide the URL from the environment and the statements
+    that differ between dialects, importing the SQLAlchemy dialect modules
+    they need there rather than at the top.
+    """
+
+    dialect: ClassVar[str] = ""
+    default_driver: ClassVar[str] = ""
+    # Prepended to a SELECT to get its plan without running it
+    explain_prefix: ClassVar[str] = "EXPLAIN "
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if cls.dialect:
+            DIALECTS[cls.dialect] = cls
+
+    def __init__(self, url: URL, **engine_options: Any):
+        self.url = url
+        self.engine_options = engine_options
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._sessionmaker: Optional[sessionmaker] = None
+        _instances.add(self)
+
+    @classmethod
+    def from_env(cls) -> "SQLAlchemyAdapter":
+        raise NotImplementedError
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    url = self.url.render_as_string(hide_password=True)
+                    logger.info(f"Connecting to {url}")
+                    engine = create_engine(self.url, **self.engine_options)
+                    self.on_engine_created(engine)
+                    # Views build their response after the single commit of
+                    # the request; expiring on commit would reload every
+                    # object they touched.
+                    self._sessionmaker = sessionmaker(
+                        bind=engine, expire_on_commit=False
+                    )
+                    self._engine = engine
+        return self._engine
+
+    def on_engine_created(self, engine: Engine) -> None:
+        """
+        Called once per engine, right after it is created and before the
+        first session; not for each pooled connection.
+        """
+
+    def session(self) -> Session:
+        self.engine
+        assert self._sessionmaker is not None
+        return self._sessionmaker()
+
+    def dispose(self) -> None:
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+            self._engine = None
+            self._sessionmaker = None
+
+    def _after_fork(self) -> None:
+        """
+        In a forked child: forget the parent's engine without closing its
+        connections, which still belong to the parent, and build a new one
+        on first use.
+        """
+        self._lock = threading.Lock()
+        if self._engine is not None:
+            self._engine.dispose(close=False)
+        self._engine = None
+        self._sessionmaker = None
+
+    @classmethod
+    def upsert(
+        cls,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> Insert:
+        """
+        INSERT `rows`, updating `update_columns` of the rows that collide
+        on the unique key `index_elements` (ignored where the dialect
+        matches on any unique key). No `update_columns` means keep the
+        existing row.
+        """
+        raise NotImplementedError
+
+
+def _reset_after_fork() -> None:
+    for adapter in list(_instances):
+        adapter._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
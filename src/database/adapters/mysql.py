@@ -1,27 +1,62 @@
-from loguru import logger
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.engine.url import URL
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table, bindparam
+from sqlalchemy.engine import URL
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.ext.compiler import compiles
 
 from config.env import ENV
+from database.adapters.base import SQLAlchemyAdapter
+from database.adapters.pool import pool_options
+from database.sessions.full_text import relevance, match_against, boolean_query
 
 
-class MySQL:
-    url = URL.create(
-        drivername="mysql+pymysql",
-        username=ENV.DB_USER,
-        password=ENV.DB_PASSWORD,
-        host=ENV.DB_HOST,
-        port=int(ENV.DB_PORT),
-        database=ENV.DB_NAME,
-        query={"charset": "utf8mb4"},
-    )
-    logger.info(
-        f"Connecting to {ENV.DB_NAME} at {ENV.DB_HOST}:{ENV.DB_PORT} as {ENV.DB_USER}"
-    )
-    engine = create_engine(url, pool_pre_ping=True, echo=False, future=True)
-    Session = sessionmaker(bind=engine)
+class MySQL(SQLAlchemyAdapter):
+    """
+    MySQL through pymysql, or the mysqlclient C driver with
+    DB_DRIVER=mysqldb.
+    """
+
+    dialect = "mysql"
+    default_driver = "pymysql"
+
+    @classmethod
+    def from_env(cls) -> "MySQL":
+        url = URL.create(
+            drivername=f"mysql+{ENV.DB_DRIVER or cls.default_driver}",
+            username=ENV.DB_USER,
+            password=ENV.DB_PASSWORD,
+            host=ENV.DB_HOST,
+            port=ENV.DB_PORT or None,
+            database=ENV.DB_NAME,
+            query={"charset": "utf8mb4"},
+        )
+        return cls(url, echo=False, future=True, **pool_options())
 
     @classmethod
-    def session(cls):
-        return cls.Session()
+    def upsert(
+        cls,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> Insert:
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(rows)
+        # ON DUPLICATE KEY matches any unique key; updating the key to
+        # itself is the portable "do nothing".
+        columns = update_columns or list(index_elements[:1])
+        return stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in columns}
+        )
+
+
+@compiles(match_against, "mysql")
+@compiles(relevance, "mysql")
+def _mysql_match_against(element: match_against, compiler, **kw) -> str:
+    column = compiler.process(element.column, **kw)
+    query = compiler.process(
+        bindparam(None, boolean_query(element.terms), unique=True), **kw
+    )
+    return f"MATCH ({column}) AGAINST ({query} IN BOOLEAN MODE)"
@@ -0,0 +1,167 @@
+import time
+import bisect
+import threading
+from typing import Any, Dict, List, Tuple, Callable, Optional
+
+from loguru import logger
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from config.env import ENV
+
+# Upper bounds of the checkout wait histogram buckets, in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+# At most one slow checkout warning per route in this many seconds
+WARNING_INTERVAL = 10.0
+
+
+class PoolMonitor:
+    """
+    Connection pool statistics of the current worker: how long checkouts
+    waited for a connection (including opening a new one), how many timed
+    out, and what the pool holds right now.
+
+    Checkouts slower than `threshold` are logged with the route that made
+    them, as told by `caller`, which the app points at its request context.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.caller: Callable[[], str] = lambda: "<unknown>"
+        self.pool: Optional[QueuePool] = None
+        self._lock = threading.Lock()
+        self._buckets: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+        self._wait_sum = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._warned: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self._wait_sum += seconds
+            if seconds > self._max_wait:
+                self._max_wait = seconds
+        if seconds > self.threshold:
+            self._warn(seconds)
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self._timeouts += 1
+        logger.error(
+            "No database connection after {:.0f} ms in {} ({})",
+            seconds * 1000,
+            self.caller(),
+            self._usage(),
+        )
+
+    def totals(self) -> Tuple[List[int], float, int]:
+        """
+        Checkouts per WAIT_BUCKETS bucket (not cumulative, the last one
+        unbounded), their total wait and the number of timeouts.
+        """
+        with self._lock:
+            return list(self._buckets), self._wait_sum, self._timeouts
+
+    def _warn(self, seconds: float) -> None:
+        route = self.caller()
+        now = time.monotonic()
+        with self._lock:
+            last = self._warned.get(route)
+            if last is not None and now - last < WARNING_INTERVAL:
+                self._suppressed[route] = self._suppressed.get(route, 0) + 1
+                return
+            self._warned[route] = now
+            suppressed = self._suppressed.pop(route, 0)
+        logger.warning(
+            "Waited {:.0f} ms for a database connection in {} ({}){}",
+            seconds * 1000,
+            route,
+            self._usage(),
+            f", {suppressed} more since the last warning"
+            if suppressed
+            else "",
+        )
+
+    def _usage(self) -> str:
+        pool = self.pool
+        if pool is None:
+            return "no pool"
+        return (
+            f"{pool.checkedout()} checked out, pool size {pool.size()}, "
+            f"overflow {max(pool.overflow(), 0)}/{pool._max_overflow}"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = list(self._buckets)
+            wait_sum = self._wait_sum
+            max_wait = self._max_wait
+            timeouts = self._timeouts
+
+        cumulative, histogram = 0, {}
+        for bound, count in zip(WAIT_BUCKETS, buckets):
+            cumulative += count
+            histogram[f"le_{bound * 1000:g}ms"] = cumulative
+        cumulative += buckets[-1]
+        histogram["le_inf"] = cumulative
+
+        pool = self.pool
+        stats: Dict[str, Any] = {
+            "threshold_ms": self.threshold * 1000,
+            "checkouts": cumulative,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "sum": round(wait_sum * 1000, 2),
+                "max": round(max_wait * 1000, 2),
+                "histogram": histogram,
+            },
+        }
+        if pool is not None:
+            stats.update(
+                size=pool.size(),
+                max_overflow=pool._max_overflow,
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+pool_monitor = PoolMonitor(threshold=ENV.DB_POOL_WAIT_WARNING_MS / 1000)
+
+
+class MonitoredQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout into `pool_monitor`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # dispose() replaces the pool with a new one; report the live one.
+        pool_monitor.pool = self
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            pool_monitor.record_timeout(time.perf_counter() - started)
+            raise
+        pool_monitor.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def pool_options() -> Dict[str, Any]:
+    """
+    Engine options of the server databases' pool, from the environment.
+    """
+    return {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": ENV.DB_POOL_SIZE,
+        "max_overflow": ENV.DB_MAX_OVERFLOW,
+        "pool_timeout": ENV.DB_POOL_TIMEOUT,
+        "pool_recycle": ENV.DB_POOL_RECYCLE,
+        "pool_pre_ping": ENV.DB_POOL_PRE_PING,
+    }
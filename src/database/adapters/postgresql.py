@@ -0,0 +1,85 @@
+import re
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table, bindparam
+from sqlalchemy.engine import URL
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.ext.compiler import compiles
+
+from config.env import ENV
+from database.adapters.base import SQLAlchemyAdapter
+from database.adapters.pool import pool_options
+from database.sessions.full_text import relevance, match_against
+
+# tsquery syntax, on top of what search_terms already strips
+_TSQUERY_OPERATORS = re.compile(r"[&|!:'\\]+")
+
+
+class PostgreSQL(SQLAlchemyAdapter):
+    """
+    PostgreSQL through psycopg 3 (DB_DRIVER to pick another driver).
+    """
+
+    dialect = "postgresql"
+    default_driver = "psycopg"
+
+    @classmethod
+    def from_env(cls) -> "PostgreSQL":
+        url = URL.create(
+            drivername=f"postgresql+{ENV.DB_DRIVER or cls.default_driver}",
+            username=ENV.DB_USER,
+            password=ENV.DB_PASSWORD,
+            host=ENV.DB_HOST,
+            port=ENV.DB_PORT or None,
+            database=ENV.DB_NAME,
+        )
+        return cls(url, echo=False, future=True, **pool_options())
+
+    @classmethod
+    def upsert(
+        cls,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> Insert:
+        from sqlalchemy.dialects.postgresql import insert
+
+        stmt = insert(table).values(rows)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=index_elements)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+
+
+def _tsquery(terms: List[str]) -> str:
+    """
+    Every term required, each matched as a prefix.
+    """
+    cleaned = (_TSQUERY_OPERATORS.sub("", term) for term in terms)
+    return " & ".join(f"{term}:*" for term in cleaned if term)
+
+
+def _tsvector_match(element: match_against, compiler, **kw):
+    column = compiler.process(element.column, **kw)
+    query = compiler.process(
+        bindparam(None, _tsquery(element.terms), unique=True), **kw
+    )
+    return (
+        f"to_tsvector('simple', coalesce({column}, ''))",
+        f"to_tsquery('simple', {query})",
+    )
+
+
+@compiles(match_against, "postgresql")
+def _postgresql_match_against(element: match_against, compiler, **kw) -> str:
+    vector, query = _tsvector_match(element, compiler, **kw)
+    return f"{vector} @@ {query}"
+
+
+@compiles(relevance, "postgresql")
+def _postgresql_relevance(element: relevance, compiler, **kw) -> str:
+    vector, query = _tsvector_match(element, compiler, **kw)
+    return f"ts_rank({vector}, {query})"
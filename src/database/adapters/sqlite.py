@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.sql.dml import Insert
+
+from config.env import ENV
+from database.models import mapper_registry
+from database.adapters.base import SQLAlchemyAdapter
+from database.adapters.pool import pool_options
+
+MEMORY = ":memory:"
+
+
+class SQLite(SQLAlchemyAdapter):
+    """
+    SQLite, as a file (DB_NAME is its path) or in memory (DB_NAME=:memory:),
+    for running the app, the scripts and the benchmarks without a server.
+    The schema is created from the mappers when the engine is; full-text
+    search falls back to ILIKE.
+    """
+
+    dialect = "sqlite"
+    default_driver = "pysqlite"
+    explain_prefix = "EXPLAIN QUERY PLAN "
+
+    _schema_created = False
+
+    @classmethod
+    def from_env(cls) -> "SQLite":
+        driver = ENV.DB_DRIVER or cls.default_driver
+        return cls.for_database(ENV.DB_NAME, driver)
+
+    @classmethod
+    def for_database(
+        cls, database: str = MEMORY, driver: str = "pysqlite"
+    ) -> "SQLite":
+        url = URL.create(
+            drivername=f"sqlite+{driver}",
+            database=None if database == MEMORY else database,
+        )
+        # Threadpool workers share the connection; an in-memory database
+        # only exists on the one connection.
+        options: Dict[str, Any] = {
+            "connect_args": {"check_same_thread": False}
+        }
+        if database == MEMORY:
+            options["poolclass"] = StaticPool
+        else:
+            options.update(pool_options())
+        return cls(url, **options)
+
+    def on_engine_created(self, engine: Engine) -> None:
+        # A file keeps its schema when the engine is rebuilt (after a fork
+        # or dispose); an in-memory database is new with every engine.
+        if self._schema_created and self.url.database:
+            return
+        mapper_registry.metadata.create_all(engine)
+        self._schema_created = True
+
+    @classmethod
+    def upsert(
+        cls,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> Insert:
+        from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).values(rows)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=index_elements)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
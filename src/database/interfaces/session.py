@@ -1,4 +1,14 @@
-from typing import Any, Dict, List, Type, Generic, TypeVar, Optional, Protocol
+from typing import (
+    Any,
+    Dict,
+    List,
+    Type,
+    Generic,
+    TypeVar,
+    Optional,
+    Protocol,
+    Sequence,
+)
 
 T = TypeVar("T")
 
@@ -12,6 +22,8 @@ class ISession(Protocol, Generic[T]):
 
     def delete(self, obj: T) -> None: ...
 
+    def flush(self) -> None: ...
+
     def commit(self) -> None: ...
 
     def rollback(self) -> None: ...
@@ -27,9 +39,24 @@ class ISession(Protocol, Generic[T]):
         **filters,
     ) -> List[T]: ...
 
-    def execute(self, stmt: Any) -> None: ...
+    def execute(self, stmt: Any) -> Any: ...
+
+    def count(
+        self,
+        model: Type[T],
+        in_: Optional[Dict[Any, List[Any]]] = None,
+        **filters,
+    ) -> int: ...
+
+    def upsert(
+        self,
+        model: Type[T],
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str] = (),
+    ) -> None: ...
 
-    def count(self, model: Type[T], **filters) -> int: ...
+    def close(self) -> None: ...
 
     def __enter__(self) -> "ISession": ...
 
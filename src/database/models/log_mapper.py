@@ -1,4 +1,12 @@
-from sqlalchemy import Float, Table, Column, String, BigInteger, ForeignKey
+from sqlalchemy import (
+    Float,
+    Index,
+    Table,
+    Column,
+    String,
+    BigInteger,
+    ForeignKey,
+)
 from sqlalchemy.orm import relationship
 
 from core.models.log import Log
@@ -18,6 +26,13 @@ task_log_table = Table(
     Column("project_name", String(100), nullable=False),
     Column("hours_spent_today", Float, nullable=False),
     Column("task_status", String(50), nullable=False),
+    Index("ix_task_log_task_id_timestamp", "task_id", "timestamp"),
+    Index(
+        "ft_task_log_task_name", "task_name", mysql_prefix="FULLTEXT"
+    ).ddl_if(dialect="mysql"),
+    Index(
+        "ft_task_log_description", "description", mysql_prefix="FULLTEXT"
+    ).ddl_if(dialect="mysql"),
 )
 
 mapper_registry.map_imperatively(
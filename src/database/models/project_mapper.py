@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, String, Boolean
+from sqlalchemy import Index, Table, Column, String, Boolean
 from sqlalchemy.orm import relationship
 
 from core.models.project import Project
@@ -13,6 +13,10 @@ project_table = Table(
     Column("email", String(50), nullable=True),
     Column("send_email", Boolean, default=False),
     Column("archived", Boolean, default=False),
+    Index("ix_project_name", "name"),
+    Index(
+        "ft_project_name", "name", mysql_prefix="FULLTEXT"
+    ).ddl_if(dialect="mysql"),
 )
 
 mapper_registry.map_imperatively(
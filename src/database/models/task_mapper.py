@@ -1,5 +1,6 @@
 from sqlalchemy import (
     Float,
+    Index,
     Table,
     Column,
     String,
@@ -7,7 +8,12 @@ from sqlalchemy import (
     BigInteger,
     ForeignKey,
 )
-from sqlalchemy.orm import relationship, column_property
+from sqlalchemy.orm import (
+    relationship,
+    column_property,
+    query_expression,
+    with_expression,
+)
 from sqlalchemy.sql import func, select
 
 from core.models.log import Log
@@ -29,6 +35,13 @@ task_table = Table(
     Column("timestamp", BigInteger, nullable=False),
     Column("hours_worked", Float, nullable=False, default=0.0),
     Column("returned", Boolean, nullable=True, default=False),
+    Index("ix_task_title", "title"),
+    Index(
+        "ft_task_title", "title", mysql_prefix="FULLTEXT"
+    ).ddl_if(dialect="mysql"),
+    Index(
+        "ft_task_description", "description", mysql_prefix="FULLTEXT"
+    ).ddl_if(dialect="mysql"),
 )
 
 mapper_registry.map_imperatively(
@@ -57,5 +70,33 @@ mapper_registry.map_imperatively(
             .correlate_except(Log)
             .scalar_subquery()
         ),
+        "log_count": query_expression(),
+        "last_log_description": query_expression(),
     },
 )
+
+def log_summary():
+    """
+    Loader options for the log count and the latest log description.
+
+    Only the task lists and the task page show them, so they are not part
+    of every Task load; elsewhere both attributes are None.
+    """
+    return [
+        with_expression(
+            Task.log_count,  # type: ignore
+            select(func.count(Log.id))  # type: ignore
+            .where(Log.task_id == task_table.c.id)  # type: ignore
+            .correlate_except(Log)
+            .scalar_subquery(),
+        ),
+        with_expression(
+            Task.last_log_description,  # type: ignore
+            select(Log.description)  # type: ignore
+            .where(Log.task_id == task_table.c.id)  # type: ignore
+            .order_by(Log.timestamp.desc())  # type: ignore
+            .limit(1)
+            .correlate_except(Log)
+            .scalar_subquery(),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from sqlalchemy import Table, Column, String, BigInteger
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 
 from core.models.user import User
 from database.models.mapper import mapper_registry
@@ -24,19 +24,31 @@ mapper_registry.map_imperatively(
             "Project",
             secondary=project_developers_table,
             back_populates="developers",
-            lazy="selectin",
+            lazy="select",
         ),
         "tasks": relationship(
             "Task",
             back_populates="user",
             cascade="all, delete-orphan",
-            lazy="selectin",
+            lazy="select",
         ),
         "task_logs": relationship(
             "Log",
             back_populates="user",
             cascade="all, delete-orphan",
-            lazy="selectin",
+            lazy="select",
         ),
     },
 )
+
+
+def user_collections():
+    """
+    Loader options for the projects and tasks of a user, which
+    User.to_dict() walks; one query each instead of a lazy load per
+    collection.
+    """
+    return [
+        selectinload(User.projects),  # type: ignore
+        selectinload(User.tasks),  # type: ignore
+    ]
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Type, Generic, TypeVar, Optional
+from typing import Any, Dict, List, Type, Generic, TypeVar, Optional, Sequence
 
 from database.interfaces.session import ISession
 
@@ -6,13 +6,18 @@ T = TypeVar("T")
 
 
 class Repository(Generic[T]):
+    """
+    Writes are flushed, not committed: the owner of the session commits
+    once per unit of work.
+    """
+
     def __init__(self, session: ISession, model: Type[T]):
         self.session = session
         self.model = model
 
     def create(self, obj: T) -> T:
         self.session.add(obj)
-        self.session.commit()
+        self.session.flush()
         return obj
 
     def get(self, id: Any) -> Optional[T]:
@@ -20,12 +25,22 @@ class Repository(Generic[T]):
 
     def update(self, obj: T) -> T:
         self.session.update(obj)
-        self.session.commit()
+        self.session.flush()
         return obj
 
+    def upsert(
+        self,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str] = (),
+    ) -> None:
+        self.session.upsert(
+            self.model, rows, index_elements, update_columns
+        )
+
     def delete(self, obj: T) -> None:
         self.session.delete(obj)
-        self.session.commit()
+        self.session.flush()
 
     def query(
         self,
@@ -48,5 +63,7 @@ class Repository(Generic[T]):
             **filters,
         )
 
-    def count(self, **filters) -> int:
-        return self.session.count(self.model, **filters)
+    def count(
+        self, in_: Optional[Dict[Any, List[Any]]] = None, **filters
+    ) -> int:
+        return self.session.count(self.model, in_=in_, **filters)
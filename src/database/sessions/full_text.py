@@ -0,0 +1,113 @@
+import re
+from typing import Any, List
+
+from sqlalchemy import Float, and_
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.ext.compiler import compiles
+
+# InnoDB drops tokens shorter than innodb_ft_min_token_size (3 by default),
+# so those terms are matched with LIKE instead.
+MIN_TOKEN_SIZE = 3
+
+_BOOLEAN_OPERATORS = re.compile(r"[+\-<>()~*\"@]+")
+
+
+def search_terms(text: str) -> List[str]:
+    """
+    Split free text into words, dropping MySQL boolean-mode operators so
+    user input can't change the meaning of the query.
+    """
+    return _BOOLEAN_OPERATORS.sub(" ", text).split()
+
+
+def indexed_terms(text: str) -> List[str]:
+    """
+    The terms of `text` long enough to be in a FULLTEXT index.
+    """
+    return [term for term in search_terms(text) if len(term) >= MIN_TOKEN_SIZE]
+
+
+def boolean_query(terms: List[str]) -> str:
+    """
+    Every term required, each matched as a prefix.
+    """
+    return " ".join(f"+{term}*" for term in terms)
+
+
+class match_against(ColumnElement):
+    """
+    `MATCH (column) AGAINST (query IN BOOLEAN MODE)` on MySQL, which needs a
+    FULLTEXT index on exactly that column, a tsquery match on PostgreSQL.
+    Other dialects fall back to one ILIKE per term.
+    """
+
+    type = Float()
+    inherit_cache = True
+    # The dialect compilers bind the terms themselves, in their own syntax,
+    # so they are part of the cache key: statements with the same column
+    # and terms share a compiled form.
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("terms", InternalTraversal.dp_string_list),
+    ]
+
+    def __init__(self, column: Any, terms: List[str]):
+        self.column = column
+        self.terms = terms
+
+
+class relevance(match_against):
+    """
+    Full-text relevance score, for ordering. NULL (no ordering) on dialects
+    without full-text search.
+    """
+
+    inherit_cache = True
+
+
+# The dialect versions of match_against and relevance live with their
+# database adapters, see database.adapters.
+
+
+@compiles(match_against)
+def _default_match_against(element: match_against, compiler, **kw) -> str:
+    return compiler.process(
+        and_(*[element.column.ilike(f"%{term}%") for term in element.terms]),
+        **kw,
+    )
+
+
+@compiles(relevance)
+def _default_relevance(element: relevance, compiler, **kw) -> str:
+    return "NULL"
+
+
+def search_conditions(column: Any, text: str) -> List[Any]:
+    """
+    Conditions for a `__search` filter: the full-text match for indexable
+    terms, ILIKE for the short ones.
+    """
+    conditions: List[Any] = [
+        column.ilike(f"%{term}%")
+        for term in search_terms(text)
+        if len(term) < MIN_TOKEN_SIZE
+    ]
+    indexed = indexed_terms(text)
+    if indexed:
+        conditions.append(match_against(column, indexed))
+    return conditions
+
+
+def prefix_conditions(column: Any, text: str) -> List[Any]:
+    """
+    Typeahead conditions: word prefixes through the FULLTEXT index, or a
+    LIKE prefix on the whole value (a B-tree range) when every term is too
+    short to be indexed.
+    """
+    if not search_terms(text):
+        return []
+    if indexed_terms(text):
+        return search_conditions(column, text)
+    escaped = re.sub(r"([/%_])", r"/\1", text.strip())
+    return [column.like(f"{escaped}%", escape="/")]
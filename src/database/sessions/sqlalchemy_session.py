@@ -1,15 +1,24 @@
-from typing import Any, Dict, List, Type, TypeVar, Optional
+from typing import Any, Dict, List, Type, TypeVar, Optional, Sequence
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, class_mapper
+from sqlalchemy.orm.interfaces import LoaderOption
 
+from database.adapters import DIALECTS
 from database.interfaces.session import ISession
+from database.sessions.full_text import search_conditions
 
 T = TypeVar("T")
 
 
 class SQLAlchemySession(ISession):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, close_on_exit: bool = True):
+        """
+        `close_on_exit=False` keeps the session open across `with` blocks,
+        for a request-scoped session that its owner closes.
+        """
         self._session = session
+        self._close_on_exit = close_on_exit
 
     def add(self, obj: object) -> None:
         self._session.add(obj)
@@ -23,6 +32,9 @@ class SQLAlchemySession(ISession):
     def delete(self, obj: object) -> None:
         self._session.delete(obj)
 
+    def flush(self) -> None:
+        self._session.flush()
+
     def commit(self) -> None:
         try:
             self._session.commit()
@@ -65,19 +77,60 @@ class SQLAlchemySession(ISession):
             query = query.offset(offset)
 
         if options:
-            query = query.options(*[joinedload(option) for option in options])
+            # Relationship attributes are joined-loaded; ready-made loader
+            # options (lazyload, selectinload, ...) are applied as given.
+            query = query.options(
+                *[
+                    option
+                    if isinstance(option, LoaderOption)
+                    else joinedload(option)
+                    for option in options
+                ]
+            )
 
         results = query.all()
         return results
 
-    def execute(self, stmt: Any) -> None:
-        self._session.execute(stmt)
+    def execute(self, stmt: Any) -> Any:
+        return self._session.execute(stmt)
 
-    def count(self, model: Type[T], **filters) -> int:
-        query = self._session.query(model)
+    def count(
+        self,
+        model: Type[T],
+        in_: Optional[Dict[Any, List[Any]]] = None,
+        **filters,
+    ) -> int:
+        # COUNT(*) straight off the table: Query.count() would wrap the
+        # full entity, column_property subqueries included, in a subquery.
+        query = self._session.query(func.count()).select_from(model)
         conditions = self.__get_conditions(model, **filters)
+        if in_:
+            conditions.extend(
+                column.in_(in_values) for column, in_values in in_.items()
+            )
+
+        return query.filter(*conditions).scalar() or 0
 
-        return query.filter(*conditions).count()
+    def upsert(
+        self,
+        model: Type[T],
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str] = (),
+    ) -> None:
+        """
+        Insert `rows` in one statement, updating `update_columns` of the
+        ones already there by the unique key `index_elements`; with no
+        `update_columns` existing rows are left as they are. The statement
+        comes from the adapter of the database the session is bound to.
+        """
+        if not rows:
+            return
+        adapter = DIALECTS[self._session.get_bind().dialect.name]
+        table = class_mapper(model).local_table
+        self._session.execute(
+            adapter.upsert(table, rows, index_elements, update_columns)
+        )
 
     def __get_conditions(self, model: Type[T], **filters):
         conditions = []
@@ -104,6 +157,8 @@ class SQLAlchemySession(ISession):
                     conditions.append(
                         column.ilike(f"%{value}%")
                     )  # Case-insensitive
+                elif op == "search":
+                    conditions.extend(search_conditions(column, value))
                 elif op == "startswith":
                     conditions.append(column.ilike(f"{value}%"))
                 elif op == "endswith":
@@ -123,4 +178,8 @@ class SQLAlchemySession(ISession):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._close_on_exit:
+            self._session.close()
+
+    def close(self) -> None:
         self._session.close()
@@ -0,0 +1,197 @@
+"""
+Fixtures for requesting pages through the real routers and session
+dependency, against a seeded in-memory SQLite database.
+"""
+
+import os
+from typing import Dict, List, Iterator
+
+# Before the app reads its settings. The database is always the in-memory
+# one; the rest only has to be present.
+os.environ["DB_ADAPTER"] = "sqlite"
+os.environ["DB_NAME"] = ":memory:"
+for name, value in {
+    "API_PORT": "8000",
+    "API_HOST": "localhost",
+    "API_URL": "http://localhost:8000",
+    "EMAIL": "reports@example.com",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PASSWORD": "test",
+    "SECRET_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+from ulid import ULID  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from starlette.middleware.sessions import SessionMiddleware  # noqa: E402
+
+from core.models.log import Log  # noqa: E402
+from core.models.task import Task  # noqa: E402
+from core.models.user import User  # noqa: E402
+from core.models.project import Project  # noqa: E402
+from core.enums.premissions import Permissions  # noqa: E402
+from core.models.project_user import ProjectUser  # noqa: E402
+from database.adapters import get_adapter  # noqa: E402
+from backend.dependencies.auth import validate_csrf  # noqa: E402
+from backend.controllers.log_controller import log_router  # noqa: E402
+from backend.controllers.task_controller import task_router  # noqa: E402
+from backend.controllers.user_controller import user_router  # noqa: E402
+from backend.controllers.project_controller import project_router  # noqa: E402
+from backend.controllers.dashboard_controller import (  # noqa: E402
+    dashboard_router,
+)
+from backend.controllers.calendar_controller import (  # noqa: E402
+    calendar_router,
+)
+from backend.controllers.search_controller import search_router  # noqa: E402
+
+DEVELOPERS = 5
+PROJECTS = 4
+DEVELOPERS_PER_PROJECT = 3
+TASKS_PER_PROJECT = 30
+LOGS_PER_TASK = 2
+
+
+@pytest.fixture(scope="session")
+def statements() -> Iterator[List[str]]:
+    """
+    Every SQL statement run since the list was last cleared.
+    """
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, *_):
+        executed.append(statement)
+
+    engine = get_adapter().engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="session")
+def ids() -> Dict[str, str]:
+    """
+    Seed an admin, developers, projects with their developers, tasks and
+    logs; the ids of one of each, to fill in route paths.
+    """
+    with get_adapter().session() as s:
+        admin = User(
+            email="admin@example.com",
+            password="x",
+            full_name="Admin",
+            permissions=Permissions.ADMIN.value,
+            projects=[],
+            tasks=[],
+        )
+        developers = [
+            User(
+                email=f"dev{i}@example.com",
+                password="x",
+                full_name=f"Developer {i}",
+                permissions=Permissions.DEVELOPER.value,
+                projects=[],
+                tasks=[],
+            )
+            for i in range(DEVELOPERS)
+        ]
+        projects = [
+            Project(
+                name=f"Project {i}",
+                send_email=False,
+                archived=False,
+                developers=[],
+                tasks=[],
+            )
+            for i in range(PROJECTS)
+        ]
+        s.add_all([admin, *developers, *projects])
+        s.flush()
+
+        tasks, logs = [], []
+        for p, project in enumerate(projects):
+            assigned = [
+                developers[(p + i) % DEVELOPERS]
+                for i in range(DEVELOPERS_PER_PROJECT)
+            ]
+            s.add_all(
+                ProjectUser(
+                    id=str(ULID()), project_id=project.id, user_id=user.id
+                )
+                for user in assigned
+            )
+            for t in range(TASKS_PER_PROJECT):
+                user = assigned[t % len(assigned)]
+                task = Task(
+                    project_id=project.id,
+                    project_name=project.name,
+                    user_id=user.id,
+                    user_name=user.full_name,
+                    title=f"Task {p}.{t}",
+                    hours_required=8,
+                    description="",
+                    timestamp=t,
+                    logs=[],
+                )
+                tasks.append(task)
+        s.add_all(tasks)
+        s.flush()
+        for task in tasks:
+            logs.extend(
+                Log(
+                    id=str(ULID()),
+                    timestamp=task.timestamp + i,
+                    task_id=task.id,
+                    task_name=task.title,
+                    description=f"log {i}",
+                    user_id=task.user_id,
+                    user_name=task.user_name,
+                    project_id=task.project_id,
+                    project_name=task.project_name,
+                    hours_spent_today=1,
+                    task_status="Implementation",
+                )
+                for i in range(LOGS_PER_TASK)
+            )
+        s.add_all(logs)
+        s.commit()
+        return {
+            "admin_id": admin.id,
+            "user_id": developers[0].id,
+            "project_id": projects[0].id,
+            "task_id": tasks[0].id,
+            "log_id": logs[0].id,
+        }
+
+
+@pytest.fixture(scope="session")
+def admin_client(ids: Dict[str, str]) -> TestClient:
+    """
+    A client signed in as the admin, on an app with the page routers and
+    the session middleware; CSRF checks are off.
+    """
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    for router in (
+        dashboard_router,
+        user_router,
+        project_router,
+        task_router,
+        log_router,
+        calendar_router,
+        search_router,
+    ):
+        app.include_router(router)
+    app.dependency_overrides[validate_csrf] = lambda: None
+
+    @app.get("/__login")
+    def login(request: Request):
+        request.session["user_id"] = ids["admin_id"]
+
+    client = TestClient(
+        app, follow_redirects=False, raise_server_exceptions=False
+    )
+    client.get("/__login")
+    return client
@@ -0,0 +1,151 @@
+"""
+SQL statements per request for every page and the user writes. Each route
+has a statement budget that has to hold for every page size it is asked
+for, so a query per row fails it. A failure lists the statements the
+request ran more than once, by normalized SQL, the usual sign of an N+1.
+"""
+
+from typing import Any, Dict, List, Tuple, Optional, NamedTuple
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.utils.slow_queries import normalize
+
+# Every paged route is asked for a small and a large page
+PAGE_SIZES = (5, 50)
+
+
+class Budget(NamedTuple):
+    path: str
+    statements: int
+    paged: bool = False
+
+
+# Every request loads the current user; a list page then counts its rows
+# and loads one page, and the project and user lists fetch the summaries of
+# the whole page in two more.
+BUDGETS = [
+    Budget("/", 1),
+    Budget("/task/", 3, paged=True),
+    Budget("/task/{task_id}", 2),
+    Budget("/task/{task_id}/logs", 3, paged=True),
+    Budget("/task/project/{project_id}", 3, paged=True),
+    Budget("/task/user/{user_id}", 3, paged=True),
+    Budget("/task/options", 2),
+    Budget("/task/export", 3),
+    Budget("/log/", 3, paged=True),
+    Budget("/log/{log_id}", 2),
+    Budget("/log/{log_id}/edit", 2),
+    Budget("/log/export", 3),
+    Budget("/project/", 5, paged=True),
+    Budget("/project/{project_id}", 4),
+    Budget("/project/{project_id}/edit", 2),
+    Budget("/project/{project_id}/users", 5, paged=True),
+    Budget("/project/{project_id}/tasks", 3, paged=True),
+    Budget("/project/options", 2),
+    Budget("/user/", 5, paged=True),
+    Budget("/user/{user_id}", 3),
+    Budget("/user/{user_id}/projects", 5, paged=True),
+    Budget("/user/{user_id}/tasks", 3, paged=True),
+    Budget("/user/{user_id}/logs", 3, paged=True),
+    Budget("/user/{project_id}/options", 3),
+    Budget("/calendar/summary", 2),
+    Budget("/search?q=task", 4),
+]
+
+
+def urls(budget: Budget, ids: Dict[str, str]) -> List[str]:
+    path = budget.path.format(**ids)
+    if not budget.paged:
+        return [path]
+    separator = "&" if "?" in path else "?"
+    return [f"{path}{separator}limit={size}" for size in PAGE_SIZES]
+
+
+def duplicates(executed: List[str]) -> List[Tuple[int, str]]:
+    counts = Counter(normalize(statement) for statement in executed)
+    return [(n, sql) for sql, n in counts.most_common() if n > 1]
+
+
+@pytest.mark.parametrize("budget", BUDGETS, ids=[b.path for b in BUDGETS])
+def test_statement_budget(
+    budget: Budget,
+    ids: Dict[str, str],
+    admin_client: TestClient,
+    statements: List[str],
+):
+    for url in urls(budget, ids):
+        statements.clear()
+        response = admin_client.get(url)
+        executed = list(statements)
+
+        assert response.status_code < 500, f"{url}: {response.status_code}"
+        repeated = "".join(
+            f"\n  {n} x {sql[:150]}" for n, sql in duplicates(executed)
+        )
+        assert len(executed) <= budget.statements, (
+            f"{url}: {len(executed)} statements, budget "
+            f"{budget.statements}{repeated}"
+        )
+
+
+class Write(NamedTuple):
+    method: str
+    path: str
+    statements: int
+    json: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+def account(email: str) -> Dict[str, Any]:
+    return {
+        "email": email,
+        "password": "secret",
+        "full_name": "Budget User",
+        "permissions": 0,
+    }
+
+
+# The user writes answer with the user and its projects and tasks; an
+# existing user is loaded with both collections, one query each, before it
+# is updated. A new one has none to load.
+WRITES = {
+    "create": Write(
+        "POST", "/user/", 1, data=account("created@example.com")
+    ),
+    "update": Write(
+        "PUT", "/user/{user_id}", 4, json=account("dev0@example.com")
+    ),
+    "upsert-insert": Write(
+        "POST", "/user/upsert", 2, json=account("upserted@example.com")
+    ),
+    "upsert-update": Write(
+        "POST", "/user/upsert", 4, json=account("upserted@example.com")
+    ),
+}
+
+
+@pytest.mark.parametrize("write", WRITES.values(), ids=WRITES.keys())
+def test_write_statement_budget(
+    write: Write,
+    ids: Dict[str, str],
+    admin_client: TestClient,
+    statements: List[str],
+):
+    url = write.path.format(**ids)
+    statements.clear()
+    response = admin_client.request(
+        write.method, url, json=write.json, data=write.data
+    )
+    executed = list(statements)
+
+    assert response.status_code < 500, f"{url}: {response.status_code}"
+    repeated = "".join(
+        f"\n  {n} x {sql[:150]}" for n, sql in duplicates(executed)
+    )
+    assert len(executed) <= write.statements, (
+        f"{write.method} {url}: {len(executed)} statements, budget "
+        f"{write.statements}{repeated}"
+    )